@@ -0,0 +1,194 @@
+"""
+Token authentication with an in-process token cache.
+
+DRF's TokenAuthentication costs one token + user query per request, and most
+views then load the user's profile again. CachedTokenAuthentication resolves
+token -> user + profile with one joined query and keeps the row values in a
+bounded LRU with a TTL, so repeated requests with the same token need no auth
+queries at all. Each request gets fresh model instances built from the cached
+values, never instances shared with other requests.
+
+The auth_app signals evict entries when a token is saved or deleted and when a
+user or profile changes. The cache is per process: other processes notice
+such changes at the latest after AUTH_TOKEN_CACHE_TTL seconds.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from user_app.models import UserProfile
+
+
+class TokenCache:
+    """
+    Thread-safe LRU of token key -> (expiry, cached values), with an index
+    from user id to keys for eviction by user.
+
+    Fills race with evictions: a request may read the rows, then a writer
+    commits and evicts, then the request stores the old rows. Each eviction
+    therefore records the sequence number at which a user (or token) was
+    invalidated; callers take version() before loading and pass it to set(),
+    which drops the write if the user or token was invalidated since. Only
+    the newest `maxsize` invalidations are remembered; set() rejects loads
+    older than the forgotten ones.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._sequence = 0
+        self._invalidated = OrderedDict()
+        self._forgotten_until = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user_id, values = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return values
+
+    def version(self):
+        with self._lock:
+            return self._sequence
+
+    def set(self, key, user_id, values, version):
+        """
+        Stores the values read after `version` unless the token or its user
+        was invalidated since.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if version < self._forgotten_until or any(
+                self._invalidated.get(scope, 0) > version for scope in (('user', user_id), ('token', key))
+            ):
+                return
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, user_id, values)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def forget_key(self, key):
+        with self._lock:
+            self._invalidate(('token', key))
+            self._remove(key)
+
+    def forget_user(self, user_id):
+        with self._lock:
+            self._invalidate(('user', user_id))
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._sequence += 1
+            self._forgotten_until = self._sequence
+            self._invalidated.clear()
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _invalidate(self, scope):
+        self._sequence += 1
+        self._invalidated.pop(scope, None)
+        self._invalidated[scope] = self._sequence
+        while len(self._invalidated) > max(self.maxsize, 1):
+            _, sequence = self._invalidated.popitem(last=False)
+            self._forgotten_until = sequence
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[1]]
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60),
+)
+
+
+def forget_user(user_id):
+    """
+    Evicts the tokens of a user now and again on commit; together with the
+    version check in TokenCache.set() a request that read the old rows cannot
+    store them afterwards.
+    """
+    token_cache.forget_user(user_id)
+    transaction.on_commit(lambda: token_cache.forget_user(user_id))
+
+
+def forget_token(key):
+    token_cache.forget_key(key)
+    transaction.on_commit(lambda: token_cache.forget_key(key))
+
+
+def row_values(instance):
+    return tuple(getattr(instance, field.attname) for field in instance._meta.concrete_fields)
+
+
+def build(model, values):
+    names = [field.attname for field in model._meta.concrete_fields]
+    return model.from_db(DEFAULT_DB_ALIAS, names, values)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that also loads the profile
+    (request.user.profile needs no query) and caches the result per token.
+    """
+
+    def authenticate_credentials(self, key):
+        values = token_cache.get(key)
+        if values is None:
+            version = token_cache.version()
+            values = self.load(key)
+            token_cache.set(key, values[1][0], values, version)
+
+        token_values, user_values, profile_values = values
+        token = build(Token, token_values)
+        user = build(get_user_model(), user_values)
+        if profile_values is None:
+            get_user_model().profile.related.set_cached_value(user, None)
+        else:
+            user.profile = build(UserProfile, profile_values)
+        token.user = user
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return user, token
+
+    def load(self, key):
+        """
+        Reads token, user and profile with one joined query.
+        """
+        try:
+            token = Token.objects.select_related('user', 'user__profile').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        profile = getattr(token.user, 'profile', None)
+        return row_values(token), row_values(token.user), row_values(profile) if profile else None
@@ -1,7 +1,15 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
+from auth_app.authentication import CachedTokenAuthentication, TokenCache, token_cache
 from user_app.models import UserProfile
 
 class AuthAPITestCase(APITestCase):
@@ -115,3 +123,108 @@ class AuthAPITestCase(APITestCase):
         }
         response = self.client.post(self.login_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Tests for token -> user + profile resolution and its in-process cache.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='tokenuser', password='pass1234')
+        self.profile = UserProfile.objects.create(user=self.user, user_type='business')
+        self.token = Token.objects.create(user=self.user)
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, token=None):
+        key = (token or self.token).key
+        request = Request(self.factory.get('/', HTTP_AUTHORIZATION=f'Token {key}'))
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_one_joined_query_then_cached(self):
+        with CaptureQueriesContext(connection) as context:
+            user, token = self.authenticate()
+            self.assertEqual(user.profile.user_type, 'business')
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('user_app_userprofile', context.captured_queries[0]['sql'])
+
+        with self.assertNumQueries(0):
+            cached_user, cached_token = self.authenticate()
+            self.assertEqual(cached_user.profile.user_type, 'business')
+        self.assertEqual((cached_user.pk, cached_token.key), (self.user.pk, self.token.key))
+        self.assertIsNot(cached_user, user)
+
+    def test_user_without_profile(self):
+        self.profile.delete()
+        user, _ = self.authenticate()
+        with self.assertNumQueries(0):
+            self.assertIsNone(getattr(user, 'profile', None))
+
+    def test_changes_evict_cached_tokens(self):
+        self.authenticate()
+        self.profile.user_type = 'customer'
+        self.profile.save()
+        self.assertEqual(self.authenticate()[0].profile.user_type, 'customer')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+        self.user.is_active = True
+        self.user.save()
+        self.authenticate()
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_cache_is_bounded_and_expires(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        for key in 'abc':
+            cache.set(key, 1, key, cache.version())
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (None, 'b', 'c'))
+        cache.forget_user(1)
+        self.assertEqual(len(cache), 0)
+
+        expired = TokenCache(maxsize=2, ttl=0)
+        expired.set('a', 1, 'a', expired.version())
+        self.assertIsNone(expired.get('a'))
+
+    def test_fill_after_invalidation_is_dropped(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        version = cache.version()
+        cache.forget_user(1)
+        cache.set('a', 1, 'old', version)
+        self.assertIsNone(cache.get('a'))
+        cache.set('b', 2, 'other user', version)
+        self.assertEqual(cache.get('b'), 'other user')
+
+        version = cache.version()
+        for user_id in (3, 4, 5):
+            cache.forget_user(user_id)
+        cache.set('c', 2, 'after forgotten invalidations', version)
+        self.assertIsNone(cache.get('c'))
+
+    def test_user_deactivated_during_load_is_not_cached(self):
+        load = CachedTokenAuthentication.load
+
+        def load_then_deactivate(authentication, key):
+            values = load(authentication, key)
+            self.user.is_active = False
+            self.user.save()
+            return values
+
+        with mock.patch.object(CachedTokenAuthentication, 'load', load_then_deactivate):
+            self.authenticate()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_views_use_the_authenticated_profile(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.client.get('/api/orders/')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/orders/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('authtoken_token' in query['sql'] for query in context.captured_queries))
+        self.assertFalse(any('user_app_userprofile' in query['sql'] for query in context.captured_queries))
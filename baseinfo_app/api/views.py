@@ -2,11 +2,8 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.db.models import Avg
 
-from reviews_app.models import Review
-from user_app.models import UserProfile
-from offers_app.models import Offer
+from baseinfo_app import stats
 
 
 class BaseInfoView(APIView):
@@ -23,6 +20,9 @@ class BaseInfoView(APIView):
 
     Permissions:
         - Publicly accessible (no authentication required).
+
+    The values come from the maintained PlatformStats snapshot, served from an
+    in-process stale-while-revalidate cache (see baseinfo_app.stats).
     """
     permission_classes = [AllowAny]
     pagination_class = None
@@ -42,16 +42,5 @@ class BaseInfoView(APIView):
         Returns:
             200 OK with the statistics data.
         """
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
-        business_profile_count = UserProfile.objects.filter(user_type='business').count()
-        offer_count = Offer.objects.count()
-
-        data = {
-            "review_count": review_count,
-            "average_rating": round(average_rating, 1),
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count
-        }
-
+        data = stats.get_stats()
         return Response(data)
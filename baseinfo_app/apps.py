@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class BaseinfoAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'baseinfo_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:51
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_stats(apps, schema_editor):
+    Review = apps.get_model('reviews_app', 'Review')
+    UserProfile = apps.get_model('user_app', 'UserProfile')
+    Offer = apps.get_model('offers_app', 'Offer')
+    PlatformStats = apps.get_model('baseinfo_app', 'PlatformStats')
+    reviews = Review.objects.aggregate(review_count=Count('id'), rating_sum=Sum('rating'))
+    PlatformStats.objects.create(
+        pk=1,
+        review_count=reviews['review_count'],
+        rating_sum=reviews['rating_sum'] or 0,
+        business_profile_count=UserProfile.objects.filter(user_type='business').count(),
+        offer_count=Offer.objects.count(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('offers_app', '0013_feature_index'),
+        ('reviews_app', '0006_review_list_indexes'),
+        ('user_app', '0014_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('business_profile_count', models.PositiveIntegerField(default=0)),
+                ('offer_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,28 @@
 from django.db import models
 
-# Create your models here.
+
+class PlatformStats(models.Model):
+    """
+    Snapshot of the platform statistics shown by BaseInfoView (a single row),
+    maintained incrementally by the signals in baseinfo_app.signals.
+
+    Attributes:
+        review_count (PositiveIntegerField): Number of reviews.
+        rating_sum (IntegerField): Sum of all review ratings.
+        business_profile_count (PositiveIntegerField): Number of business profiles.
+        offer_count (PositiveIntegerField): Number of offers.
+        updated_at (DateTimeField): Time of the last change.
+    """
+    SINGLETON_ID = 1
+
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    business_profile_count = models.PositiveIntegerField(default=0)
+    offer_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'platform stats'
+
+    def __str__(self):
+        return f'{self.review_count} reviews, {self.business_profile_count} businesses, {self.offer_count} offers'
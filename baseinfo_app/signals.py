@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from offers_app.models import Offer
+from reviews_app.models import Review
+from user_app.models import UserProfile
+from . import stats
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, **kwargs):
+    if created:
+        stats.adjust(review_count=1, rating_sum=instance.rating)
+        return
+    _, previous_rating = getattr(instance, '_summarized_state', (None, instance.rating))
+    stats.adjust(rating_sum=instance.rating - previous_rating)
+
+
+@receiver(post_delete, sender=Review)
+def uncount_deleted_review(sender, instance, **kwargs):
+    _, rating = getattr(instance, '_summarized_state', (None, instance.rating))
+    stats.adjust(review_count=-1, rating_sum=-rating)
+
+
+@receiver(post_save, sender=UserProfile)
+def count_business_profile(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_counted_type', instance.user_type)
+    was_business = previous == UserProfile.BUSINESS
+    is_business = instance.user_type == UserProfile.BUSINESS
+    stats.adjust(business_profile_count=int(is_business) - int(was_business))
+
+
+@receiver(post_delete, sender=UserProfile)
+def uncount_deleted_profile(sender, instance, **kwargs):
+    if getattr(instance, '_counted_type', instance.user_type) == UserProfile.BUSINESS:
+        stats.adjust(business_profile_count=-1)
+
+
+@receiver(post_save, sender=Offer)
+def count_created_offer(sender, instance, created, **kwargs):
+    if created:
+        stats.adjust(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def uncount_deleted_offer(sender, instance, **kwargs):
+    stats.adjust(offer_count=-1)
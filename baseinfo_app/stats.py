@@ -0,0 +1,88 @@
+"""
+Platform statistics for BaseInfoView.
+
+The counts live in the PlatformStats row, which the signals in
+baseinfo_app.signals adjust with F() expressions whenever a review, business
+profile or offer is added, changed or removed. Requests read it through an
+in-process stale-while-revalidate cache (core.swr): a changed snapshot is
+picked up by a background refresh after the commit, and other processes see
+it within PLATFORM_STATS_CACHE_TTL seconds.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.swr import StaleWhileRevalidate
+from offers_app.models import Offer
+from reviews_app.models import Review
+from user_app.models import UserProfile
+from .models import PlatformStats
+
+COUNT_FIELDS = ['review_count', 'rating_sum', 'business_profile_count', 'offer_count']
+
+
+def adjust(**deltas):
+    """
+    Adds the given deltas (e.g. review_count=1, rating_sum=4) to the snapshot.
+    Builds the snapshot from the tables when it does not exist yet.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    changes = {
+        field: F(field) + delta if field == 'rating_sum' else Greatest(F(field) + delta, Value(0))
+        for field, delta in deltas.items()
+    }
+    if not PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).update(updated_at=timezone.now(), **changes):
+        # The tables already include the change that triggered this call.
+        rebuild()
+    transaction.on_commit(snapshot.invalidate)
+
+
+def actual_counts():
+    reviews = Review.objects.aggregate(review_count=Count('id'), rating_sum=Sum('rating'))
+    return {
+        'review_count': reviews['review_count'],
+        'rating_sum': reviews['rating_sum'] or 0,
+        'business_profile_count': UserProfile.objects.filter(user_type=UserProfile.BUSINESS).count(),
+        'offer_count': Offer.objects.count(),
+    }
+
+
+def rebuild():
+    """
+    Recomputes the snapshot from the tables (four aggregate queries).
+    """
+    PlatformStats.objects.update_or_create(pk=PlatformStats.SINGLETON_ID, defaults=actual_counts())
+    transaction.on_commit(snapshot.invalidate)
+
+
+def load():
+    values = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).values(*COUNT_FIELDS).first()
+    if values is None:
+        rebuild()
+        values = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).values(*COUNT_FIELDS).get()
+    return values
+
+
+def represent(values):
+    review_count = values['review_count']
+    return {
+        'review_count': review_count,
+        'average_rating': round(values['rating_sum'] / review_count, 1) if review_count else 0,
+        'business_profile_count': values['business_profile_count'],
+        'offer_count': values['offer_count'],
+    }
+
+
+snapshot = StaleWhileRevalidate(
+    load,
+    ttl=getattr(settings, 'PLATFORM_STATS_CACHE_TTL', 30),
+    background=getattr(settings, 'PLATFORM_STATS_BACKGROUND_REFRESH', True),
+)
+
+
+def get_stats():
+    return represent(snapshot.get())
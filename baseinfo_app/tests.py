@@ -1,7 +1,14 @@
+import threading
+import time
+from unittest import mock
+
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from baseinfo_app import stats
+from baseinfo_app.models import PlatformStats
+from core.swr import StaleWhileRevalidate
 from user_app.models import UserProfile
 from reviews_app.models import Review
 from offers_app.models import Offer, OfferDetail
@@ -23,6 +30,7 @@ class BaseInfoAPITest(TestCase):
         - Create reviews between users to test rating statistics
         """
         self.client = APIClient()
+        stats.snapshot.clear()
         user_business = User.objects.create(username='business_user')
         UserProfile.objects.create(user=user_business, user_type='business')
         user_private = User.objects.create(username='private_user')
@@ -101,3 +109,132 @@ class BaseInfoAPITest(TestCase):
         self.assertEqual(data['average_rating'], 4.0)
         self.assertEqual(data['business_profile_count'], 1)
         self.assertEqual(data['offer_count'], 2)
+
+
+class PlatformStatsTests(TestCase):
+    """
+    Tests for the maintained statistics snapshot and its cache.
+    """
+
+    def setUp(self):
+        stats.snapshot.clear()
+        self.business = User.objects.create(username='statsbusiness')
+        self.profile = UserProfile.objects.create(user=self.business, user_type='business')
+        self.customer = User.objects.create(username='statscustomer')
+        UserProfile.objects.create(user=self.customer, user_type='customer')
+
+    def stored(self):
+        return PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).values(*stats.COUNT_FIELDS).get()
+
+    def test_snapshot_follows_writes(self):
+        offer = Offer.objects.create(user=self.business, title='Offer', description='Desc')
+        Offer.objects.create(user=self.business, title='Second', description='Desc')
+        review = Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5, description='Top')
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=2, description='Meh')
+        review.rating = 3
+        review.save()
+        offer.delete()
+        self.profile.user_type = 'customer'
+        self.profile.save()
+        self.assertEqual(self.stored(), stats.actual_counts())
+        self.assertEqual(self.stored()['rating_sum'], 5)
+
+        UserProfile.objects.get(pk=self.profile.pk).delete()
+        self.business.delete()
+        self.assertEqual(self.stored(), stats.actual_counts())
+        self.assertEqual(self.stored(), {'review_count': 0, 'rating_sum': 0, 'business_profile_count': 0, 'offer_count': 0})
+
+    def test_view_is_served_from_the_snapshot_cache(self):
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Good')
+        with self.assertNumQueries(1):
+            first = self.client.get('/api/base-info/').json()
+        with self.assertNumQueries(0):
+            self.client.get('/api/base-info/')
+        self.assertEqual(first, {'review_count': 1, 'average_rating': 4.0, 'business_profile_count': 1, 'offer_count': 0})
+
+        with mock.patch.object(stats.snapshot, 'background', False):
+            with self.captureOnCommitCallbacks(execute=True):
+                Review.objects.create(business_user=self.business, reviewer=self.customer, rating=1, description='Bad')
+            stale = self.client.get('/api/base-info/').json()
+            fresh = self.client.get('/api/base-info/').json()
+        self.assertEqual(stale['review_count'], 1)
+        self.assertEqual((fresh['review_count'], fresh['average_rating']), (2, 2.5))
+
+
+class StaleWhileRevalidateTests(TestCase):
+    """
+    Tests for core.swr without a database.
+    """
+
+    def test_stale_value_is_served_while_refreshing(self):
+        release, calls = threading.Event(), []
+
+        def loader():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(5)
+            return len(calls)
+
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        self.assertEqual(cache.get(), 1)
+        cache.invalidate()
+        started = time.monotonic()
+        self.assertEqual(cache.get(), 1)
+        self.assertEqual(cache.get(), 1)
+        self.assertLess(time.monotonic() - started, 1)
+        release.set()
+        for _ in range(100):
+            if cache.get() == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.get(), 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_invalidation_during_a_load_is_kept(self):
+        started, release, calls = threading.Event(), threading.Event(), []
+
+        def loader():
+            calls.append(1)
+            if len(calls) == 2:
+                started.set()
+                release.wait(5)
+            return len(calls)
+
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        self.assertEqual(cache.get(), 1)
+        cache.invalidate()
+        self.assertEqual(cache.get(), 1)
+        self.assertTrue(started.wait(5))
+        cache.invalidate()
+        release.set()
+        for _ in range(100):
+            if len(calls) == 2 and cache._loading is None:
+                break
+            time.sleep(0.01)
+
+        # The load that began before the second invalidation is served once, then refreshed.
+        self.assertEqual(cache.get(), 2)
+        for _ in range(100):
+            if cache.get() == 3:
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.get(), 3)
+        self.assertEqual(len(calls), 3)
+
+    def test_cold_burst_loads_once(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['value'] * 10)
+        self.assertEqual(len(calls), 1)
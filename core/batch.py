@@ -0,0 +1,59 @@
+"""
+Batch retrieval by id list ('?ids=1,2,3').
+
+Views that mix in BatchRetrieveMixin answer such requests with one
+in_bulk() query instead of one request per object. The response lists the
+found objects in the requested order and the ids that do not exist:
+
+    {"results": [...], "missing": [4]}
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .expand import read_list_param
+
+IDS_QUERY_PARAM = 'ids'
+
+
+def is_requested(request):
+    return request.method in ('GET', 'HEAD') and IDS_QUERY_PARAM in request.query_params
+
+
+def parse_ids(request, max_ids):
+    """
+    Returns the distinct integer ids of '?ids=' in request order.
+    Raises ValidationError for non-integer values, an empty list or more than `max_ids` ids.
+    """
+    try:
+        ids = list(dict.fromkeys(int(value) for value in read_list_param(request, IDS_QUERY_PARAM)))
+    except ValueError:
+        raise ValidationError({IDS_QUERY_PARAM: ['Expected a comma separated list of integer ids.']})
+    if not ids:
+        raise ValidationError({IDS_QUERY_PARAM: ['At least one id is required.']})
+    if len(ids) > max_ids:
+        raise ValidationError({IDS_QUERY_PARAM: [f'At most {max_ids} ids are allowed per request.']})
+    return ids
+
+
+class BatchRetrieveMixin:
+    """
+    Adds '?ids=' batch retrieval to a generic view. `batch_lookup_field` is the
+    (unique) field the ids refer to; objects are loaded from get_batch_queryset()
+    and serialized with serialize_batch().
+    """
+    max_batch_ids = 100
+    batch_lookup_field = 'pk'
+
+    def get_batch_queryset(self):
+        return self.get_queryset()
+
+    def serialize_batch(self, objects):
+        return self.get_serializer(objects, many=True).data
+
+    def batch_retrieve(self, request):
+        ids = parse_ids(request, self.max_batch_ids)
+        found = self.get_batch_queryset().in_bulk(ids, field_name=self.batch_lookup_field)
+        return Response({
+            'results': self.serialize_batch([found[pk] for pk in ids if pk in found]),
+            'missing': [pk for pk in ids if pk not in found],
+        })
@@ -0,0 +1,81 @@
+"""
+Shared cache helpers: generation tokens and request normalization.
+
+A generation is a random token stored in the cache under a scope name
+(e.g. 'offers:catalog' or 'profiles:user:7'). Cached entries and HTTP
+validators embed the token of the scopes they depend on; bumping a scope
+replaces its token, which makes everything built under the old one
+unreachable without deleting anything. Tokens are random rather than
+incrementing, so an evicted generation can never roll back to a value
+that old entries were stored under.
+
+Only the plain get/set/add cache API is used, so any Django cache backend
+(local-memory, file-based, ...) works.
+"""
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+GENERATION_PREFIX = 'generation'
+
+
+def get_generation_cache():
+    return caches[getattr(settings, 'GENERATION_CACHE_ALIAS', 'default')]
+
+
+def get_generation(scope):
+    """
+    Returns the current token of a generation scope, creating it if missing.
+    """
+    cache = get_generation_cache()
+    key = f'{GENERATION_PREFIX}:{scope}'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def get_generations(scopes):
+    """
+    Returns {scope: token} for several scopes with one cache round trip
+    (plus one per scope that has no token yet).
+    """
+    cache = get_generation_cache()
+    keys = {f'{GENERATION_PREFIX}:{scope}': scope for scope in scopes}
+    found = cache.get_many(list(keys))
+    generations = {keys[key]: token for key, token in found.items()}
+    for key, scope in keys.items():
+        if scope not in generations:
+            generations[scope] = get_generation(scope)
+    return generations
+
+
+def bump_generations(*scopes):
+    """
+    Invalidates everything depending on the given scopes. The generations are
+    bumped again when the surrounding transaction commits, so entries cached by
+    concurrent readers before the commit are discarded as well.
+    """
+    def bump():
+        get_generation_cache().set_many(
+            {f'{GENERATION_PREFIX}:{scope}': uuid.uuid4().hex for scope in scopes}, None
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def normalize_query(query_params):
+    """
+    Builds a canonical query string: sorted keys, sorted values, empty values dropped.
+    """
+    items = []
+    for key in sorted(query_params.keys()):
+        for value in sorted(query_params.getlist(key)):
+            if value != '':
+                items.append((key, value))
+    return urlencode(items)
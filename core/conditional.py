@@ -0,0 +1,41 @@
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_get(method):
+    """
+    Decorator for the GET handler of an API view that adds ETag/Last-Modified
+    validators and answers matching conditional requests with 304 Not Modified.
+
+    The view provides get_validators(request, *args, **kwargs) returning
+    (etag_source, last_modified) - either may be None - or None to skip
+    conditional handling (e.g. when the object does not exist). The validators
+    are evaluated before the handler runs, so a 304 never touches a serializer.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return method(self, request, *args, **kwargs)
+
+        etag_source, last_modified = validators
+        etag = None
+        if etag_source is not None:
+            etag = quote_etag(hashlib.md5(str(etag_source).encode('utf-8')).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            if etag:
+                response.headers.setdefault('ETag', etag)
+            if timestamp:
+                response.headers.setdefault('Last-Modified', http_date(timestamp))
+        return response
+
+    return wrapper
@@ -0,0 +1,101 @@
+"""
+Expandable nested representations ('?expand=details,user').
+
+A serializer lists what it can inline in `expandable_fields`; each Expansion
+names the serializer used for the inlined object and the select_related /
+prefetch_related lookups that load it. Views pass their queryset through
+`expand_queryset()` so an expanded page costs the same number of queries as
+a plain one. Expansions only apply to the top-level serializer; inlined
+objects are never expanded further.
+"""
+from rest_framework.serializers import ListSerializer
+
+EXPAND_QUERY_PARAM = 'expand'
+
+
+class Expansion:
+    """
+    Describes one expandable field: the serializer of the inlined object,
+    an optional source (defaults to the field name) and the lookups to load it.
+    """
+
+    def __init__(self, serializer, source=None, many=False, select_related=(), prefetch_related=()):
+        self.serializer = serializer
+        self.source = source
+        self.many = many
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+    def build_field(self, field_name):
+        kwargs = {'many': self.many, 'read_only': True}
+        if self.source and self.source != field_name:
+            kwargs['source'] = self.source
+        return self.serializer(**kwargs)
+
+
+def read_list_param(request, param):
+    """
+    Returns the names in a comma separated (and repeatable) query parameter,
+    de-duplicated, in request order. Only GET/HEAD requests are considered,
+    so writes always see the plain, writable fields.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return []
+    names = []
+    for value in request.query_params.getlist(param):
+        for name in value.split(','):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def parse_expand(request, allowed):
+    """
+    Returns the requested expansions that are in `allowed`; unknown names are ignored.
+    """
+    return [name for name in read_list_param(request, EXPAND_QUERY_PARAM) if name in allowed]
+
+
+def is_top_level(serializer):
+    """
+    True for the serializer of the response itself (or the child of a top-level list).
+    """
+    parent = serializer.parent
+    return parent is None or (isinstance(parent, ListSerializer) and parent.parent is None)
+
+
+class ExpandableSerializerMixin:
+    """
+    Adds '?expand=' support to a serializer: each requested field in
+    `expandable_fields` is replaced by (or added as) its nested representation.
+    """
+    expandable_fields = {}
+
+    @classmethod
+    def get_requested_expansions(cls, request):
+        return parse_expand(request, cls.expandable_fields)
+
+    @classmethod
+    def expand_queryset(cls, queryset, request):
+        """
+        Adds the select_related/prefetch_related lookups of the requested expansions.
+        """
+        select, prefetch = [], []
+        for name in cls.get_requested_expansions(request):
+            expansion = cls.expandable_fields[name]
+            select.extend(expansion.select_related)
+            prefetch.extend(expansion.prefetch_related)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not is_top_level(self):
+            return fields
+        for name in self.get_requested_expansions(self.context.get('request')):
+            fields[name] = self.expandable_fields[name].build_field(name)
+        return fields
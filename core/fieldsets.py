@@ -0,0 +1,114 @@
+"""
+Sparse fieldsets ('?fields=id,title' or '?omit=description,details').
+
+The serializer drops the fields the client did not ask for, and the view's
+queryset drops the work behind them: `sparse_queryset()` rebuilds the
+select_related/prefetch_related lookups and an `.only()` column list from the
+remaining fields. What a field needs is derived from its source (columns,
+forward relations to join, reverse relations to prefetch) unless the
+serializer declares it in `field_requirements` (e.g. for method fields).
+"""
+from django.core.exceptions import FieldDoesNotExist
+
+from .expand import is_top_level, read_list_param
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+class FieldRequirement:
+    """
+    The columns, joins and prefetches one serializer field needs.
+    """
+
+    def __init__(self, only=(), select_related=(), prefetch_related=()):
+        self.only = tuple(only)
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+    @classmethod
+    def from_source(cls, model, source):
+        """
+        Derives the requirement of a dotted source such as 'offer_detail.offer.updated_at'.
+        """
+        only, path, prefetch = [], [], []
+        for part in source.split('.'):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not path and field.concrete:
+                only.append(field.name)
+            if not field.is_relation:
+                break
+            if field.one_to_many or field.many_to_many:
+                prefetch.append('__'.join(path + [part]))
+                break
+            path.append(part)
+            model = field.related_model
+        return cls(only, ['__'.join(path)] if path else [], prefetch)
+
+
+def select_names(names, request):
+    """
+    Filters field names by the request's 'fields' and 'omit' parameters.
+    """
+    fields = read_list_param(request, FIELDS_QUERY_PARAM)
+    omit = read_list_param(request, OMIT_QUERY_PARAM)
+    return [name for name in names if (not fields or name in fields) and name not in omit]
+
+
+def is_sparse(request):
+    return bool(read_list_param(request, FIELDS_QUERY_PARAM) or read_list_param(request, OMIT_QUERY_PARAM))
+
+
+class SparseFieldsetMixin:
+    """
+    Adds '?fields=' / '?omit=' support to a ModelSerializer. Unknown names are
+    ignored; nested and inlined serializers always render all their fields.
+    """
+    field_requirements = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if not is_top_level(self) or not is_sparse(request):
+            return fields
+        return {name: fields[name] for name in select_names(fields, request)}
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request, columns=()):
+        """
+        Restricts the queryset to the joins, prefetches and columns needed by the
+        selected fields (plus `columns`, e.g. the fields used for cursor pagination).
+        Call it after expand_queryset(); without 'fields'/'omit' it is a no-op.
+        """
+        if not is_sparse(request):
+            return queryset
+
+        model = cls.Meta.model
+        expansions = getattr(cls, 'expandable_fields', {})
+        expanded = cls.get_requested_expansions(request) if expansions else []
+        only = {model._meta.pk.name, *columns}
+        select, prefetch = [], []
+
+        for name, field in cls(context={'request': request}).fields.items():
+            source = field.source or name
+            if name in expanded:
+                requirement = FieldRequirement.from_source(model, expansions[name].source or name)
+                select.extend(expansions[name].select_related)
+                prefetch.extend(expansions[name].prefetch_related)
+            elif name in cls.field_requirements:
+                requirement = cls.field_requirements[name]
+            else:
+                requirement = FieldRequirement.from_source(model, source)
+            only.update(requirement.only)
+            select.extend(requirement.select_related)
+            prefetch.extend(requirement.prefetch_related)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*dict.fromkeys(select))
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only(*only)
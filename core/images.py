@@ -0,0 +1,150 @@
+"""
+Resized image derivatives (several fixed sizes, WebP plus a JPEG/PNG fallback)
+for uploaded images, generated off the request thread.
+
+Derivatives are stored under 'derivatives/<sha256 of the source>/', so
+identical uploads share one set of files and are only processed once. The
+model keeps a small manifest (source name, digest and derivative paths) in a
+JSONField, from which serializers build URLs without touching the files.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_SIZES = {
+    'small': 160,
+    'medium': 480,
+    'large': 960,
+}
+DERIVATIVE_DIR = 'derivatives'
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+
+_executor = None
+
+
+def needs_derivatives(field_file, manifest):
+    """
+    True if the file is set and the manifest was not built from it.
+    """
+    return bool(field_file) and (manifest or {}).get('source') != field_file.name
+
+
+def clear_stale_manifest(instance, file_field, manifest_field):
+    """
+    Empties the manifest of an instance whose image was removed (call before saving).
+    """
+    if not getattr(instance, file_field) and getattr(instance, manifest_field):
+        setattr(instance, manifest_field, {})
+
+
+def derivative_urls(manifest, field_file):
+    """
+    Maps a manifest to {size: {format: url}}, or None if there are no
+    derivatives of the current file yet (also while a replaced or removed
+    image still has the manifest of its predecessor).
+    """
+    manifest = manifest or {}
+    files = manifest.get('files')
+    if not files or not field_file or manifest.get('source') != field_file.name:
+        return None
+    return {
+        size: {fmt: default_storage.url(name) for fmt, name in formats.items()}
+        for size, formats in files.items()
+    }
+
+
+def generate_derivatives(field_file):
+    """
+    Creates all derivatives of an image file (skipping ones that already exist
+    for the same content) and returns the manifest.
+    """
+    field_file.open('rb')
+    try:
+        content = field_file.read()
+    finally:
+        field_file.close()
+
+    digest = hashlib.sha256(content).hexdigest()
+    base = f'{DERIVATIVE_DIR}/{digest[:2]}/{digest}'
+    image = Image.open(BytesIO(content))
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    formats = ['webp', 'png' if has_alpha else 'jpeg']
+    oriented = None
+    files = {}
+
+    for size, edge in DERIVATIVE_SIZES.items():
+        files[size] = {}
+        for fmt in formats:
+            name = f'{base}/{size}.{EXTENSIONS[fmt]}'
+            if not default_storage.exists(name):
+                if oriented is None:
+                    oriented = ImageOps.exif_transpose(image).convert('RGBA' if has_alpha else 'RGB')
+                variant = oriented.copy()
+                variant.thumbnail((edge, edge), Image.LANCZOS)
+                buffer = BytesIO()
+                variant.save(buffer, format=fmt.upper(), quality=80, optimize=True)
+                name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            files[size][fmt] = name
+
+    return {'source': field_file.name, 'digest': digest, 'files': files}
+
+
+def process(model, pk, file_field, manifest_field, on_done=None, force=False):
+    """
+    Builds the derivatives of one object's image and stores the manifest,
+    unless the image was replaced in the meantime. Calls on_done(obj) after
+    the manifest was stored. Returns True if a manifest was stored.
+    """
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None:
+        return False
+    field_file = getattr(obj, file_field)
+    if not field_file or not (force or needs_derivatives(field_file, getattr(obj, manifest_field))):
+        return False
+
+    manifest = generate_derivatives(field_file)
+    updated = model.objects.filter(pk=pk, **{file_field: field_file.name}).update(**{manifest_field: manifest})
+    if updated and on_done is not None:
+        on_done(obj)
+    return bool(updated)
+
+
+def schedule(model, pk, file_field, manifest_field, on_done=None):
+    """
+    Queues derivative generation for after the current transaction commits.
+    Runs in a thread pool of IMAGE_DERIVATIVE_WORKERS threads, or inline
+    when the setting is 0.
+    """
+    def submit():
+        workers = getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2)
+        if workers:
+            get_executor(workers).submit(run, model, pk, file_field, manifest_field, on_done)
+        else:
+            process(model, pk, file_field, manifest_field, on_done)
+
+    transaction.on_commit(submit)
+
+
+def get_executor(workers):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-derivatives')
+    return _executor
+
+
+def run(model, pk, file_field, manifest_field, on_done):
+    try:
+        process(model, pk, file_field, manifest_field, on_done)
+    except Exception:
+        logger.exception('Generating image derivatives failed for %s %s', model.__name__, pk)
+    finally:
+        connections.close_all()
@@ -0,0 +1,159 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a single ordering field with a unique tiebreak.
+
+    Each page is fetched with a "WHERE (field, id) > (last_value, last_id)" predicate
+    instead of an OFFSET, so deep pages cost the same as the first one. The returned
+    next/previous cursors are opaque tokens that encode the ordering and the boundary
+    row. The total count is only computed when the client asks for it.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+    ordering = 'id'
+    tiebreak_field = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.current_ordering = self.get_ordering(request, queryset, view)
+        cursor = self.decode_cursor(request)
+
+        field = self.current_ordering.lstrip('-')
+        descending = self.current_ordering.startswith('-')
+        backwards = bool(cursor and cursor['r'])
+
+        self.count = queryset.count() if self.wants_count(request) else None
+
+        if cursor:
+            queryset = queryset.filter(self.position_filter(field, descending != backwards, cursor))
+        queryset = queryset.order_by(*self.ordering_expressions(field, descending != backwards))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if backwards:
+            results.reverse()
+
+        self.has_next = True if backwards else has_more
+        self.has_previous = has_more if backwards else cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        payload = {}
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Returns the single ordering term (e.g. '-min_price') used as the keyset.
+        Uses the view's OrderingFilter when present, otherwise the class default.
+        """
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return ordering[0]
+        return self.ordering
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def ordering_expressions(self, field, descending):
+        prefix = '-' if descending else ''
+        if field == self.tiebreak_field:
+            return [prefix + field]
+        return [prefix + field, prefix + self.tiebreak_field]
+
+    def position_filter(self, field, descending, cursor):
+        """
+        Builds the predicate selecting rows strictly after the cursor position
+        in the given direction.
+        """
+        lookup = 'lt' if descending else 'gt'
+        after_tiebreak = Q(**{f'{self.tiebreak_field}__{lookup}': cursor['id']})
+        if field == self.tiebreak_field:
+            return after_tiebreak
+        return Q(**{f'{field}__{lookup}': cursor['v']}) | (Q(**{field: cursor['v']}) & after_tiebreak)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.build_link(self.page[0], backwards=True)
+
+    def build_link(self, obj, backwards):
+        url = self.request.build_absolute_uri()
+        field = self.current_ordering.lstrip('-')
+        token = self.encode_cursor({
+            'o': self.current_ordering,
+            'v': self.encode_value(getattr(obj, field)),
+            'id': getattr(obj, self.tiebreak_field),
+            'r': backwards,
+        })
+        return replace_query_param(remove_query_param(url, 'page'), self.cursor_query_param, token)
+
+    def encode_value(self, value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def encode_cursor(self, data):
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        """
+        Returns the decoded cursor, None on the first page, and raises NotFound
+        for malformed cursors or cursors issued for a different ordering.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            cursor = json.loads(raw.decode('utf-8'))
+            if not isinstance(cursor, dict) or not {'o', 'v', 'id', 'r'} <= cursor.keys():
+                raise ValueError
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if cursor['o'] != self.current_ordering:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
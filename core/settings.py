@@ -98,6 +98,34 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'coderr',
+    }
+}
+
+# Public offer list/detail responses (anonymous GET) are cached in this alias.
+OFFER_RESPONSE_CACHE_ALIAS = 'default'
+OFFER_RESPONSE_CACHE_TIMEOUT = 300
+
+# Token -> user + profile cache of CachedTokenAuthentication (per process).
+AUTH_TOKEN_CACHE_SIZE = 1024
+AUTH_TOKEN_CACHE_TTL = 60
+
+# Cached pages of the business/customer profile lists.
+PROFILE_DIRECTORY_CACHE_ALIAS = 'default'
+PROFILE_DIRECTORY_CACHE_TIMEOUT = 300
+
+# BaseInfoView statistics: seconds an in-process snapshot is served before a
+# background refresh (stale-while-revalidate).
+PLATFORM_STATS_CACHE_TTL = 30
+PLATFORM_STATS_BACKGROUND_REFRESH = True
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -146,7 +174,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
@@ -163,4 +191,7 @@ REST_FRAMEWORK = {
 
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Worker threads generating resized image derivatives after uploads (0 = inline).
+IMAGE_DERIVATIVE_WORKERS = 2
\ No newline at end of file
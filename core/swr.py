@@ -0,0 +1,109 @@
+"""
+In-process stale-while-revalidate cache for one computed value.
+
+A value younger than `ttl` seconds is returned as is. An older (or
+invalidated) value is still returned immediately while a single background
+thread reloads it, so a refresh never blocks a request. Only a cold cache
+makes callers wait, and then only one of them runs the loader while the
+others wait for its result (single flight).
+
+Every invalidate() bumps a generation counter. A load that started before
+an invalidation still publishes its result, but marked stale, so the next
+get() refreshes it instead of serving it for a full `ttl`.
+"""
+import logging
+import threading
+import time
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class StaleWhileRevalidate:
+    """
+    Holds the result of `loader()`. With `background=False` refreshes run
+    inline in the request that noticed the stale value (useful in tests).
+    """
+
+    def __init__(self, loader, ttl, background=True):
+        self.loader = loader
+        self.ttl = ttl
+        self.background = background
+        self._lock = threading.Lock()
+        self._value = MISSING
+        self._loaded_at = 0.0
+        self._loading = None
+        self._generation = 0
+
+    def get(self):
+        with self._lock:
+            value = self._value
+            if value is not MISSING and time.monotonic() - self._loaded_at < self.ttl:
+                return value
+            leader = self._loading is None
+            if leader:
+                self._loading = threading.Event()
+            loading = self._loading
+
+        if value is not MISSING:
+            if leader:
+                self._refresh_in_background()
+            return value
+        if leader:
+            return self._load()
+        loading.wait()
+        with self._lock:
+            value = self._value
+        return value if value is not MISSING else self._load()
+
+    def invalidate(self):
+        """
+        Marks the value stale; the next get() serves it once more and refreshes it.
+        """
+        with self._lock:
+            self._generation += 1
+            self._loaded_at = float('-inf')
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._value = MISSING
+            self._loaded_at = 0.0
+
+    def _load(self):
+        """
+        Runs the loader and publishes the result, marked stale when the cache was
+        invalidated meanwhile. Always wakes the waiting callers, also when the
+        loader fails (they then load for themselves).
+        """
+        try:
+            with self._lock:
+                generation = self._generation
+            value = self.loader()
+            with self._lock:
+                self._value = value
+                self._loaded_at = time.monotonic() if generation == self._generation else float('-inf')
+            return value
+        finally:
+            with self._lock:
+                loading, self._loading = self._loading, None
+            if loading is not None:
+                loading.set()
+
+    def _refresh_in_background(self):
+        if not self.background:
+            self._load()
+            return
+
+        def run():
+            try:
+                self._load()
+            except Exception:
+                logger.exception('Refreshing %r failed', self.loader)
+            finally:
+                connections.close_all()
+
+        threading.Thread(target=run, name='swr-refresh', daemon=True).start()
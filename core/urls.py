@@ -34,6 +34,7 @@ urlpatterns = [
     path('api/offerdetails/', include((offers_urls.details_urlpatterns, 'offers_app'), namespace='offerdetails')),
     path('api/orders/', include((orders_urls.orders_urlpatterns, 'orders_app'), namespace='orders')),
     path('api/order-count/', include((orders_urls.order_count_urlpatterns, 'orders_app'), namespace='ordercount')),
+    path('api/order-counts/', include((orders_urls.order_counts_urlpatterns, 'orders_app'), namespace='ordercounts')),
     path('api/completed-order-count/', include((orders_urls.completed_order_count_urlpatterns, 'orders_app'), namespace='completedordercount')),
     path('api/reviews/', include('reviews_app.api.urls')),
     path('api/base-info/', include('baseinfo_app.api.urls')),
@@ -10,11 +10,11 @@ class OfferDetailInline(admin.TabularInline):
 
 @admin.register(Offer)
 class OfferAdmin(admin.ModelAdmin):
-    list_display = ['id', 'title', 'user', 'calculated_min_price', 'calculated_min_delivery_time', 'created_at']
+    list_display = ['id', 'title', 'user', 'min_price', 'min_delivery_time', 'created_at']
     list_filter = ['created_at', 'updated_at']
     search_fields = ['title', 'description', 'user__username']
     inlines = [OfferDetailInline]
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'min_price', 'max_price', 'min_delivery_time', 'details_count']
 
 @admin.register(OfferDetail)
 class OfferDetailAdmin(admin.ModelAdmin):
@@ -1,12 +1,56 @@
 import django_filters
+from rest_framework.filters import SearchFilter
 
+from offers_app import features, search
 from offers_app.models import Offer
 
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """
+    Comma separated list of strings.
+    """
+
+
 class OfferFilter(django_filters.FilterSet):
+    """
+    Filters for the offer list. All filters run on columns of the offer row itself,
+    so combining them never joins OfferDetail or multiplies rows; the feature
+    filter uses a subquery on the interned feature index.
+    """
     creator_id = django_filters.NumberFilter(field_name='user_id')
-    min_price = django_filters.NumberFilter(field_name='details__price', lookup_expr='gte')
-    max_delivery_time = django_filters.NumberFilter(field_name='details__delivery_time_in_days', lookup_expr='lte')
+    # "Has a detail priced at least X" is the same as "highest detail price >= X",
+    # so both filters run against the denormalized offer summary without a join.
+    min_price = django_filters.NumberFilter(field_name='max_price', lookup_expr='gte')
+    max_delivery_time = django_filters.NumberFilter(field_name='min_delivery_time', lookup_expr='lte')
+    # '?features=Logo,Source files' matches offers with a detail listing all of them,
+    # '&features_match=any' offers with a detail listing at least one.
+    features = CharInFilter(method='filter_features')
+    features_match = django_filters.ChoiceFilter(
+        choices=[('all', 'all'), ('any', 'any')], method='filter_features_match'
+    )
 
     class Meta:
         model = Offer
-        fields = ['creator_id', 'min_price', 'max_delivery_time']
\ No newline at end of file
+        fields = ['creator_id', 'min_price', 'max_delivery_time', 'features', 'features_match']
+
+    def filter_features(self, queryset, name, value):
+        match = self.form.cleaned_data.get('features_match') or 'all'
+        return features.filter_offers(queryset, value, match)
+
+    def filter_features_match(self, queryset, name, value):
+        # Only modifies 'features'; see filter_features.
+        return queryset
+
+
+class OfferSearchFilter(SearchFilter):
+    """
+    Search backend for offers that resolves '?search=' through the full-text
+    index and orders the matches by relevance (an explicit '?ordering=' still wins).
+    Falls back to DRF's LIKE-based search when the index is unavailable.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not search.is_available():
+            return super().filter_queryset(request, queryset, view)
+        return search.search_offers(queryset, terms)
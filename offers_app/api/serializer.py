@@ -1,5 +1,14 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+
+from core.expand import ExpandableSerializerMixin, Expansion
+from core.fieldsets import FieldRequirement, SparseFieldsetMixin
+from baseinfo_app import stats as platform_stats
+from core.images import derivative_urls
+from user_app.api.serializer import PublicUserProfileSerializer
+from .. import cache, cards, features, search
 from ..models import Offer, OfferDetail
 
 
@@ -27,85 +36,156 @@ class UserDetailsSerializer(serializers.ModelSerializer):
         fields = ['first_name', 'last_name', 'username']
 
 
-class OfferListSerializer(serializers.ModelSerializer):
+class OfferDetailSerializer(serializers.ModelSerializer):
+    """
+    Full serializer for OfferDetail objects including all relevant fields.
+    """
+    class Meta:
+        model = OfferDetail
+        fields = [
+            'id',
+            'title',
+            'revisions',
+            'delivery_time_in_days',
+            'price',
+            'features',
+            'offer_type',
+        ]
+        extra_kwargs = {
+            'title': {'required': True},
+            'revisions': {'required': True},
+            'delivery_time_in_days': {'required': True},
+            'price': {'required': True},
+            'features': {'required': True},
+            'offer_type': {'required': True},
+        }
+
+
+class OfferListSerializer(SparseFieldsetMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     """
     Serializes an offer including:
     - Links to related OfferDetails
     - Basic user information
     - Computed minimum values for price and delivery time
+    - URLs of the resized image derivatives (null until generated)
+
+    '?expand=details' inlines the full OfferDetails instead of links,
+    '?expand=user' the creator's public profile instead of the user id.
+    '?fields=' / '?omit=' select the returned fields (see core.fieldsets).
     """
+    expandable_fields = {
+        'details': Expansion(OfferDetailSerializer, many=True, prefetch_related=['details']),
+        'user': Expansion(PublicUserProfileSerializer, source='user.profile', select_related=['user__profile', 'user__review_summary']),
+    }
+    field_requirements = {
+        'details': FieldRequirement(
+            prefetch_related=[Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer'))]
+        ),
+        'min_price': FieldRequirement(only=['min_price']),
+        'min_delivery_time': FieldRequirement(only=['min_delivery_time']),
+        'image_derivatives': FieldRequirement(only=['image', 'image_derivatives']),
+    }
     details = OfferDetailLinkSerializer(many=True, read_only=True)
     user_details = UserDetailsSerializer(source='user', read_only=True)
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
+    image_derivatives = serializers.SerializerMethodField()
     user = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         model = Offer
         fields = [
-            'id', 'user', 'title', 'image', 'description',
+            'id', 'user', 'title', 'image', 'image_derivatives', 'description',
             'created_at', 'updated_at', 'details',
             'min_price', 'min_delivery_time', 'user_details'
         ]
 
     def get_min_price(self, obj):
         """
-        Returns the annotated minimum price if available,
-        otherwise uses the calculated value.
+        Returns the stored minimum price maintained from the OfferDetails.
         """
-        return getattr(obj, 'annotated_min_price', None) or obj.calculated_min_price
+        return obj.min_price
 
     def get_min_delivery_time(self, obj):
         """
-        Returns the annotated minimum delivery time or the calculated value.
+        Returns the stored minimum delivery time maintained from the OfferDetails.
         """
-        return getattr(obj, 'annotated_min_delivery_time', None) or obj.calculated_min_delivery_time
+        return obj.min_delivery_time
 
+    def get_image_derivatives(self, obj):
+        """
+        Returns {size: {format: url}} for the resized image variants.
+        """
+        return derivative_urls(obj.image_derivatives, obj.image)
 
-class OfferDetailSerializer(serializers.ModelSerializer):
+
+class OfferBulkCreateListSerializer(serializers.ListSerializer):
     """
-    Full serializer for OfferDetail objects including all relevant fields.
+    Creates many offers with their nested OfferDetails in one transaction
+    using two bulk INSERTs (offers, then all details).
     """
-    class Meta:
-        model = OfferDetail
-        fields = [
-            'id',
-            'title',
-            'revisions',
-            'delivery_time_in_days',
-            'price',
-            'features',
-            'offer_type',
-        ]
-        extra_kwargs = {
-            'title': {'required': True},
-            'revisions': {'required': True},
-            'delivery_time_in_days': {'required': True},
-            'price': {'required': True},
-            'features': {'required': True},
-            'offer_type': {'required': True},
-        }
+
+    def create(self, validated_data):
+        offers, details = [], []
+        for offer_data in validated_data:
+            offer, offer_details = build_offer(offer_data)
+            offers.append(offer)
+            details.append(offer_details)
+
+        with transaction.atomic():
+            Offer.objects.bulk_create(offers)
+            for offer, offer_details in zip(offers, details):
+                for detail in offer_details:
+                    detail.offer = offer
+            all_details = [detail for offer_details in details for detail in offer_details]
+            OfferDetail.objects.bulk_create(all_details)
+            # bulk_create sends no signals: index, render and invalidate explicitly.
+            features.sync_features(all_details)
+            search.index_offers(offers)
+            cards.refresh_cards([offer.pk for offer in offers])
+            platform_stats.adjust(offer_count=len(offers))
+            cache.invalidate_offers(*offers)
+
+        prefetch_related_objects(offers, 'details')
+        return offers
+
+
+def build_offer(validated_data):
+    """
+    Builds an unsaved offer and its unsaved details from validated data,
+    with the price/delivery summary already computed.
+    """
+    details_data = validated_data.pop('details')
+    details = [OfferDetail(**detail_data) for detail_data in details_data]
+    return Offer(**validated_data, **Offer.summarize(details)), details
 
 
 class OfferCreateSerializer(serializers.ModelSerializer):
     """
     Allows creating an offer with multiple nested OfferDetails in one request.
+    With many=True, creates a whole list of offers at once.
     """
     details = OfferDetailSerializer(many=True)
 
     class Meta:
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
+        list_serializer_class = OfferBulkCreateListSerializer
 
     def create(self, validated_data):
         """
         Overrides default create method to also create nested OfferDetails.
+        The offer is inserted with its summary precomputed and the details
+        are written with a single bulk INSERT in the same transaction.
         """
-        details_data = validated_data.pop('details')
-        user = self.context['request'].user
-        offer = Offer.objects.create(**validated_data)
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        offer, details = build_offer(validated_data)
+        with transaction.atomic():
+            offer.save()
+            for detail in details:
+                detail.offer = offer
+            OfferDetail.objects.bulk_create(details)
+            features.sync_features(details)
+            cards.refresh_cards([offer.pk])
         return offer
 
 
@@ -128,32 +208,66 @@ class OfferPatchSerializer(serializers.ModelSerializer):
         ]
 
     def get_min_price(self, obj):
-        return obj.calculated_min_price
+        return obj.min_price
 
     def get_min_delivery_time(self, obj):
-        return obj.calculated_min_delivery_time
+        return obj.min_delivery_time
+
+    def validate_details(self, value):
+        """
+        Checks every detail change against the offer's existing tiers before
+        anything is written. Details are matched by offer_type.
+        """
+        if self.instance is None:
+            return value
+        existing_types = {detail.offer_type for detail in self.get_existing_details(self.instance)}
+        for detail_data in value:
+            offer_type = detail_data.get('offer_type')
+            if not offer_type:
+                raise serializers.ValidationError("offer_type muss im Detail angegeben werden.")
+            if offer_type not in existing_types:
+                raise serializers.ValidationError(f"Kein Detail mit offer_type '{offer_type}' gefunden.")
+        return value
+
+    def get_existing_details(self, instance):
+        """
+        Loads the offer's details once; later accesses (including the
+        response's 'details' field) reuse the prefetched list.
+        """
+        prefetch_related_objects([instance], 'details')
+        return instance.details.all()
 
     def update(self, instance, validated_data):
+        """
+        Applies offer and detail changes atomically: one UPDATE for the offer
+        (including its recomputed summary) and one bulk_update for all changed
+        details, regardless of the number of tiers.
+        """
         details_data = validated_data.pop('details', None)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
+        changed_details, update_fields = [], set()
         if details_data:
-            existing_details = {d.offer_type: d for d in instance.details.all()}
-
+            details = list(self.get_existing_details(instance))
+            existing_details = {detail.offer_type: detail for detail in details}
             for detail_data in details_data:
-                offer_type = detail_data.get('offer_type')
-                if not offer_type:
-                    raise serializers.ValidationError("offer_type muss im Detail angegeben werden.")
-
-                existing_detail = existing_details.get(offer_type)
-                if not existing_detail:
-                    raise serializers.ValidationError(f"Kein Detail mit offer_type '{offer_type}' gefunden.")
+                detail = existing_details[detail_data['offer_type']]
+                for attr, value in detail_data.items():
+                    setattr(detail, attr, value)
+                update_fields.update(detail_data)
+                changed_details.append(detail)
+            for attr, value in Offer.summarize(details).items():
+                setattr(instance, attr, value)
 
-                detail_serializer = OfferDetailSerializer(existing_detail, data=detail_data, partial=True)
-                detail_serializer.is_valid(raise_exception=True)
-                detail_serializer.save()
+        with transaction.atomic():
+            instance.save()
+            if changed_details:
+                OfferDetail.objects.bulk_update(changed_details, fields=sorted(update_fields))
+                # bulk_update sends no signals: reindex features and invalidate the cached detail responses.
+                if 'features' in update_fields:
+                    features.sync_features(changed_details)
+                cache.invalidate_details(instance, *(detail.pk for detail in changed_details))
 
         return instance
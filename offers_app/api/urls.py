@@ -1,12 +1,15 @@
 from django.urls import path
-from .views import OfferListView, OfferDetailRetrieveView, SingleOfferView
+from .views import OfferListView, OfferDetailBatchView, OfferDetailRetrieveView, SingleOfferView, OfferBulkCreateView, OfferExportView
 
 offers_urlpatterns = [
     path('', OfferListView.as_view(), name='offerslist'),              
+    path('bulk/', OfferBulkCreateView.as_view(), name='offersbulk'),
+    path('export/', OfferExportView.as_view(), name='offersexport'),
     path('<int:id>/', SingleOfferView.as_view(), name='singleoffer'),               
 ]
 
 details_urlpatterns = [
+    path('', OfferDetailBatchView.as_view(), name='offerdetailsbatch'),
     path('<int:id>/', OfferDetailRetrieveView.as_view(), name='offerdetails'),             
 ]
 
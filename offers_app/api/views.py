@@ -1,17 +1,24 @@
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.renderers import JSONRenderer
-from django.db.models import Min, Max
 from rest_framework import status, generics
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from user_app.models import UserProfile
-from offers_app.api.filters import OfferFilter
+from core import batch
+from core.batch import BatchRetrieveMixin
+from core.cache import normalize_query
+from core.conditional import conditional_get
+from core.pagination import KeysetPagination
+from offers_app import cache as response_cache
+from offers_app import cards, export, facets
+from offers_app.api.filters import OfferFilter, OfferSearchFilter
 from offers_app.models import Offer, OfferDetail
+from .renderers import CSVRenderer, NDJSONRenderer
 from .serializer import (
     OfferListSerializer,
     OfferCreateSerializer,
@@ -20,10 +27,25 @@ from .serializer import (
 )
 
 
+def ensure_business_user(user):
+    """
+    Raises PermissionDenied unless the user has a business profile.
+    The profile is loaded together with the user by the authentication.
+    """
+    user_profile = getattr(user, 'profile', None)
+    if user_profile is None:
+        raise PermissionDenied('User profile not found.')
+
+    if user_profile.user_type == 'customer':
+        raise PermissionDenied('Only business users can create offers.')
+
+
 class OfferDetailRetrieveView(generics.RetrieveAPIView):
     """
     GET /api/offer-details/<id>/
     Returns a single OfferDetail object by its ID.
+    Anonymous responses are served from the offer response cache;
+    conditional requests (ETag / If-None-Match) are answered with 304.
     """
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailSerializer
@@ -31,6 +53,42 @@ class OfferDetailRetrieveView(generics.RetrieveAPIView):
     pagination_class = None
     lookup_field = 'id'
 
+    def get_validators(self, request, *args, **kwargs):
+        return (response_cache.detail_generation(kwargs['id']), normalize_query(request.query_params)), None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not response_cache.is_cacheable(request):
+            return super().retrieve(request, *args, **kwargs)
+
+        key = response_cache.detail_key(kwargs['id'])
+        data = response_cache.get_response_data(key, 'detail')
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        response = super().retrieve(request, *args, **kwargs)
+        response_cache.set_response_data(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class OfferDetailBatchView(BatchRetrieveMixin, generics.GenericAPIView):
+    """
+    GET /api/offerdetails/?ids=1,2,3
+    Returns up to `max_batch_ids` OfferDetail objects in the requested order,
+    plus the ids that were not found, with a single query.
+    """
+    queryset = OfferDetail.objects.all()
+    serializer_class = OfferDetailSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+
+    def get(self, request):
+        return self.batch_retrieve(request)
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     """
@@ -41,18 +99,36 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class OfferCursorPagination(KeysetPagination):
+    """
+    Opt-in keyset pagination for offers, ordered by any of the list's
+    ordering fields with 'id' as tiebreak. Skips the count unless
+    '?include_count=true' is passed.
+    """
+    page_size = 6
+    max_page_size = 100
+
 
-class OfferListView(generics.ListCreateAPIView):
+class OfferListView(BatchRetrieveMixin, generics.ListCreateAPIView):
     """
     GET /api/offers/ - Lists offers with pagination
+        (page numbers by default, keyset cursors with '?pagination=cursor');
+        '?expand=details,user' inlines details and creator profiles,
+        '?fields=' / '?omit=' return (and load) only the selected fields;
+        the default representation is assembled from pre-rendered offer cards
+        (see offers_app.cards), anonymous responses are served from the offer
+        response cache, conditional requests (ETag / If-None-Match) are answered with 304;
+        '?facets=true' adds price, delivery time and offer type counts for the
+        current filters and search (see offers_app.facets);
+        '?ids=1,2,3' returns exactly those offers in the requested order plus the
+        ids that were not found (see core.batch), without filters or pagination
     POST /api/offers/ - Creates a new offer without pagination
     """
-    queryset = Offer.objects.all().prefetch_related('details', 'user').annotate(
-        annotated_min_price=Min('details__price'),
-        annotated_min_delivery_time=Min('details__delivery_time_in_days')
-    )
+    queryset = Offer.objects.all().select_related('user').prefetch_related('details')
     serializer_class = OfferListSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    renderer_classes = [cards.OfferCardJSONRenderer]
+    use_cards = True
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter, OrderingFilter]
     filterset_class = OfferFilter
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price', 'max_price']
@@ -60,10 +136,73 @@ class OfferListView(generics.ListCreateAPIView):
     
 
     def get_queryset(self):
-        return super().get_queryset().annotate(
-            min_price=Min('details__price'),
-            max_price=Max('details__price')
-        ).order_by('id')
+        queryset = OfferListSerializer.expand_queryset(super().get_queryset().order_by('id'), self.request)
+        return OfferListSerializer.sparse_queryset(queryset, self.request, columns=self.ordering_fields)
+
+    @property
+    def paginator(self):
+        """
+        Uses cursor pagination when the client passes '?pagination=cursor'
+        or a cursor token, page numbers otherwise.
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if 'cursor' in params or params.get('pagination') == 'cursor':
+                self._paginator = OfferCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_validators(self, request, *args, **kwargs):
+        return response_cache.list_key(request), None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        if not response_cache.is_cacheable(request):
+            return self.list_offers(request, *args, **kwargs)
+
+        key = response_cache.list_key(request)
+        data = response_cache.get_response_data(key, 'list')
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        response = self.list_offers(request, *args, **kwargs)
+        response_cache.set_response_data(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list_offers(self, request, *args, **kwargs):
+        """
+        Builds the page from the stored offer cards unless the client asked for
+        another representation ('?expand=', '?fields=', '?omit='), and adds the
+        facet counts when requested. '?ids=' requests are answered by batch_retrieve().
+        """
+        if batch.is_requested(request):
+            return self.batch_retrieve(request)
+
+        if self.use_cards and cards.can_serve(request):
+            queryset = cards.with_cards(self.filter_queryset(self.get_queryset()), columns=self.ordering_fields)
+            page = self.paginate_queryset(queryset)
+            response = self.get_paginated_response(cards.card_fragments(page, request))
+        else:
+            response = super().list(request, *args, **kwargs)
+
+        if facets.is_requested(request):
+            response.data['facets'] = facets.get_facets(self.filter_queryset(self.get_queryset()), request)
+        return response
+
+    def get_batch_queryset(self):
+        if self.use_cards and cards.can_serve(self.request):
+            return cards.with_cards(self.get_queryset(), columns=self.ordering_fields)
+        return self.get_queryset()
+
+    def serialize_batch(self, offers):
+        if self.use_cards and cards.can_serve(self.request):
+            return cards.card_fragments(offers, self.request)
+        return super().serialize_batch(offers)
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -77,14 +216,7 @@ class OfferListView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         user = self.request.user
-        try:
-            user_profile = UserProfile.objects.get(user_id=user.id)
-        except UserProfile.DoesNotExist:
-            raise PermissionDenied('User profile not found.')
-
-        if user_profile.user_type == 'customer':
-            raise PermissionDenied('Only business users can create offers.')
-
+        ensure_business_user(user)
         serializer.save(user=user)
 
     def get_paginated_response(self, data):
@@ -96,25 +228,92 @@ class OfferListView(generics.ListCreateAPIView):
 
 
 
+class OfferExportView(generics.GenericAPIView):
+    """
+    GET /api/offers/export/
+    Streams every offer with its details as NDJSON ('?format=ndjson', default)
+    or CSV ('?format=csv', one row per detail). Accepts the filters and the
+    search of the offer list. Offers are read in chunks of `chunk_size` with
+    the details prefetched per chunk, so memory use does not grow with the catalog.
+    """
+    queryset = Offer.objects.prefetch_related('details').order_by('id')
+    permission_classes = [AllowAny]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    filterset_class = OfferFilter
+    search_fields = ['title', 'description']
+    pagination_class = None
+    chunk_size = 500
+
+    def get(self, request):
+        offers = self.filter_queryset(self.get_queryset()).iterator(chunk_size=self.chunk_size)
+        renderer = request.accepted_renderer
+        if renderer.format == 'csv':
+            response = StreamingHttpResponse(export.iter_csv(offers), content_type='text/csv; charset=utf-8')
+        else:
+            response = StreamingHttpResponse(export.iter_ndjson(offers), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="offers.{renderer.format}"'
+        return response
+
+    def handle_exception(self, exc):
+        """
+        Errors (e.g. invalid filter values) are answered as regular JSON.
+        """
+        response = super().handle_exception(exc)
+        self.request.accepted_renderer = JSONRenderer()
+        self.request.accepted_media_type = JSONRenderer.media_type
+        return response
+
+
+class OfferBulkCreateView(APIView):
+    """
+    POST /api/offers/bulk/
+    Creates a list of offers (each with nested details) in one request.
+    All items are validated first; if any item is invalid nothing is created
+    and the response lists the errors per item (same position as in the request).
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    max_offers = 500
+
+    def post(self, request):
+        ensure_business_user(request.user)
+        serializer = OfferCreateSerializer(data=request.data, many=True, max_length=self.max_offers)
+        if serializer.is_valid():
+            serializer.save(user=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+
 class SingleOfferView(APIView):
     """
     Handles GET, PATCH, and DELETE for a single Offer instance.
+    GET supports conditional requests (ETag / If-None-Match) and '?expand='.
     Permissions: Only the creator can PATCH or DELETE.
     """
     permission_classes = [IsAuthenticated]
     pagination_class = None
 
     def get_object(self, id):
+        queryset = OfferListSerializer.expand_queryset(Offer.objects.select_related('user'), self.request)
         try:
-            return Offer.objects.get(pk=id)
+            return queryset.get(pk=id)
         except Offer.DoesNotExist:
             return None
 
+    def get_validators(self, request, id):
+        creator_id = Offer.objects.filter(pk=id).values_list('user_id', flat=True).first()
+        if creator_id is None:
+            return None
+        # '?expand=' / '?fields=' change the body, so the query is part of the tag.
+        return (response_cache.offer_generation(id, creator_id), normalize_query(request.query_params)), None
+
+    @conditional_get
     def get(self, request, id):
         offer = self.get_object(id)
         if not offer:
             return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = OfferListSerializer(offer)
+        serializer = OfferListSerializer(offer, context={'request': request})
         return Response(serializer.data)
 
     def patch(self, request, id):
@@ -0,0 +1,135 @@
+"""
+Response cache for the public offer endpoints (anonymous GET only).
+
+Entries are keyed by a generation token plus the normalized request, so
+invalidation never deletes entries: bumping a generation makes every entry
+built under the old token unreachable and lets it expire.
+
+Generation scopes (see core.cache):
+    offers:catalog          every offer list without a creator filter
+    offers:creator:<id>     offer lists filtered by '?creator_id=<id>'
+    offers:offer:<id>       the '/api/offers/<id>/' response
+    offers:detail:<id>      the '/api/offerdetails/<id>/' response
+
+Hit/miss counters are kept in the same cache as the entries.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core import batch
+from core.cache import bump_generations, get_generation, normalize_query
+
+KEY_PREFIX = 'offers:response'
+STAT_NAMES = ('list_hits', 'list_misses', 'detail_hits', 'detail_misses')
+
+
+def get_cache():
+    return caches[getattr(settings, 'OFFER_RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'OFFER_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def is_cacheable(request):
+    """
+    Only anonymous GET requests share cached responses.
+    """
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def invalidate_offers(*offers):
+    """
+    Invalidates the given offers and every list that can contain them.
+    """
+    bump_generations(
+        'offers:catalog',
+        *{f'offers:creator:{offer.user_id}' for offer in offers},
+        *(f'offers:offer:{offer.pk}' for offer in offers),
+    )
+
+
+def invalidate_creator(creator_id):
+    """
+    Invalidates every list showing offers of a creator (e.g. after a name change).
+    """
+    bump_generations('offers:catalog', f'offers:creator:{creator_id}')
+
+
+def invalidate_details(offer, *detail_ids):
+    """
+    Invalidates OfferDetail responses together with their offer and its lists.
+    """
+    bump_generations(
+        'offers:catalog',
+        f'offers:creator:{offer.user_id}',
+        f'offers:offer:{offer.pk}',
+        *(f'offers:detail:{detail_id}' for detail_id in detail_ids),
+    )
+
+
+def list_generation(request):
+    """
+    '?creator_id=' lists depend only on that creator. '?ids=' batches ignore the
+    filter and may contain any offer, so they always use the catalog scope.
+    """
+    creator_id = request.query_params.get('creator_id', '')
+    if creator_id.isdigit() and not batch.is_requested(request):
+        return get_generation(f'offers:creator:{creator_id}')
+    return get_generation('offers:catalog')
+
+
+def offer_generation(offer_id, creator_id):
+    """
+    Token covering a single offer response (the offer and its creator's name).
+    """
+    return f'{get_generation(f"offers:offer:{offer_id}")}:{get_generation(f"offers:creator:{creator_id}")}'
+
+
+def detail_generation(detail_id):
+    return get_generation(f'offers:detail:{detail_id}')
+
+
+def list_key(request):
+    digest = hashlib.md5(
+        f'{request.get_host()}{request.path}?{normalize_query(request.query_params)}'.encode('utf-8')
+    ).hexdigest()
+    return f'{KEY_PREFIX}:list:{list_generation(request)}:{digest}'
+
+
+def detail_key(detail_id):
+    return f'{KEY_PREFIX}:detail:{detail_id}:{detail_generation(detail_id)}'
+
+
+def get_response_data(key, kind):
+    """
+    Returns the cached response data for a key (or None) and counts the hit or miss.
+    """
+    data = get_cache().get(key)
+    record(f'{kind}_hits' if data is not None else f'{kind}_misses')
+    return data
+
+
+def set_response_data(key, data):
+    get_cache().set(key, data, get_timeout())
+
+
+def record(stat):
+    cache = get_cache()
+    key = f'{KEY_PREFIX}:stats:{stat}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_stats():
+    cache = get_cache()
+    return {stat: cache.get(f'{KEY_PREFIX}:stats:{stat}', 0) for stat in STAT_NAMES}
+
+
+def reset_stats():
+    get_cache().delete_many([f'{KEY_PREFIX}:stats:{stat}' for stat in STAT_NAMES])
@@ -0,0 +1,135 @@
+"""
+Pre-rendered offer cards for the offer list.
+
+Each offer's OfferListSerializer output is rendered to compact JSON once and
+stored in OfferCard. The list endpoint then joins the stored fragments into
+the response body instead of running the nested serializers per row. Only
+the image URL is filled in per request (it is absolute and host dependent).
+
+Cards are re-rendered by the signals in offers_app.signals whenever the
+offer, one of its details or its creator changes, and by the bulk write
+paths that bypass signals. Offers without a card (e.g. rows written by raw
+SQL) are rendered on first use.
+"""
+import json
+
+from rest_framework.renderers import JSONRenderer
+
+from core.expand import EXPAND_QUERY_PARAM
+from core.fieldsets import is_sparse
+from .models import Offer, OfferCard
+
+IMAGE_PLACEHOLDER = '"image":null'
+
+
+class CardList(list):
+    """
+    List of card JSON texts. OfferCardJSONRenderer writes the texts into the
+    response as they are; reading items (e.g. response.data in tests) parses them.
+    """
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [json.loads(item) for item in super().__getitem__(index)]
+        return json.loads(super().__getitem__(index))
+
+    def __iter__(self):
+        return (json.loads(item) for item in super().__iter__())
+
+    def texts(self):
+        return super().__iter__()
+
+    def __reduce__(self):
+        return CardList, (list(self.texts()),)
+
+
+class OfferCardJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that splices the pre-rendered cards of a paginated 'results'
+    CardList into the body. Other payloads are rendered as usual.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        results = data.get('results') if isinstance(data, dict) else None
+        if not isinstance(results, CardList):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        envelope = super().render(
+            {key: value for key, value in data.items() if key != 'results'},
+            accepted_media_type, renderer_context,
+        )
+        body = ','.join(results.texts()).encode('utf-8')
+        separator = b',' if len(envelope) > 2 else b''
+        return envelope[:-1] + separator + b'"results":[' + body + b']}'
+
+
+def can_serve(request):
+    """
+    Cards hold the default representation only: no '?expand=', '?fields=' or '?omit='.
+    """
+    return request.method == 'GET' and EXPAND_QUERY_PARAM not in request.query_params and not is_sparse(request)
+
+
+def render_offers(offers):
+    """
+    Renders the card JSON of offers loaded with their user and details.
+    """
+    from .api.serializer import OfferListSerializer
+
+    renderer = JSONRenderer()
+    fragments = {}
+    for offer, data in zip(offers, OfferListSerializer(offers, many=True).data):
+        data['image'] = None
+        fragments[offer.pk] = renderer.render(data).decode('utf-8')
+    return fragments
+
+
+def refresh_cards(offer_ids):
+    """
+    Re-renders and upserts the cards of the given offers. Returns {offer_id: fragment}.
+    """
+    offers = list(Offer.objects.filter(pk__in=list(offer_ids)).select_related('user').prefetch_related('details'))
+    fragments = render_offers(offers)
+    OfferCard.objects.bulk_create(
+        [OfferCard(offer_id=offer_id, fragment=fragment) for offer_id, fragment in fragments.items()],
+        update_conflicts=True,
+        unique_fields=['offer'],
+        update_fields=['fragment', 'rendered_at'],
+    )
+    return fragments
+
+
+def refresh_creator_cards(user_id):
+    return refresh_cards(Offer.objects.filter(user_id=user_id).values_list('pk', flat=True))
+
+
+def with_cards(queryset, columns=()):
+    """
+    Loads each offer's stored card and only the offer columns the page needs
+    (the image plus `columns`, e.g. the fields used for cursor pagination).
+    """
+    return (
+        queryset.select_related(None).prefetch_related(None)
+        .select_related('card')
+        .only('id', 'image', *columns, 'card__fragment')
+    )
+
+
+def card_fragments(offers, request):
+    """
+    Returns the CardList for a page of offers loaded via with_cards(),
+    rendering missing cards on the fly.
+    """
+    stored = {offer.pk: offer.card.fragment for offer in offers if hasattr(offer, 'card')}
+    missing = [offer.pk for offer in offers if offer.pk not in stored]
+    if missing:
+        stored.update(refresh_cards(missing))
+
+    fragments = CardList()
+    for offer in offers:
+        fragment = stored[offer.pk]
+        if offer.image:
+            url = json.dumps(request.build_absolute_uri(offer.image.url), ensure_ascii=False)
+            fragment = fragment.replace(IMAGE_PLACEHOLDER, f'"image":{url}', 1)
+        fragments.append(fragment)
+    return fragments
@@ -0,0 +1,87 @@
+"""
+Streaming export of the offer catalog as NDJSON (one offer with its details
+per line) or CSV (one row per offer detail).
+
+The generators consume a queryset iterator, so only one chunk of offers (and
+the details prefetched for it) is held in memory at a time.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+OFFER_FIELDS = [
+    'id', 'user', 'title', 'description', 'image', 'created_at', 'updated_at',
+    'min_price', 'max_price', 'min_delivery_time',
+]
+DETAIL_FIELDS = ['id', 'offer_type', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features']
+CSV_HEADER = [f'offer_{name}' for name in OFFER_FIELDS] + [f'detail_{name}' for name in DETAIL_FIELDS]
+
+
+def detail_record(detail):
+    return {
+        'id': detail.id,
+        'offer_type': detail.offer_type,
+        'title': detail.title,
+        'revisions': detail.revisions,
+        'delivery_time_in_days': detail.delivery_time_in_days,
+        'price': detail.price,
+        'features': detail.features,
+    }
+
+
+def offer_record(offer):
+    return {
+        'id': offer.id,
+        'user': offer.user_id,
+        'title': offer.title,
+        'description': offer.description,
+        'image': offer.image.url if offer.image else None,
+        'created_at': offer.created_at,
+        'updated_at': offer.updated_at,
+        'min_price': offer.min_price,
+        'max_price': offer.max_price,
+        'min_delivery_time': offer.min_delivery_time,
+    }
+
+
+def iter_ndjson(offers):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for offer in offers:
+        record = offer_record(offer)
+        record['details'] = [detail_record(detail) for detail in offer.details.all()]
+        yield encoder.encode(record) + '\n'
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer can feed a generator.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(offers):
+    """
+    One row per detail; offers without details get one row with empty detail columns.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for offer in offers:
+        offer_values = [csv_value(value) for value in offer_record(offer).values()]
+        details = offer.details.all()
+        if not details:
+            yield writer.writerow(offer_values + [''] * len(DETAIL_FIELDS))
+        for detail in details:
+            yield writer.writerow(offer_values + [csv_value(value) for value in detail_record(detail).values()])
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
@@ -0,0 +1,118 @@
+"""
+Facet counts for the offer list ('?facets=true').
+
+All counts are computed in one aggregate query over the filtered offers:
+price and delivery buckets from the denormalized summary columns, offer types
+via EXISTS on OfferDetail. Results are cached per filter signature (the
+normalized query without pagination, ordering and representation parameters)
+under the same generation tokens as the offer response cache, so any offer
+write invalidates them.
+"""
+import hashlib
+
+from django.db.models import Count, Exists, OuterRef, Q
+from django.http import QueryDict
+
+from core.cache import normalize_query
+from . import cache
+from .models import OfferDetail
+
+FACETS_QUERY_PARAM = 'facets'
+# (key, lower bound inclusive, upper bound exclusive); None means unbounded.
+PRICE_BUCKETS = [
+    ('0-50', None, 50),
+    ('50-100', 50, 100),
+    ('100-250', 100, 250),
+    ('250-500', 250, 500),
+    ('500+', 500, None),
+]
+# Delivery buckets in days (bounds inclusive).
+DELIVERY_BUCKETS = [
+    ('1', None, 1),
+    ('2-3', 2, 3),
+    ('4-7', 4, 7),
+    ('8-14', 8, 14),
+    ('15+', 15, None),
+]
+# Stored offer types vary in case ('basic' / 'Basic'); they are matched ignoring it.
+OFFER_TYPES = ['basic', 'standard', 'premium']
+# Parameters that do not change which offers match.
+NON_FILTER_PARAMS = {
+    FACETS_QUERY_PARAM, 'page', 'page_size', 'cursor', 'pagination', 'include_count',
+    'ordering', 'expand', 'fields', 'omit', 'format',
+}
+
+
+def is_requested(request):
+    return request.query_params.get(FACETS_QUERY_PARAM, '').lower() in ('1', 'true', 'yes')
+
+
+def price_filter(lower, upper):
+    """
+    Buckets an offer by its starting price (min_price). Offers without
+    details have no price and are not counted.
+    """
+    condition = Q(details_count__gt=0)
+    if lower is not None:
+        condition &= Q(min_price__gte=lower)
+    if upper is not None:
+        condition &= Q(min_price__lt=upper)
+    return condition
+
+
+def delivery_filter(lower, upper):
+    condition = Q(details_count__gt=0)
+    if lower is not None:
+        condition &= Q(min_delivery_time__gte=lower)
+    if upper is not None:
+        condition &= Q(min_delivery_time__lte=upper)
+    return condition
+
+
+def compute_facets(queryset):
+    """
+    Counts the offers of a (filtered) queryset per price bucket, delivery bucket
+    and offer type in a single query.
+    """
+    aggregates = {}
+    for index, (_, lower, upper) in enumerate(PRICE_BUCKETS):
+        aggregates[f'price_{index}'] = Count('pk', filter=price_filter(lower, upper))
+    for index, (_, lower, upper) in enumerate(DELIVERY_BUCKETS):
+        aggregates[f'delivery_{index}'] = Count('pk', filter=delivery_filter(lower, upper))
+    for offer_type in OFFER_TYPES:
+        has_type = Exists(OfferDetail.objects.filter(offer=OuterRef('pk'), offer_type__iexact=offer_type))
+        aggregates[f'type_{offer_type}'] = Count('pk', filter=Q(has_type))
+
+    counts = queryset.order_by().aggregate(**aggregates)
+    return {
+        'price': [
+            {'key': key, 'min': lower, 'max': upper, 'count': counts[f'price_{index}']}
+            for index, (key, lower, upper) in enumerate(PRICE_BUCKETS)
+        ],
+        'delivery_time': [
+            {'key': key, 'min': lower, 'max': upper, 'count': counts[f'delivery_{index}']}
+            for index, (key, lower, upper) in enumerate(DELIVERY_BUCKETS)
+        ],
+        'offer_type': {offer_type: counts[f'type_{offer_type}'] for offer_type in OFFER_TYPES},
+    }
+
+
+def facets_key(request):
+    params = QueryDict(mutable=True)
+    for key in request.query_params:
+        if key not in NON_FILTER_PARAMS:
+            params.setlist(key, request.query_params.getlist(key))
+    digest = hashlib.md5(normalize_query(params).encode('utf-8')).hexdigest()
+    return f'{cache.KEY_PREFIX}:facets:{cache.list_generation(request)}:{digest}'
+
+
+def get_facets(queryset, request):
+    """
+    Returns the facet counts for the request's filters, from the cache if possible.
+    """
+    key = facets_key(request)
+    facets = cache.get_cache().get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.get_cache().set(key, facets, cache.get_timeout())
+    return facets
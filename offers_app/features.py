@@ -0,0 +1,75 @@
+"""
+Interned feature index for OfferDetail.features.
+
+The JSON list stays the source of truth for the API. Each distinct feature
+string is stored once in Feature and linked to the details listing it
+through the indexed OfferDetail.indexed_features table, which the
+'features' filter of OfferFilter queries instead of scanning JSON.
+"""
+from django.db.models import Count
+
+from .models import Feature, OfferDetail
+
+MAX_FEATURE_LENGTH = Feature._meta.get_field('name').max_length
+
+
+def feature_names(features):
+    """
+    Returns the distinct, non-empty strings of a features value in order.
+    Values that are not a list (or entries that are not strings) are not indexed.
+    """
+    if not isinstance(features, list):
+        return []
+    names = []
+    for item in features:
+        if isinstance(item, str):
+            name = item.strip()[:MAX_FEATURE_LENGTH]
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def sync_features(details):
+    """
+    Rebuilds the feature links of saved OfferDetails from their JSON lists
+    with a fixed number of queries per call, whatever the number of details.
+    """
+    details = [detail for detail in details if detail.pk is not None]
+    if not details:
+        return
+    names_by_detail = {detail.pk: feature_names(detail.features) for detail in details}
+    all_names = {name for names in names_by_detail.values() for name in names}
+
+    feature_ids = {}
+    if all_names:
+        Feature.objects.bulk_create([Feature(name=name) for name in all_names], ignore_conflicts=True)
+        feature_ids = dict(Feature.objects.filter(name__in=all_names).values_list('name', 'id'))
+
+    Link = OfferDetail.indexed_features.through
+    Link.objects.filter(offerdetail_id__in=names_by_detail).delete()
+    Link.objects.bulk_create([
+        Link(offerdetail_id=detail_id, feature_id=feature_ids[name])
+        for detail_id, names in names_by_detail.items()
+        for name in names
+    ])
+
+
+def filter_offers(queryset, names, match='all'):
+    """
+    Keeps offers with a detail listing all (match='all') or any (match='any')
+    of the given feature names, resolved through the feature index.
+    """
+    names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+    if not names:
+        return queryset
+    feature_ids = list(Feature.objects.filter(name__in=names).values_list('id', flat=True))
+    if match == 'all' and len(feature_ids) < len(names):
+        return queryset.none()
+    if not feature_ids:
+        return queryset.none()
+
+    links = OfferDetail.indexed_features.through.objects.filter(feature_id__in=feature_ids).order_by()
+    if match == 'all':
+        links = links.values('offerdetail_id').annotate(matched=Count('feature_id')).filter(matched=len(feature_ids))
+    detail_ids = links.values('offerdetail_id')
+    return queryset.filter(pk__in=OfferDetail.objects.filter(pk__in=detail_ids).values('offer_id'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core import images
+from offers_app.models import Offer
+from offers_app.signals import derivatives_ready
+from user_app import cache as profile_cache
+from user_app.models import UserProfile
+
+
+class Command(BaseCommand):
+    """
+    Generates the resized derivatives for offer images and profile pictures
+    that have none yet (e.g. uploaded before derivatives existed), synchronously.
+    """
+    help = 'Generates missing image derivatives for offers and profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate existing manifests as well.')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        targets = [
+            (Offer, 'image', 'image_derivatives', derivatives_ready),
+            (UserProfile, 'file', 'file_derivatives', lambda profile: profile_cache.invalidate_profile(profile.user_id)),
+        ]
+        for model, file_field, manifest_field, on_done in targets:
+            processed = 0
+            pks = model.objects.exclude(**{file_field: ''}).values_list('pk', flat=True)
+            for pk in pks.iterator():
+                if images.process(model, pk, file_field, manifest_field, on_done=on_done, force=force):
+                    processed += 1
+            self.stdout.write(self.style.SUCCESS(f'Generated derivatives for {processed} {model._meta.verbose_name_plural}.'))
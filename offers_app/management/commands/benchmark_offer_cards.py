@@ -0,0 +1,70 @@
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from offers_app import cards
+from offers_app.api.views import OfferListView
+from offers_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Compares rendering an offer list page from the pre-rendered cards with the
+    per-row serializer path on a synthetic catalog. Requests are authenticated,
+    so the response cache is bypassed. All generated data is rolled back.
+    """
+    help = 'Benchmarks the offer list: pre-rendered cards vs. OfferListSerializer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=1000, help='Number of synthetic offers.')
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20, help='Requests per path.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options['offers'])
+            host = next((host for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost').lstrip('.')
+            request = APIRequestFactory().get('/api/offers/', {'page_size': options['page_size']}, HTTP_HOST=host)
+            force_authenticate(request, user=user)
+            serializer = self.measure(OfferListView.as_view(use_cards=False), request, options['repeat'])
+            card = self.measure(OfferListView.as_view(), request, options['repeat'])
+            self.stdout.write(
+                f'{options["page_size"]} offers per page: serializer {serializer * 1000:.1f} ms, '
+                f'cards {card * 1000:.1f} ms ({serializer / card:.1f}x)'
+            )
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(42)
+        user = User.objects.create(username='benchmark-offer-cards', first_name='Bench', last_name='Mark')
+        offers = Offer.objects.bulk_create([
+            Offer(user=user, title=f'Offer {index}', description='Synthetic offer. ' * 10)
+            for index in range(count)
+        ])
+        OfferDetail.objects.bulk_create([
+            OfferDetail(
+                offer=offer, title=offer_type, revisions=rng.randint(1, 5),
+                delivery_time_in_days=rng.randint(1, 30), price=rng.randint(10, 999),
+                features=['Feature A', 'Feature B'], offer_type=offer_type,
+            )
+            for offer in offers for offer_type in ('basic', 'standard', 'premium')
+        ])
+        Offer.objects.all().refresh_summaries()
+        ids = [offer.pk for offer in offers]
+        for start in range(0, len(ids), 500):
+            cards.refresh_cards(ids[start:start + 500])
+        self.stdout.write(f'Seeded {count} offers with cards.')
+        return user
+
+    def measure(self, view, request, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            view(request).render()
+            timings.append(time.perf_counter() - start)
+        return sorted(timings)[len(timings) // 2]
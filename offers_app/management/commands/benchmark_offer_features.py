@@ -0,0 +1,79 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import BooleanField, Exists, OuterRef
+from django.db.models.expressions import RawSQL
+
+from offers_app import features
+from offers_app.models import Offer, OfferDetail
+
+FEATURES = [f'Feature {index}' for index in range(400)] + ['Logo Design', 'Source files', 'Express delivery']
+
+
+class Command(BaseCommand):
+    """
+    Compares finding offers by feature through a JSON scan (json_each over every
+    detail) with the interned feature index on a synthetic catalog.
+    All generated data is rolled back when the command finishes.
+    """
+    help = 'Benchmarks the offer feature filter: JSON scan vs. feature index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=20_000, help='Number of synthetic offers.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query and path.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The JSON scan baseline uses SQLite json_each().')
+
+        with transaction.atomic():
+            self.seed(options['offers'])
+            for names in (['Logo Design'], ['Logo Design', 'Source files']):
+                scan = self.measure(lambda: self.scan_page(names), options['repeat'])
+                index = self.measure(lambda: self.index_page(names), options['repeat'])
+                self.stdout.write(
+                    f'{names}: JSON scan {scan * 1000:.1f} ms, index {index * 1000:.1f} ms ({scan / index:.1f}x)'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(42)
+        user = User.objects.create(username='benchmark-offer-features')
+        offers = Offer.objects.bulk_create([
+            Offer(user=user, title=f'Offer {index}', description='Synthetic') for index in range(count)
+        ])
+        details = OfferDetail.objects.bulk_create([
+            OfferDetail(
+                offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3, price=100,
+                features=rng.sample(FEATURES, k=4), offer_type=offer_type,
+            )
+            for offer in offers for offer_type in ('basic', 'standard', 'premium')
+        ], batch_size=2000)
+        for start in range(0, len(details), 2000):
+            features.sync_features(details[start:start + 2000])
+        self.stdout.write(f'Seeded {count} offers with {len(details)} details.')
+
+    def scan_page(self, names):
+        queryset = Offer.objects.all()
+        for name in names:
+            has_feature = RawSQL(
+                'EXISTS (SELECT 1 FROM json_each("features") WHERE value = %s)',
+                [name], output_field=BooleanField(),
+            )
+            queryset = queryset.filter(Exists(OfferDetail.objects.filter(has_feature, offer=OuterRef('pk'))))
+        return queryset.count(), list(queryset.order_by('id')[:6])
+
+    def index_page(self, names):
+        queryset = features.filter_offers(Offer.objects.all(), names, 'all')
+        return queryset.count(), list(queryset.order_by('id')[:6])
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return sorted(timings)[len(timings) // 2]
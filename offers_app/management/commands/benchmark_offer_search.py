@@ -0,0 +1,89 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from offers_app import search
+from offers_app.models import Offer
+
+WORDS = [
+    'logo', 'design', 'website', 'django', 'backend', 'frontend', 'branding', 'video',
+    'editing', 'translation', 'copywriting', 'marketing', 'seo', 'illustration', 'mobile',
+    'app', 'database', 'api', 'consulting', 'photography', 'animation', 'podcast',
+    'newsletter', 'shop', 'payment', 'analytics', 'cloud', 'security', 'testing', 'support',
+]
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vo', 'zi', 'be', 'do', 'fa', 'gu', 'hi', 'jo']
+
+
+class Command(BaseCommand):
+    """
+    Compares the LIKE-based SearchFilter path with the FTS5 index on a synthetic
+    catalog. All generated data is rolled back when the command finishes.
+    """
+    help = 'Benchmarks offer search: icontains LIKE scan vs. FTS5 index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=100_000, help='Number of synthetic offers.')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query and path.')
+        parser.add_argument('--terms', nargs='+', default=['design', 'django api', 'podcast editing'])
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Full-text index is not available on this database.')
+
+        with transaction.atomic():
+            self.seed(options['offers'])
+            for terms in options['terms']:
+                words = terms.split()
+                like = self.measure(lambda: self.like_page(words), options['repeat'])
+                fts = self.measure(lambda: self.fts_page(words), options['repeat'])
+                self.stdout.write(
+                    f'{terms!r}: LIKE {like * 1000:.1f} ms, FTS5 {fts * 1000:.1f} ms '
+                    f'({like / fts:.1f}x)'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(42)
+        # Realistic text has a large vocabulary, so each service word is rare.
+        vocabulary = WORDS + [
+            ''.join(rng.choices(SYLLABLES, k=3)) for _ in range(5000)
+        ]
+        user = User.objects.create(username='benchmark-offer-search')
+        batch = []
+        for index in range(count):
+            batch.append(Offer(
+                user=user,
+                title=' '.join(rng.choices(vocabulary, k=3)),
+                description=' '.join(rng.choices(vocabulary, k=40)),
+            ))
+            if len(batch) == 5000:
+                Offer.objects.bulk_create(batch)
+                batch = []
+        Offer.objects.bulk_create(batch)
+        indexed = search.rebuild_index()
+        self.stdout.write(f'Seeded and indexed {indexed} offers.')
+
+    def like_page(self, words):
+        """
+        Same predicate DRF's SearchFilter builds for search_fields = ['title', 'description'].
+        """
+        queryset = Offer.objects.all()
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+        return queryset.count(), list(queryset.order_by('id')[:6])
+
+    def fts_page(self, words):
+        queryset = search.search_offers(Offer.objects.all(), words)
+        return queryset.count(), list(queryset[:6])
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return sorted(timings)[len(timings) // 2]
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from offers_app import cache
+
+
+class Command(BaseCommand):
+    """
+    Prints the hit/miss counters of the public offer response cache.
+    """
+    help = 'Shows (and optionally resets) the offer response cache hit/miss counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = cache.get_stats()
+        for kind in ('list', 'detail'):
+            hits, misses = stats[f'{kind}_hits'], stats[f'{kind}_misses']
+            total = hits + misses
+            ratio = hits / total * 100 if total else 0
+            self.stdout.write(f'{kind}: {hits} hits, {misses} misses ({ratio:.1f}% hit rate)')
+        if options['reset']:
+            cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import bump_generations
+from offers_app import cards
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Re-renders the pre-rendered list cards of all offers, e.g. after a change
+    to OfferListSerializer or writes that bypassed the model signals.
+    """
+    help = 'Re-renders the offer cards used by the offer list.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        ids = list(Offer.objects.order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        for start in range(0, len(ids), batch_size):
+            cards.refresh_cards(ids[start:start + batch_size])
+        bump_generations('offers:catalog')
+        self.stdout.write(self.style.SUCCESS(f'Rendered cards for {len(ids)} offers.'))
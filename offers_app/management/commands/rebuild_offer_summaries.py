@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the denormalized price/delivery summary columns of all offers.
+    Useful after bulk imports or raw SQL changes that bypassed the model signals.
+    """
+    help = 'Rebuilds min_price, max_price, min_delivery_time and details_count for all offers.'
+
+    def handle(self, *args, **options):
+        updated = Offer.objects.all().refresh_summaries()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt summaries for {updated} offers.'))
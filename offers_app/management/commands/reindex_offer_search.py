@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from offers_app import search
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full-text search index over offer title and description.
+    """
+    help = 'Rebuilds the FTS5 search index for all offers.'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING('Full-text index is not available on this database.'))
+            return
+        indexed = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} offers.'))
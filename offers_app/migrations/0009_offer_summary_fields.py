@@ -0,0 +1,57 @@
+# Generated by Django 5.2.1 on 2026-10-18 01:29
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, IntegerField, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_summaries(apps, schema_editor):
+    """
+    Fills the summary columns of every offer with one UPDATE and correlated
+    subqueries (as OfferQuerySet.refresh_summaries does).
+    """
+    Offer = apps.get_model('offers_app', 'Offer')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+
+    def aggregate(expression, output_field):
+        return Coalesce(Subquery(details.annotate(value=expression).values('value')), Value(0), output_field=output_field)
+
+    price_field = DecimalField(max_digits=10, decimal_places=2)
+    Offer.objects.update(
+        min_price=aggregate(Min('price'), price_field),
+        max_price=aggregate(Max('price'), price_field),
+        min_delivery_time=aggregate(Min('delivery_time_in_days'), IntegerField()),
+        details_count=aggregate(Count('id'), IntegerField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0008_alter_offer_created_at_alter_offer_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='details_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of offer details (maintained automatically).'),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='max_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, help_text='Highest price among the offer details (maintained automatically).', max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Shortest delivery time in days among the offer details (maintained automatically).'),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, help_text='Lowest price among the offer details (maintained automatically).', max_digits=10),
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-18 01:32
+
+import django.db.models.deletion
+import offers_app.models
+from django.db import OperationalError, migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS offers_app_offer_fts "
+            "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite built without FTS5: search falls back to LIKE.
+        return
+    schema_editor.execute(
+        "INSERT INTO offers_app_offer_fts (rowid, title, description) "
+        "SELECT id, title, description FROM offers_app_offer"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS offers_app_offer_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0009_offer_summary_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferSearchDocument',
+            fields=[
+                ('offer', models.OneToOneField(db_column='rowid', db_constraint=False, help_text='The indexed offer.', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='offers_app.offer')),
+                ('title', models.TextField(help_text='Indexed copy of the offer title.')),
+                ('description', models.TextField(help_text='Indexed copy of the offer description.')),
+                ('document', offers_app.models.FullTextField(db_column='offers_app_offer_fts', help_text='Hidden FTS5 column matching against all indexed columns.')),
+                ('rank', models.FloatField(help_text='Hidden FTS5 relevance column (lower is more relevant).')),
+            ],
+            options={
+                'db_table': 'offers_app_offer_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
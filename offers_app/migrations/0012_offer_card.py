@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0011_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferCard',
+            fields=[
+                ('offer', models.OneToOneField(help_text='The rendered offer.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='offers_app.offer')),
+                ('fragment', models.TextField(help_text='Compact JSON of the offer card.')),
+                ('rendered_at', models.DateTimeField(auto_now=True, help_text='Timestamp of the last rendering.')),
+            ],
+        ),
+    ]
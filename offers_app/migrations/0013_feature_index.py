@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:14
+
+from django.db import migrations, models
+
+
+def populate_features(apps, schema_editor):
+    Feature = apps.get_model('offers_app', 'Feature')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    Link = OfferDetail.indexed_features.through
+    feature_ids = {}
+    links = []
+    for detail in OfferDetail.objects.only('id', 'features').iterator():
+        names = detail.features if isinstance(detail.features, list) else []
+        for name in dict.fromkeys(item.strip()[:255] for item in names if isinstance(item, str)):
+            if not name:
+                continue
+            if name not in feature_ids:
+                feature_ids[name] = Feature.objects.create(name=name).id
+            links.append(Link(offerdetail_id=detail.id, feature_id=feature_ids[name]))
+    Link.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0012_offer_card'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='The feature text, exactly as listed in OfferDetail.features.', max_length=255, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='offerdetail',
+            name='indexed_features',
+            field=models.ManyToManyField(blank=True, help_text="Interned copy of 'features' used for filtering (maintained automatically).", related_name='offer_details', to='offers_app.feature'),
+        ),
+        migrations.RunPython(populate_features, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,38 @@
 from django.db import models
+from django.db.models import Count, Lookup, DecimalField, IntegerField, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 
+
+class OfferQuerySet(models.QuerySet):
+    """
+    QuerySet for offers that can recompute the denormalized detail summary
+    (min/max price, min delivery time, detail count) in a single UPDATE.
+    """
+
+    def refresh_summaries(self):
+        """
+        Recomputes the summary columns of all offers in this queryset from their
+        OfferDetails using correlated subqueries. Returns the number of updated rows.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+
+        def aggregate(expression, output_field):
+            return Coalesce(
+                Subquery(details.annotate(value=expression).values('value')),
+                Value(0),
+                output_field=output_field,
+            )
+
+        price_field = DecimalField(max_digits=10, decimal_places=2)
+        return self.update(
+            min_price=aggregate(Min('price'), price_field),
+            max_price=aggregate(Max('price'), price_field),
+            min_delivery_time=aggregate(Min('delivery_time_in_days'), IntegerField()),
+            details_count=aggregate(Count('id'), IntegerField()),
+        )
+
+
 class Offer(models.Model):
     """
     Model for an offer created by a user.
@@ -22,6 +54,12 @@ class Offer(models.Model):
         blank=True,
         help_text="Optional image for the offer."
     )
+    image_derivatives = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Manifest of the resized image derivatives (maintained automatically)."
+    )
     description = models.TextField(
         help_text="Detailed description of the offer."
     )
@@ -33,6 +71,33 @@ class Offer(models.Model):
         auto_now=True,
         help_text="Timestamp of the last update of the offer."
     )
+    min_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        db_index=True,
+        help_text="Lowest price among the offer details (maintained automatically)."
+    )
+    max_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        db_index=True,
+        help_text="Highest price among the offer details (maintained automatically)."
+    )
+    min_delivery_time = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Shortest delivery time in days among the offer details (maintained automatically)."
+    )
+    details_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of offer details (maintained automatically)."
+    )
+
+    SUMMARY_FIELDS = ['min_price', 'max_price', 'min_delivery_time', 'details_count']
+
+    objects = OfferQuerySet.as_manager()
 
     @property
     def calculated_min_price(self):
@@ -50,6 +115,29 @@ class Offer(models.Model):
         """
         return self.details.aggregate(models.Min('delivery_time_in_days'))['delivery_time_in_days__min'] or 0
 
+    @staticmethod
+    def summarize(details):
+        """
+        Computes the summary column values from OfferDetail instances in memory.
+        """
+        details = list(details)
+        prices = [detail.price for detail in details]
+        delivery_times = [detail.delivery_time_in_days for detail in details]
+        return {
+            'min_price': min(prices, default=0),
+            'max_price': max(prices, default=0),
+            'min_delivery_time': min(delivery_times, default=0),
+            'details_count': len(details),
+        }
+
+    def refresh_summary(self):
+        """
+        Recomputes the stored summary columns from the OfferDetails and
+        reloads them on this instance.
+        """
+        Offer.objects.filter(pk=self.pk).refresh_summaries()
+        self.refresh_from_db(fields=self.SUMMARY_FIELDS)
+
 
 class OfferDetail(models.Model):
     """
@@ -85,3 +173,102 @@ class OfferDetail(models.Model):
         max_length=20,
         help_text="Type of the offer (e.g., Basic, Premium, etc.)."
     )
+    indexed_features = models.ManyToManyField(
+        'Feature',
+        blank=True,
+        related_name='offer_details',
+        help_text="Interned copy of 'features' used for filtering (maintained automatically)."
+    )
+
+
+class FullTextField(models.TextField):
+    """
+    Text column of a full-text index that supports the 'match' lookup.
+    """
+
+
+@FullTextField.register_lookup
+class Match(Lookup):
+    """
+    Full-text MATCH lookup, e.g. filter(search_document__document__match='"logo"*').
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class OfferSearchDocument(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 index over offer title and description.
+    The virtual table is created by a migration and maintained by offers_app.search;
+    its rowid is the offer id, so offers can be joined and ranked in one query.
+    """
+    offer = models.OneToOneField(
+        Offer,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name='search_document',
+        help_text="The indexed offer."
+    )
+    title = models.TextField(
+        help_text="Indexed copy of the offer title."
+    )
+    description = models.TextField(
+        help_text="Indexed copy of the offer description."
+    )
+    document = FullTextField(
+        db_column='offers_app_offer_fts',
+        help_text="Hidden FTS5 column matching against all indexed columns."
+    )
+    rank = models.FloatField(
+        help_text="Hidden FTS5 relevance column (lower is more relevant)."
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'offers_app_offer_fts'
+
+
+class OfferCard(models.Model):
+    """
+    Pre-rendered list representation ("card") of an offer: the JSON produced by
+    OfferListSerializer, with 'image' left null because its absolute URL depends
+    on the request. Maintained by offers_app.cards.
+    """
+    offer = models.OneToOneField(
+        Offer,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='card',
+        help_text="The rendered offer."
+    )
+    fragment = models.TextField(
+        help_text="Compact JSON of the offer card."
+    )
+    rendered_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Timestamp of the last rendering."
+    )
+
+    def __str__(self):
+        return f"Card of offer {self.offer_id}"
+
+
+class Feature(models.Model):
+    """
+    Interned feature string. Every distinct entry of OfferDetail.features is
+    stored once and linked to the details listing it (see offers_app.features).
+    """
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="The feature text, exactly as listed in OfferDetail.features."
+    )
+
+    def __str__(self):
+        return self.name
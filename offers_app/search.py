@@ -0,0 +1,109 @@
+"""
+Full-text search over offer title and description backed by an SQLite FTS5 table.
+
+The index lives in the virtual table 'offers_app_offer_fts' (rowid = offer id),
+mapped read-only by OfferSearchDocument. It is kept in sync by the Offer
+save/delete signals and can be rebuilt with 'manage.py reindex_offer_search'.
+On databases without FTS5 the index is reported unavailable and callers fall
+back to the regular LIKE search.
+"""
+from django.db import connection
+
+from .models import OfferSearchDocument
+
+FTS_TABLE = OfferSearchDocument._meta.db_table
+
+_availability = {}
+
+
+def is_available():
+    """
+    Returns True if the FTS5 index table exists on the current database.
+    """
+    key = connection.settings_dict['NAME']
+    if key not in _availability:
+        _availability[key] = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _availability[key]
+
+
+def build_match_expression(terms):
+    """
+    Turns search terms into an FTS5 query: every term must match as a
+    token prefix. Terms are quoted so user input cannot inject FTS syntax.
+    """
+    phrases = []
+    for term in terms:
+        term = term.replace('"', '""').strip()
+        if term:
+            phrases.append(f'"{term}"*')
+    return ' '.join(phrases)
+
+
+def search_offers(queryset, terms):
+    """
+    Restricts an Offer queryset to offers matching all terms and orders it by relevance.
+    """
+    expression = build_match_expression(terms)
+    if not expression:
+        return queryset
+    return queryset.filter(search_document__document__match=expression).order_by(
+        'search_document__rank', 'id'
+    )
+
+
+def index_offer(offer):
+    """
+    Inserts or replaces the index entry of a single offer.
+    """
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [offer.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+            [offer.pk, offer.title, offer.description],
+        )
+
+
+def index_offers(offers):
+    """
+    Inserts or replaces the index entries of several offers (e.g. after bulk_create).
+    """
+    if not is_available() or not offers:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[offer.pk] for offer in offers])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)',
+            [[offer.pk, offer.title, offer.description] for offer in offers],
+        )
+
+
+def remove_offer(offer_id):
+    """
+    Removes the index entry of a deleted offer.
+    """
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [offer_id])
+
+
+def rebuild_index():
+    """
+    Rebuilds the whole index from the offer table. Returns the number of indexed offers.
+    """
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            f'SELECT id, title, description FROM offers_app_offer'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+        return cursor.fetchone()[0]
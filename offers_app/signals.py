@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import images
+from . import cache, cards, features, search
+from user_app.models import UserProfile
+from .models import Offer, OfferDetail
+
+
+def deleted_with_parent(origin):
+    """
+    True if a detail is deleted because its offer (or the offer's user) is deleted.
+    """
+    return origin is not None and getattr(origin, 'model', type(origin)) is not OfferDetail
+
+
+def derivatives_ready(offer):
+    cards.refresh_cards([offer.pk])
+    cache.invalidate_offers(offer)
+
+
+@receiver(post_save, sender=OfferDetail)
+def index_offer_detail_features(sender, instance, update_fields=None, **kwargs):
+    """
+    Keeps the interned feature index of a saved detail in sync with its JSON list.
+    """
+    if update_fields is None or 'features' in update_fields:
+        features.sync_features([instance])
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_summary(sender, instance, origin=None, **kwargs):
+    """
+    Keeps the denormalized price/delivery summary and the card of the parent
+    offer in sync whenever one of its OfferDetails is saved or deleted,
+    and invalidates the cached responses showing it.
+    """
+    cache.invalidate_details(instance.offer, instance.pk)
+    if deleted_with_parent(origin):
+        return
+    Offer.objects.filter(pk=instance.offer_id).refresh_summaries()
+    cards.refresh_cards([instance.offer_id])
+
+
+@receiver(pre_save, sender=Offer)
+def clear_removed_image_derivatives(sender, instance, **kwargs):
+    images.clear_stale_manifest(instance, 'image', 'image_derivatives')
+
+
+@receiver(post_save, sender=Offer)
+def index_offer(sender, instance, created, **kwargs):
+    """
+    Updates the full-text search entry and the card of a saved offer,
+    invalidates the cached lists containing it and queues derivatives for a
+    new image. New offers get their card once their details are written.
+    """
+    search.index_offer(instance)
+    if not created:
+        cards.refresh_cards([instance.pk])
+    cache.invalidate_offers(instance)
+    if images.needs_derivatives(instance.image, instance.image_derivatives):
+        images.schedule(Offer, instance.pk, 'image', 'image_derivatives', on_done=derivatives_ready)
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_from_index(sender, instance, **kwargs):
+    """
+    Drops the full-text search entry of a deleted offer
+    and invalidates the cached lists containing it.
+    """
+    search.remove_offer(instance.pk)
+    cache.invalidate_offers(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_creator_offers(sender, instance, update_fields=None, **kwargs):
+    """
+    Offer cards embed the creator's name, so user changes re-render them and
+    invalidate the cached lists. Login timestamp updates are ignored.
+    """
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    cards.refresh_creator_cards(instance.pk)
+    cache.invalidate_creator(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_profile_offers(sender, instance, **kwargs):
+    """
+    Offer responses expanded with '?expand=user' embed the creator's profile.
+    """
+    cache.invalidate_creator(instance.user_id)
@@ -1,9 +1,31 @@
+import csv
+import json
+import tempfile
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+from unittest.mock import ANY
+
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
+from PIL import Image
 
-from offers_app.models import Offer, OfferDetail
+from core import images
+from offers_app import cache as offer_cache
+from offers_app.api.serializer import OfferListSerializer
+from offers_app.api.views import OfferExportView
+from offers_app.models import Feature, Offer, OfferCard, OfferDetail
+from reviews_app.models import Review
 from user_app.models import UserProfile
 
 class OfferApiTests(APITestCase):
@@ -235,4 +257,1160 @@ class OfferApiTests(APITestCase):
         self.client.login(username='businessuser', password='pass1234')
         url = reverse('offerdetails:offerdetails', kwargs={'id': 999999})
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class OfferSummaryTests(APITestCase):
+    """
+    Tests for the denormalized price/delivery summary stored on Offer.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='summaryuser', password='pass1234')
+        self.offer = Offer.objects.create(user=self.user, title='Summary Offer', description='Desc')
+        self.basic = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=7,
+            price=50.00, features=[], offer_type='basic'
+        )
+        self.premium = OfferDetail.objects.create(
+            offer=self.offer, title='Premium', revisions=3, delivery_time_in_days=3,
+            price=300.00, features=[], offer_type='premium'
+        )
+
+    def test_summary_follows_detail_writes(self):
+        """
+        Saving and deleting OfferDetails keeps the stored summary in sync.
+        """
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.max_price, 300)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+        self.assertEqual(self.offer.details_count, 2)
+
+        self.premium.price = 400
+        self.premium.save()
+        self.basic.delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 400)
+        self.assertEqual(self.offer.max_price, 400)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+        self.assertEqual(self.offer.details_count, 1)
+
+    def test_migration_backfill_is_one_update(self):
+        """
+        The data migration fills every offer's summary with a single UPDATE.
+        """
+        empty = Offer.objects.create(user=self.user, title='Empty', description='Desc')
+        Offer.objects.update(min_price=1, max_price=1, min_delivery_time=1, details_count=9)
+        migration = import_module('offers_app.migrations.0009_offer_summary_fields')
+        with self.assertNumQueries(1):
+            migration.populate_summaries(django_apps, None)
+        self.offer.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual(
+            (self.offer.min_price, self.offer.max_price, self.offer.min_delivery_time, self.offer.details_count),
+            (50, 300, 3, 2),
+        )
+        self.assertEqual((empty.min_price, empty.details_count), (0, 0))
+
+    def test_rebuild_command_repairs_summaries(self):
+        """
+        The rebuild command restores summaries changed behind the signals' back.
+        """
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=0, max_price=0, min_delivery_time=0, details_count=0)
+        call_command('rebuild_offer_summaries', stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+        self.assertEqual(self.offer.max_price, 300)
+        self.assertEqual(self.offer.details_count, 2)
+
+    def test_list_filters_and_orders_by_summary(self):
+        """
+        Filtering and ordering in the list use the summary columns.
+        """
+        cheap = Offer.objects.create(user=self.user, title='Cheap Offer', description='Desc')
+        OfferDetail.objects.create(
+            offer=cheap, title='Basic', revisions=1, delivery_time_in_days=10,
+            price=20.00, features=[], offer_type='basic'
+        )
+        url = reverse('offers:offerslist')
+
+        response = self.client.get(url, {'ordering': '-max_price'})
+        self.assertEqual([o['id'] for o in response.data['results']], [self.offer.id, cheap.id])
+
+        response = self.client.get(url, {'min_price': 100})
+        self.assertEqual([o['id'] for o in response.data['results']], [self.offer.id])
+
+        response = self.client.get(url, {'max_delivery_time': 5})
+        self.assertEqual([o['id'] for o in response.data['results']], [self.offer.id])
+
+
+class OfferCursorPaginationTests(APITestCase):
+    """
+    Tests for the opt-in keyset pagination mode of the offer list.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='cursoruser', password='pass1234')
+        self.offers = []
+        for index, price in enumerate([30, 10, 20, 10, 20, 10, 40]):
+            offer = Offer.objects.create(user=self.user, title=f'Offer {index}', description='Desc')
+            OfferDetail.objects.create(
+                offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+                price=price, features=[], offer_type='basic'
+            )
+            self.offers.append(offer)
+        self.url = reverse('offers:offerslist')
+
+    def collect(self, params):
+        """
+        Follows the next links and returns all ids plus the visited responses.
+        """
+        response = self.client.get(self.url, params)
+        responses = [response]
+        ids = [o['id'] for o in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            responses.append(response)
+            ids += [o['id'] for o in response.data['results']]
+        return ids, responses
+
+    def test_cursor_pages_follow_ordering_with_id_tiebreak(self):
+        """
+        Walking all cursor pages yields every offer once, in ordering/id order.
+        """
+        for ordering in ['min_price', '-max_price', 'updated_at', '-updated_at']:
+            ids, responses = self.collect({'pagination': 'cursor', 'ordering': ordering, 'page_size': 2})
+            expected = list(
+                Offer.objects.order_by(ordering, ('-' if ordering.startswith('-') else '') + 'id')
+                .values_list('id', flat=True)
+            )
+            self.assertEqual(ids, expected)
+            self.assertNotIn('count', responses[0].data)
+
+    def test_previous_cursor_returns_preceding_page(self):
+        """
+        The previous link of the second page returns the first page again.
+        """
+        first = self.client.get(self.url, {'pagination': 'cursor', 'ordering': 'min_price', 'page_size': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_count_only_on_request_and_invalid_cursor(self):
+        """
+        The count is returned only with include_count; malformed cursors give 404.
+        """
+        response = self.client.get(self.url, {'pagination': 'cursor', 'include_count': 'true'})
+        self.assertEqual(response.data['count'], len(self.offers))
+
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_unchanged(self):
+        """
+        Without the opt-in the page-number contract stays the same.
+        """
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(response.data['count'], len(self.offers))
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class OfferSearchTests(APITestCase):
+    """
+    Tests for the full-text offer search.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='searchuser', password='pass1234')
+        self.logo = Offer.objects.create(user=self.user, title='Logo Design', description='Design of logos and design systems.')
+        self.web = Offer.objects.create(user=self.user, title='Web App', description='Django backend with a simple design.')
+        self.video = Offer.objects.create(user=self.user, title='Video Editing', description='Cutting and grading.')
+        for offer, price in [(self.logo, 50), (self.web, 500), (self.video, 80)]:
+            OfferDetail.objects.create(
+                offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+                price=price, features=[], offer_type='basic'
+            )
+        self.url = reverse('offers:offerslist')
+
+    def search_ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [o['id'] for o in response.data['results']]
+
+    def test_search_ranks_by_relevance(self):
+        """
+        Matches are ordered by relevance and combine with OfferFilter.
+        """
+        self.assertEqual(self.search_ids({'search': 'design'}), [self.logo.id, self.web.id])
+        self.assertEqual(self.search_ids({'search': 'desig'}), [self.logo.id, self.web.id])
+        self.assertEqual(self.search_ids({'search': 'design', 'min_price': 100}), [self.web.id])
+        self.assertEqual(self.search_ids({'search': 'design django'}), [self.web.id])
+        self.assertEqual(self.search_ids({'search': '"design'}), [self.logo.id, self.web.id])
+
+    def test_index_follows_offer_writes(self):
+        """
+        Saving and deleting offers updates the index; reindexing restores it.
+        """
+        self.video.title = 'Podcast Editing'
+        self.video.save()
+        self.assertEqual(self.search_ids({'search': 'podcast'}), [self.video.id])
+
+        self.logo.delete()
+        self.assertEqual(self.search_ids({'search': 'logo'}), [])
+
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM offers_app_offer_fts')
+        call_command('reindex_offer_search', stdout=StringIO())
+        self.assertEqual(self.search_ids({'search': 'django'}), [self.web.id])
+
+
+class OfferFilterQueryTests(APITestCase):
+    """
+    Regression tests for the SQL shape of the filtered offer list.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='filteruser', password='pass1234')
+        self.other = User.objects.create_user(username='otherfilteruser', password='pass1234')
+        tiers = {
+            'a': (self.user, [(40, 10), (120, 5), (300, 2)]),
+            'b': (self.user, [(90, 7), (95, 6)]),
+            'c': (self.other, [(150, 1), (250, 1), (350, 1)]),
+            'd': (self.user, [(200, 3), (210, 9)]),
+        }
+        self.offers = {}
+        for name, (user, details) in tiers.items():
+            offer = Offer.objects.create(user=user, title=f'Offer {name}', description='Desc')
+            for price, days in details:
+                OfferDetail.objects.create(
+                    offer=offer, title=f'Tier {price}', revisions=1, delivery_time_in_days=days,
+                    price=price, features=[], offer_type='basic'
+                )
+            self.offers[name] = offer
+        self.url = reverse('offers:offerslist')
+
+    def test_combined_filters_avoid_detail_join(self):
+        """
+        With every filter and a summary ordering active, the list and count queries
+        touch only the offer table (and its 1:1 card), and each matching offer is returned once.
+        """
+        params = {
+            'creator_id': self.user.id,
+            'min_price': 100,
+            'max_delivery_time': 5,
+            'ordering': 'min_price',
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [o['id'] for o in response.data['results']],
+            [self.offers['a'].id, self.offers['d'].id]
+        )
+        offer_queries = [
+            q['sql'] for q in queries.captured_queries
+            if 'FROM "offers_app_offer"' in q['sql']
+        ]
+        self.assertEqual(len(offer_queries), 2)
+        for sql in offer_queries:
+            self.assertNotIn('offers_app_offerdetail', sql)
+            self.assertNotIn('GROUP BY', sql)
+            sql = sql.replace('INNER JOIN "auth_user"', '').replace('LEFT OUTER JOIN "offers_app_offercard"', '')
+            self.assertNotIn('JOIN', sql)
+
+    def test_filter_semantics_match_detail_level_predicates(self):
+        """
+        The summary filters select exactly the offers having a detail that
+        satisfies the original per-detail predicate.
+        """
+        for min_price, max_days in [(100, None), (None, 2), (200, 9), (400, None), (None, 0)]:
+            params = {'page_size': 100}
+            expected = OfferDetail.objects.all()
+            if min_price is not None:
+                params['min_price'] = min_price
+                expected = expected.filter(price__gte=min_price)
+            if max_days is not None:
+                params['max_delivery_time'] = max_days
+            expected_ids = set(expected.values_list('offer_id', flat=True))
+            if max_days is not None:
+                expected_ids &= set(
+                    OfferDetail.objects.filter(delivery_time_in_days__lte=max_days)
+                    .values_list('offer_id', flat=True)
+                )
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.data['count'], len(expected_ids))
+            self.assertEqual({o['id'] for o in response.data['results']}, expected_ids)
+
+
+class OfferResponseCacheTests(APITestCase):
+    """
+    Tests for the response cache of the public offer endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cacheuser', password='pass1234')
+        self.other = User.objects.create_user(username='othercacheuser', password='pass1234')
+        self.offer = Offer.objects.create(user=self.user, title='Cached Offer', description='Desc')
+        self.other_offer = Offer.objects.create(user=self.other, title='Other Offer', description='Desc')
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=3,
+            price=100, features=[], offer_type='basic'
+        )
+        self.list_url = reverse('offers:offerslist')
+        self.detail_url = reverse('offerdetails:offerdetails', kwargs={'id': self.detail.id})
+
+    def test_list_is_cached_per_normalized_query(self):
+        """
+        Equivalent query strings share one entry; a hit runs no queries.
+        """
+        first = self.client.get(self.list_url, {'ordering': 'min_price', 'page': 1})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(f'{self.list_url}?page=1&search=&ordering=min_price')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(offer_cache.get_stats()['list_hits'], 1)
+
+    def test_offer_changes_invalidate_only_affected_creator(self):
+        """
+        Changing an offer invalidates the catalog and its creator's lists,
+        but not the lists filtered to another creator.
+        """
+        self.client.get(self.list_url)
+        self.client.get(self.list_url, {'creator_id': self.user.id})
+        self.client.get(self.list_url, {'creator_id': self.other.id})
+
+        self.offer.title = 'Renamed Offer'
+        self.offer.save()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Renamed Offer', [o['title'] for o in response.data['results']])
+        response = self.client.get(self.list_url, {'creator_id': self.user.id})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.client.get(self.list_url, {'creator_id': self.other.id})
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_detail_cache_invalidated_by_detail_writes(self):
+        """
+        Saving or deleting an OfferDetail invalidates its cached response.
+        """
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.detail_url)['X-Cache'], 'HIT')
+
+        self.detail.price = 150
+        self.detail.save()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['price'], '150.00')
+
+        self.detail.delete()
+        self.assertEqual(self.client.get(self.detail_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_authenticated_requests_bypass_cache(self):
+        """
+        Authenticated requests are neither served from nor stored in the cache.
+        """
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.list_url)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(offer_cache.get_stats()['list_misses'], 0)
+
+    def test_file_based_backend(self):
+        """
+        The cache works unchanged with Django's file-based backend.
+        """
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+            with self.settings(CACHES={'default': backend}):
+                self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'MISS')
+                self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'HIT')
+                self.offer.save()
+                self.assertEqual(self.client.get(self.list_url)['X-Cache'], 'MISS')
+
+
+class OfferBulkCreateTests(APITestCase):
+    """
+    Tests for the bulk creation path of offers and their details.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='bulkbusiness', password='pass1234')
+        UserProfile.objects.create(user=self.business_user, user_type='business')
+        self.customer_user = User.objects.create_user(username='bulkcustomer', password='pass1234')
+        UserProfile.objects.create(user=self.customer_user, user_type='customer')
+        self.url = reverse('offers:offersbulk')
+
+    def offer_payload(self, index, tiers=3):
+        return {
+            'title': f'Bulk Offer {index}',
+            'description': 'Imported offer',
+            'details': [
+                {
+                    'title': f'Tier {tier}',
+                    'revisions': tier,
+                    'delivery_time_in_days': 10 - tier,
+                    'price': 100 * (tier + 1),
+                    'features': ['Imported'],
+                    'offer_type': f'tier-{tier}',
+                }
+                for tier in range(tiers)
+            ],
+        }
+
+    def test_bulk_create_uses_constant_number_of_writes(self):
+        """
+        Creating many offers inserts offers and details with one statement each.
+        """
+        self.client.force_authenticate(self.business_user)
+        payload = [self.offer_payload(index) for index in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 50)
+        self.assertEqual(len(response.data[0]['details']), 3)
+        self.assertEqual(Offer.objects.filter(user=self.business_user).count(), 50)
+        self.assertEqual(OfferDetail.objects.filter(offer__user=self.business_user).count(), 150)
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO')]
+        self.assertEqual(len([sql for sql in inserts if sql.startswith('INSERT INTO "offers_app_offer" ')]), 1)
+        # Details are only split into batches by SQLite's query parameter limit.
+        self.assertLessEqual(len([sql for sql in inserts if sql.startswith('INSERT INTO "offers_app_offerdetail" ')]), 2)
+
+        offer = Offer.objects.get(title='Bulk Offer 7')
+        self.assertEqual((offer.min_price, offer.max_price, offer.min_delivery_time, offer.details_count), (100, 300, 8, 3))
+
+    def test_bulk_create_reports_errors_per_item(self):
+        """
+        One invalid item rejects the whole request and is reported at its position.
+        """
+        self.client.force_authenticate(self.business_user)
+        payload = [self.offer_payload(0), {'title': 'Broken'}, self.offer_payload(2)]
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertIn('details', response.data['errors'][1])
+        self.assertFalse(Offer.objects.exists())
+
+    def test_bulk_create_limits_and_permissions(self):
+        """
+        Customers are rejected and oversized batches are refused.
+        """
+        self.client.force_authenticate(self.customer_user)
+        response = self.client.post(self.url, [self.offer_payload(0)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.business_user)
+        payload = [self.offer_payload(index, tiers=1) for index in range(501)]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Offer.objects.exists())
+
+
+class OfferPatchQueryTests(APITestCase):
+    """
+    Tests for the single-transaction update path of offers and their details.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='patchuser', password='pass1234')
+        self.client.force_authenticate(self.user)
+
+    def create_offer(self, tiers):
+        offer = Offer.objects.create(user=self.user, title='Patch Offer', description='Desc')
+        for tier in range(tiers):
+            OfferDetail.objects.create(
+                offer=offer, title=f'Tier {tier}', revisions=1, delivery_time_in_days=10,
+                price=100, features=[], offer_type=f'tier-{tier}'
+            )
+        return offer
+
+    def patch_all_tiers(self, offer, tiers):
+        payload = {
+            'title': 'Patched',
+            'details': [
+                {'offer_type': f'tier-{tier}', 'price': 50 + tier, 'delivery_time_in_days': 5 + tier}
+                for tier in range(tiers)
+            ],
+        }
+        url = reverse('offers:singleoffer', kwargs={'id': offer.id})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries.captured_queries)
+
+    def test_query_count_independent_of_tier_count(self):
+        """
+        Patching two or six tiers costs the same number of queries, and the
+        response carries the recomputed minimum values.
+        """
+        response, few = self.patch_all_tiers(self.create_offer(2), 2)
+        self.assertEqual(response.data['min_price'], 50)
+        self.assertEqual(response.data['min_delivery_time'], 5)
+
+        offer = self.create_offer(6)
+        response, many = self.patch_all_tiers(offer, 6)
+        self.assertEqual(few, many)
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.max_price, offer.min_delivery_time), (50, 55, 5))
+        self.assertEqual(
+            list(offer.details.order_by('offer_type').values_list('price', flat=True)),
+            [50 + tier for tier in range(6)]
+        )
+
+    def test_invalid_detail_change_writes_nothing(self):
+        """
+        An unknown offer_type rejects the whole patch before anything is saved.
+        """
+        offer = self.create_offer(2)
+        url = reverse('offers:singleoffer', kwargs={'id': offer.id})
+        payload = {
+            'title': 'Should not be saved',
+            'details': [
+                {'offer_type': 'tier-0', 'price': 1},
+                {'offer_type': 'unknown', 'price': 2},
+            ],
+        }
+        response = self.client.patch(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('details', response.data)
+        offer.refresh_from_db()
+        self.assertEqual(offer.title, 'Patch Offer')
+        self.assertEqual(offer.min_price, 100)
+        self.assertFalse(offer.details.filter(price=1).exists())
+
+
+class OfferConditionalGetTests(APITestCase):
+    """
+    Tests for ETag based conditional requests on the offer endpoints.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='etaguser', password='pass1234')
+        self.offer = Offer.objects.create(user=self.user, title='ETag Offer', description='Desc')
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=3,
+            price=100, features=[], offer_type='basic'
+        )
+        self.client.force_authenticate(self.user)
+        self.urls = [
+            reverse('offers:offerslist'),
+            reverse('offers:singleoffer', kwargs={'id': self.offer.id}),
+            reverse('offerdetails:offerdetails', kwargs={'id': self.detail.id}),
+        ]
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        """
+        Revalidating an unchanged resource answers 304 with at most one cheap query.
+        """
+        # Only the single offer view looks up the creator id for its validator.
+        for url, queries in zip(self.urls, [0, 1, 0]):
+            etag = self.client.get(url)['ETag']
+            with self.assertNumQueries(queries):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+
+    def test_detail_change_changes_all_validators(self):
+        """
+        Changing a detail invalidates the list, the offer and the detail ETags.
+        """
+        etags = [self.client.get(url)['ETag'] for url in self.urls]
+        self.detail.price = 90
+        self.detail.save()
+        for url, etag in zip(self.urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_query_string_is_part_of_the_etag(self):
+        """
+        Representations selected by the query string never share an ETag.
+        """
+        url = self.urls[1]
+        etag = self.client.get(url)['ETag']
+        for params in ({'expand': 'details'}, {'fields': 'id,title'}):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(
+                self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                status.HTTP_304_NOT_MODIFIED
+            )
+
+
+def make_image_file(name='offer.png', color=(200, 30, 30), size=(1200, 800)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_DERIVATIVE_WORKERS=0)
+class OfferImageDerivativeTests(APITestCase):
+    """
+    Tests for the resized image derivatives generated after an offer upload.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='imagebusiness', password='pass1234')
+        UserProfile.objects.create(user=self.user, user_type='business')
+
+    def create_offer(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = Offer.objects.create(user=self.user, title='Logo', description='Design', image=image)
+        offer.refresh_from_db()
+        return offer
+
+    def test_derivatives_generated_after_commit(self):
+        """
+        Saving an offer with an image stores a manifest for all sizes and formats.
+        """
+        offer = self.create_offer(make_image_file())
+        files = offer.image_derivatives['files']
+        self.assertEqual(set(files), set(images.DERIVATIVE_SIZES))
+        for size, edge in images.DERIVATIVE_SIZES.items():
+            self.assertEqual(set(files[size]), {'webp', 'jpeg'})
+            with default_storage.open(files[size]['webp']) as stored:
+                self.assertEqual(max(Image.open(stored).size), edge)
+
+        response = self.client.get(reverse('offers:offerslist'))
+        derivatives = response.data['results'][0]['image_derivatives']
+        self.assertTrue(derivatives['small']['webp'].endswith('/small.webp'))
+        self.assertTrue(derivatives['large']['jpeg'].endswith('/large.jpg'))
+
+    def test_identical_uploads_share_derivatives(self):
+        """
+        A second upload of the same content reuses the stored derivative files.
+        """
+        first = self.create_offer(make_image_file('a.png'))
+        second = self.create_offer(make_image_file('b.png'))
+        self.assertNotEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_derivatives['digest'], second.image_derivatives['digest'])
+        self.assertEqual(first.image_derivatives['files'], second.image_derivatives['files'])
+
+    def test_removed_or_replaced_image_drops_old_derivatives(self):
+        """
+        Derivatives of a previous image are never served for the current one.
+        """
+        offer = self.create_offer(make_image_file())
+        offer.image = make_image_file('new.png', color=(0, 200, 0))
+        offer.save()
+        self.assertNotEqual(offer.image_derivatives['source'], offer.image.name)
+        self.assertIsNone(self.client.get(reverse('offers:offerslist')).data['results'][0]['image_derivatives'])
+
+        offer.image = None
+        offer.save()
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_derivatives, {})
+        self.assertIsNone(self.client.get(reverse('offers:offerslist')).data['results'][0]['image_derivatives'])
+
+    def test_offer_without_image_schedules_nothing(self):
+        offer = self.create_offer(None)
+        self.assertEqual(offer.image_derivatives, {})
+        self.assertIsNone(self.client.get(reverse('offers:offerslist')).data['results'][0]['image_derivatives'])
+
+    def test_backfill_command(self):
+        """
+        The backfill command processes existing images that have no manifest yet.
+        """
+        offer = self.create_offer(make_image_file())
+        Offer.objects.filter(pk=offer.pk).update(image_derivatives={})
+        out = StringIO()
+        call_command('backfill_image_derivatives', stdout=out)
+        offer.refresh_from_db()
+        self.assertIn('files', offer.image_derivatives)
+        self.assertIn('Generated derivatives for 1 offers.', out.getvalue())
+
+
+class OfferExpandTests(APITestCase):
+    """
+    Tests for '?expand=' on the offer endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='expandoffers', password='pass1234', email='x@example.com')
+        self.profile = UserProfile.objects.create(user=self.user, user_type='business', location='Hamburg')
+        self.url = reverse('offers:offerslist')
+
+    def create_offers(self, count):
+        for index in range(count):
+            offer = Offer.objects.create(user=self.user, title=f'Offer {index}', description='Desc')
+            for offer_type in ('basic', 'standard'):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=2,
+                    price=10, features=['A'], offer_type=offer_type
+                )
+
+    def test_expand_details_and_user(self):
+        self.create_offers(1)
+        data = self.client.get(self.url, {'expand': 'details,user'}).data['results'][0]
+        self.assertEqual({detail['offer_type'] for detail in data['details']}, {'basic', 'standard'})
+        self.assertEqual(data['user']['location'], 'Hamburg')
+        self.assertNotIn('email', data['user'])
+        self.assertEqual(data['user']['review_summary']['review_count'], 0)
+
+        plain = self.client.get(self.url).data['results'][0]
+        self.assertEqual(plain['user'], self.user.id)
+        self.assertEqual(set(plain['details'][0]), {'id', 'url'})
+
+    def test_expanded_page_has_fixed_query_count(self):
+        self.create_offers(1)
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(self.url, {'expand': 'details,user', 'page_size': 20})
+        self.create_offers(5)
+        cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url, {'expand': 'details,user', 'page_size': 20})
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(len(single.captured_queries), len(many.captured_queries))
+
+    def test_review_changes_invalidate_expanded_offers(self):
+        """
+        The embedded review summary follows review writes, also for the
+        business user a review was moved away from.
+        """
+        self.create_offers(1)
+        other = User.objects.create_user(username='expandother', password='pass1234')
+        UserProfile.objects.create(user=other, user_type='business')
+        Offer.objects.create(user=other, title='Other offer', description='Desc')
+        reviewer = User.objects.create_user(username='expandreviewer', password='pass1234')
+
+        def review_count(creator):
+            params = {'expand': 'user', 'creator_id': creator.id}
+            return self.client.get(self.url, params).data['results'][0]['user']['review_summary']['review_count']
+
+        self.assertEqual((review_count(self.user), review_count(other)), (0, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            review = Review.objects.create(business_user=self.user, reviewer=reviewer, rating=5, description='Top')
+        self.assertEqual(review_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.business_user = other
+            review.save()
+        self.assertEqual((review_count(self.user), review_count(other)), (0, 1))
+
+    def test_profile_change_invalidates_expanded_list(self):
+        self.create_offers(1)
+        self.client.get(self.url, {'expand': 'user'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.location = 'Munich'
+            self.profile.save()
+        data = self.client.get(self.url, {'expand': 'user'}).data['results'][0]
+        self.assertEqual(data['user']['location'], 'Munich')
+
+
+class OfferSparseFieldsetTests(APITestCase):
+    """
+    Tests for '?fields=' / '?omit=' on the offer list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='sparseoffers', password='pass1234')
+        UserProfile.objects.create(user=self.user, user_type='business')
+        for index in range(3):
+            offer = Offer.objects.create(user=self.user, title=f'Offer {index}', description='Long text')
+            OfferDetail.objects.create(
+                offer=offer, title='Basic', revisions=1, delivery_time_in_days=2,
+                price=10, features=['A'], offer_type='basic'
+            )
+        self.url = reverse('offers:offerslist')
+
+    def get_with_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_fields_prunes_output_joins_and_columns(self):
+        response, queries = self.get_with_queries({'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        # COUNT for the page numbers plus one SELECT; no details prefetch.
+        self.assertEqual(len(queries), 2)
+        select = queries[-1]
+        self.assertNotIn('auth_user', select)
+        self.assertNotIn('"description"', select)
+        self.assertIn('"title"', select)
+
+    def test_omit_drops_prefetch(self):
+        response, queries = self.get_with_queries({'omit': 'details,user_details,description'})
+        first = response.data['results'][0]
+        self.assertNotIn('details', first)
+        self.assertNotIn('description', first)
+        self.assertEqual(first['min_price'], 10)
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(any('offers_app_offerdetail' in query for query in queries))
+
+    def test_details_links_load_only_ids(self):
+        response, queries = self.get_with_queries({'fields': 'id,details'})
+        self.assertEqual(set(response.data['results'][0]['details'][0]), {'id', 'url'})
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('"features"', queries[-1])
+
+    def test_sparse_cursor_pagination(self):
+        """
+        Ordering fields stay loaded, so building the next cursor needs no extra query.
+        """
+        response, queries = self.get_with_queries(
+            {'fields': 'id', 'pagination': 'cursor', 'page_size': 2, 'ordering': '-min_price'}
+        )
+        self.assertIsNotNone(response.data['next'])
+        self.assertEqual(len(queries), 1)
+
+    def test_unknown_and_expanded_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,user,nonsense', 'expand': 'user,details'})
+        first = response.data['results'][0]
+        self.assertEqual(set(first), {'id', 'user'})
+        self.assertEqual(first['user']['type'], 'business')
+
+
+class OfferExportTests(APITestCase):
+    """
+    Tests for the streaming offer export.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='exportbusiness', password='pass1234')
+        self.other = User.objects.create_user(username='exportother', password='pass1234')
+        for index in range(5):
+            offer = Offer.objects.create(
+                user=self.user if index < 4 else self.other, title=f'Offer {index}', description='Text'
+            )
+            for offer_type, price in (('basic', 10 + index), ('premium', 50 + index)):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3,
+                    price=price, features=['A', 'B'], offer_type=offer_type
+                )
+        Offer.objects.create(user=self.other, title='Empty', description='No details')
+        self.url = reverse('offers:offersexport')
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(lines), 6)
+        self.assertEqual([line['title'] for line in lines[:2]], ['Offer 0', 'Offer 1'])
+        self.assertEqual(len(lines[0]['details']), 2)
+        self.assertEqual(lines[0]['details'][0]['features'], ['A', 'B'])
+        self.assertEqual(lines[0]['min_price'], '10.00')
+
+    def test_csv_export_with_filters(self):
+        response = self.client.get(self.url, {'format': 'csv', 'creator_id': self.other.id})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(StringIO(self.read(response))))
+        self.assertEqual([row['offer_title'] for row in rows], ['Offer 4', 'Offer 4', 'Empty'])
+        self.assertEqual(rows[0]['detail_features'], '["A", "B"]')
+        self.assertEqual(rows[2]['detail_id'], '')
+
+    def test_chunked_queries(self):
+        """
+        Offers are read through one cursor in chunks, with one detail prefetch per chunk.
+        """
+        with mock.patch.object(OfferExportView, 'chunk_size', 2):
+            with CaptureQueriesContext(connection) as context:
+                lines = self.read(self.client.get(self.url)).splitlines()
+        self.assertEqual(len(lines), 6)
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(len(queries), 4)
+        self.assertEqual(sum('offers_app_offerdetail' in sql for sql in queries), 3)
+
+    def test_invalid_filter(self):
+        response = self.client.get(self.url, {'format': 'csv', 'creator_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('creator_id', response.json())
+
+
+class OfferCardTests(APITestCase):
+    """
+    Tests for the pre-rendered offer cards behind the offer list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cardbusiness', password='pass1234', first_name='Carla')
+        UserProfile.objects.create(user=self.user, user_type='business')
+        self.client.force_authenticate(self.user)
+        self.offer = Offer.objects.create(user=self.user, title='Card offer', description='Desc')
+        self.basic = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', revisions=1, delivery_time_in_days=5,
+            price=80, features=['A'], offer_type='basic'
+        )
+        self.url = reverse('offers:offerslist')
+
+    def card_data(self):
+        return json.loads(OfferCard.objects.get(offer=self.offer).fragment)
+
+    def test_cards_match_serializer_output(self):
+        """
+        The card response equals the per-row serializer output ('?fields=' bypasses cards).
+        """
+        names = ','.join(OfferListSerializer.Meta.fields)
+        self.assertEqual(self.client.get(self.url).json(), self.client.get(self.url, {'fields': names}).json())
+
+    def test_cards_follow_offer_detail_and_user_changes(self):
+        self.assertEqual(self.card_data()['min_price'], 80)
+        OfferDetail.objects.create(
+            offer=self.offer, title='Cheap', revisions=1, delivery_time_in_days=2,
+            price=40, features=[], offer_type='standard'
+        )
+        self.assertEqual(self.card_data()['min_delivery_time'], 2)
+        self.assertEqual(len(self.card_data()['details']), 2)
+
+        self.offer.title = 'Renamed'
+        self.offer.save()
+        self.assertEqual(self.card_data()['title'], 'Renamed')
+
+        self.user.first_name = 'Clara'
+        self.user.save()
+        self.assertEqual(self.card_data()['user_details']['first_name'], 'Clara')
+
+        self.basic.delete()
+        self.assertEqual(self.card_data()['details'], [{'id': self.offer.details.get().id, 'url': ANY}])
+        self.offer.delete()
+        self.assertFalse(OfferCard.objects.exists())
+
+    def test_page_costs_two_queries_and_fills_missing_cards(self):
+        for index in range(20):
+            offer = Offer.objects.create(user=self.user, title=f'Offer {index}', description='Desc')
+            OfferDetail.objects.create(
+                offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+                price=10, features=[], offer_type='basic'
+            )
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'page_size': 21})
+        self.assertEqual(len(response.json()['results']), 21)
+
+        OfferCard.objects.filter(offer=self.offer).delete()
+        expected = self.client.get(self.url, {'fields': ','.join(OfferListSerializer.Meta.fields)}).json()
+        self.assertEqual(self.client.get(self.url).json()['results'], expected['results'])
+        self.assertTrue(OfferCard.objects.filter(offer=self.offer).exists())
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_DERIVATIVE_WORKERS=0)
+    def test_image_url_is_absolute_per_request(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.image = make_image_file()
+            self.offer.save()
+        self.assertIsNone(self.card_data()['image'])
+        self.assertIsNotNone(self.card_data()['image_derivatives'])
+        result = self.client.get(self.url, HTTP_HOST='localhost').json()['results'][0]
+        self.assertTrue(result['image'].startswith('http://localhost/media/'))
+
+
+class OfferFacetTests(APITestCase):
+    """
+    Tests for '?facets=true' on the offer list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='facetbusiness', password='pass1234')
+        self.other = User.objects.create_user(username='facetother', password='pass1234')
+        self.client.force_authenticate(self.user)
+        tiers = [
+            (self.user, [('basic', 30, 1), ('premium', 300, 10)]),
+            (self.user, [('Basic', 120, 3)]),
+            (self.other, [('Standard', 600, 20), ('premium', 900, 30)]),
+        ]
+        for user, details in tiers:
+            offer = Offer.objects.create(user=user, title='Facet offer', description='Desc')
+            for offer_type, price, days in details:
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=days,
+                    price=price, features=[], offer_type=offer_type
+                )
+        Offer.objects.create(user=self.user, title='Draft', description='No details yet')
+        self.url = reverse('offers:offerslist')
+
+    def get_facets(self, params=None):
+        response = self.client.get(self.url, {'facets': 'true', **(params or {})})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        facets = response.json()['facets']
+        return (
+            {bucket['key']: bucket['count'] for bucket in facets['price']},
+            {bucket['key']: bucket['count'] for bucket in facets['delivery_time']},
+            facets['offer_type'],
+        )
+
+    def test_counts_for_whole_catalog(self):
+        price, delivery, offer_type = self.get_facets()
+        self.assertEqual(price, {'0-50': 1, '50-100': 0, '100-250': 1, '250-500': 0, '500+': 1})
+        self.assertEqual(delivery, {'1': 1, '2-3': 1, '4-7': 0, '8-14': 0, '15+': 1})
+        self.assertEqual(offer_type, {'basic': 2, 'standard': 1, 'premium': 2})
+
+    def test_counts_follow_filters(self):
+        price, delivery, offer_type = self.get_facets({'creator_id': self.user.id, 'min_price': 100})
+        self.assertEqual(price['0-50'], 1)
+        self.assertEqual(price['100-250'], 1)
+        self.assertEqual(price['500+'], 0)
+        self.assertEqual(offer_type, {'basic': 2, 'standard': 0, 'premium': 1})
+
+    def test_single_query_cached_per_filter_signature(self):
+        params = {'facets': 'true', 'creator_id': self.other.id, 'fields': 'id'}
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(self.url, params)
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(self.url, {**params, 'page_size': 1, 'ordering': '-min_price'})
+        self.assertEqual(len(first.captured_queries) - len(second.captured_queries), 1)
+        facet_sql = [q['sql'] for q in first.captured_queries if 'EXISTS' in q['sql']]
+        self.assertEqual(len(facet_sql), 1)
+
+        detail = OfferDetail.objects.filter(offer__user=self.other).first()
+        detail.price = 40
+        detail.save()
+        price, _, _ = self.get_facets({'creator_id': self.other.id})
+        self.assertEqual(price['0-50'], 1)
+
+    def test_facets_are_optional(self):
+        self.assertNotIn('facets', self.client.get(self.url).json())
+
+
+class OfferFeatureFilterTests(APITestCase):
+    """
+    Tests for the interned feature index and the '?features=' filter.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='featurebusiness', password='pass1234')
+        UserProfile.objects.create(user=self.user, user_type='business')
+        self.client.force_authenticate(self.user)
+        self.logo = self.create_offer([['Logo Design', 'Source files'], ['Logo Design']])
+        self.split = self.create_offer([['Logo Design'], ['Source files']])
+        self.other = self.create_offer([['Express delivery', ' Logo Design ', 'Logo Design']])
+        self.url = reverse('offers:offerslist')
+
+    def create_offer(self, feature_lists):
+        offer = Offer.objects.create(user=self.user, title='Feature offer', description='Desc')
+        for index, names in enumerate(feature_lists):
+            OfferDetail.objects.create(
+                offer=offer, title=f'Tier {index}', revisions=1, delivery_time_in_days=5,
+                price=100, features=names, offer_type=f'tier-{index}'
+            )
+        return offer
+
+    def filtered_ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {offer['id'] for offer in response.data['results']}
+
+    def test_features_are_stored_once(self):
+        self.assertEqual(
+            sorted(Feature.objects.values_list('name', flat=True)),
+            ['Express delivery', 'Logo Design', 'Source files']
+        )
+        detail = self.other.details.get()
+        self.assertEqual(list(detail.indexed_features.values_list('name', flat=True).order_by('name')),
+                         ['Express delivery', 'Logo Design'])
+
+    def test_all_features_on_one_detail(self):
+        self.assertEqual(self.filtered_ids({'features': 'Logo Design,Source files'}), {self.logo.id})
+        self.assertEqual(self.filtered_ids({'features': 'Logo Design'}), {self.logo.id, self.split.id, self.other.id})
+        self.assertEqual(self.filtered_ids({'features': 'Logo Design,Unknown'}), set())
+
+    def test_any_feature(self):
+        params = {'features': 'Express delivery,Source files', 'features_match': 'any'}
+        self.assertEqual(self.filtered_ids(params), {self.logo.id, self.split.id, self.other.id})
+        response = self.client.get(self.url, {'features': 'Logo Design', 'features_match': 'some'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_does_not_scan_json(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'features': 'Logo Design,Source files', 'fields': 'id'})
+        sql = ' '.join(q['sql'] for q in queries.captured_queries)
+        self.assertIn('offers_app_offerdetail_indexed_features', sql)
+        self.assertNotIn('"features"', sql)
+
+    def test_patch_reindexes_features(self):
+        detail = self.split.details.get(offer_type='tier-1')
+        url = reverse('offers:singleoffer', kwargs={'id': self.split.id})
+        payload = {'details': [{'offer_type': 'tier-1', 'features': ['Logo Design', 'Source files']}]}
+        response = self.client.patch(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail.indexed_features.count(), 2)
+        self.assertEqual(self.filtered_ids({'features': 'Logo Design,Source files'}), {self.logo.id, self.split.id})
+
+    def test_bulk_create_indexes_features(self):
+        payload = [{
+            'title': 'Bulk feature offer',
+            'description': 'Imported offer',
+            'details': [{
+                'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 3, 'price': 50,
+                'features': ['Source files', 'Printable'], 'offer_type': 'basic',
+            }],
+        }]
+        response = self.client.post(reverse('offers:offersbulk'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        offer = Offer.objects.get(title='Bulk feature offer')
+        self.assertEqual(self.filtered_ids({'features': 'Printable'}), {offer.id})
+
+
+class OfferBatchTests(APITestCase):
+    """
+    Tests for batch retrieval of offers and offer details by id ('?ids=').
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='batchbusiness', password='pass1234')
+        self.offers = []
+        for index in range(3):
+            offer = Offer.objects.create(user=self.user, title=f'Batch offer {index}', description='Desc')
+            OfferDetail.objects.create(
+                offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+                price=10 + index, features=[], offer_type='basic'
+            )
+            self.offers.append(offer)
+
+    def test_offers_in_requested_order(self):
+        ids = [self.offers[2].id, 999, self.offers[0].id, self.offers[2].id]
+        response = self.client.get(reverse('offers:offerslist'), {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual([offer['id'] for offer in body['results']], [self.offers[2].id, self.offers[0].id])
+        self.assertEqual(body['results'][0]['min_price'], 12)
+        self.assertEqual(body['missing'], [999])
+        self.assertNotIn('count', body)
+
+    def test_offer_batch_with_sparse_fields(self):
+        params = {'ids': f'{self.offers[1].id}', 'fields': 'id,title'}
+        response = self.client.get(reverse('offers:offerslist'), params)
+        self.assertEqual(response.json()['results'], [{'id': self.offers[1].id, 'title': 'Batch offer 1'}])
+
+    def test_batch_with_creator_filter_follows_other_creators(self):
+        """
+        '?creator_id=' does not narrow a batch, so its cache entry must not be
+        scoped to that creator.
+        """
+        other = User.objects.create_user(username='batchother', password='pass1234')
+        foreign = Offer.objects.create(user=other, title='Foreign', description='Desc')
+        params = {'ids': str(foreign.id), 'creator_id': self.user.id}
+        url = reverse('offers:offerslist')
+        self.assertEqual(self.client.get(url, params).json()['results'][0]['title'], 'Foreign')
+
+        foreign.title = 'Renamed'
+        foreign.save()
+        self.assertEqual(self.client.get(url, params).json()['results'][0]['title'], 'Renamed')
+
+    def test_offer_details_with_one_query(self):
+        detail_ids = [offer.details.get().id for offer in reversed(self.offers)]
+        url = reverse('offerdetails:offerdetailsbatch')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'ids': ','.join(map(str, detail_ids + [999]))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([detail['id'] for detail in response.data['results']], detail_ids)
+        self.assertEqual(response.data['missing'], [999])
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_invalid_ids(self):
+        url = reverse('offerdetails:offerdetailsbatch')
+        self.assertEqual(self.client.get(url, {'ids': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('offers:offerslist'), {'ids': ','.join(str(i) for i in range(1, 102))})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,18 @@
+import django_filters
+
+from orders_app.models import Order
+
+
+class OrderFilter(django_filters.FilterSet):
+    """
+    Filters for the order history. '?created_after=' is inclusive and
+    '?created_before=' exclusive, so consecutive ranges do not overlap;
+    both accept dates or ISO 8601 date-times.
+    """
+    status = django_filters.ChoiceFilter(choices=Order.STATUS_CHOICES)
+    created_after = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = Order
+        fields = ['status', 'created_after', 'created_before']
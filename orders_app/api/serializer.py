@@ -1,20 +1,37 @@
 from rest_framework import serializers
 
+from core.expand import ExpandableSerializerMixin, Expansion
+from core.fieldsets import SparseFieldsetMixin
+from offers_app.api.serializer import OfferDetailSerializer, OfferListSerializer
+from user_app.api.serializer import UserProfileSerializer
 from ..models import Order
 
-class OrderSerializer(serializers.ModelSerializer):
-    """
-    Serializer for the Order model. Includes additional read-only fields from the related OfferDetail 
-    and associated Offer to provide a comprehensive representation of the order.
+class OrderSerializer(SparseFieldsetMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     """
+    Serializer for the Order model. The purchased terms (title, delivery time,
+    revisions, price, features, offer type) are read from the snapshot stored on
+    the order, so the representation needs no joins and does not change when
+    the offer is edited later.
 
-    title = serializers.CharField(source='offer_detail.title', read_only=True)
-    delivery_time_in_days = serializers.IntegerField(source='offer_detail.delivery_time_in_days', read_only=True)
-    revisions = serializers.IntegerField(source='offer_detail.revisions', read_only=True)
-    price = serializers.DecimalField(source='offer_detail.price', max_digits=10, decimal_places=2, read_only=True)
-    features = serializers.JSONField(source='offer_detail.features', default=list, read_only=True)
-    offer_type = serializers.CharField(source='offer_detail.offer_type', read_only=True)
-    updated_at = serializers.DateTimeField(source='offer_detail.offer.updated_at', read_only=True)
+    '?expand=' accepts offer_detail, offer, business_user and customer_user
+    to inline the detail, its offer or the users' profiles;
+    '?fields=' / '?omit=' select the returned fields.
+    """
+    expandable_fields = {
+        'offer_detail': Expansion(OfferDetailSerializer),
+        'offer': Expansion(
+            OfferListSerializer,
+            source='offer_detail.offer',
+            select_related=['offer_detail__offer__user'],
+            prefetch_related=['offer_detail__offer__details'],
+        ),
+        'business_user': Expansion(
+            UserProfileSerializer, source='business_user.profile', select_related=['business_user__profile', 'business_user__review_summary']
+        ),
+        'customer_user': Expansion(
+            UserProfileSerializer, source='customer_user.profile', select_related=['customer_user__profile', 'customer_user__review_summary']
+        ),
+    }
 
     class Meta:
         model = Order
@@ -33,4 +50,33 @@ class OrderSerializer(serializers.ModelSerializer):
             'revisions',
             'price',
             'offer_type',
+            'version',
         ]
+        read_only_fields = [
+            'version', 'created_at', 'updated_at', 'features', 'title', 'delivery_time_in_days', 'revisions', 'price', 'offer_type',
+        ]
+
+
+class OrderStatusChangeSerializer(serializers.Serializer):
+    """
+    One requested status change; 'version' is the order version the client
+    has seen (optional, the change is rejected as a conflict if it is outdated).
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+    version = serializers.IntegerField(required=False, min_value=1)
+
+
+class OrderBulkStatusSerializer(serializers.Serializer):
+    """
+    Payload of the bulk status endpoint: {"orders": [{"id", "status", "version"}, ...]}.
+    """
+    max_orders = 100
+
+    orders = OrderStatusChangeSerializer(many=True, allow_empty=False, max_length=max_orders)
+
+    def validate_orders(self, value):
+        ids = [change['id'] for change in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError('Each order may only be listed once.')
+        return value
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderDetailView, OrderCountView, CompletedOrderCountView
+from .views import OrderListCreateView, OrderBulkStatusView, OrderDetailView, OrderCountView, CompletedOrderCountView, OrderCountsView
 
 orders_urlpatterns = [
     path('', OrderListCreateView.as_view(), name='orderslist'),             
+    path('bulk-status/', OrderBulkStatusView.as_view(), name='ordersbulkstatus'),
     path('<int:id>/', OrderDetailView.as_view(), name='orderdetails') 
 ]
 
@@ -13,3 +14,7 @@ order_count_urlpatterns = [
 completed_order_count_urlpatterns = [
     path('<int:business_user>/', CompletedOrderCountView.as_view(), name='completedordercount') 
     ]
+
+order_counts_urlpatterns = [
+    path('<int:business_user>/', OrderCountsView.as_view(), name='ordercounts'),
+]
@@ -4,29 +4,50 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
 
+from core.pagination import KeysetPagination
+from .. import counters, transitions
 from ..models import Order
-from .serializer import OrderSerializer
-from user_app.models import UserProfile
+from .filters import OrderFilter
+from .serializer import OrderBulkStatusSerializer, OrderSerializer
 from offers_app.models import OfferDetail
 
 
+class OrderCursorPagination(KeysetPagination):
+    """
+    Keyset pagination of the order history, newest first ('created_at' with
+    'id' as tiebreak). Skips the count unless '?include_count=true' is passed.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering = '-created_at'
+
+
 class OrderListCreateView(ListCreateAPIView):
     """
-    GET: Listet alle Bestellungen des aktuellen Nutzers auf.
+    GET: Listet die Bestellungen des aktuellen Nutzers seitenweise auf, neueste zuerst
+        (Cursor-Pagination; Filter '?status=', '?created_after=', '?created_before=';
+        mit '?expand=', '?fields=' und '?omit=').
     POST: Erstellt eine neue Bestellung für Kunden.
     """
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
+    pagination_class = OrderCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OrderFilter
 
     def get_queryset(self):
         user = self.request.user
         if user.profile.user_type == 'customer':
-            return Order.objects.filter(customer_user=user)
+            queryset = Order.objects.filter(customer_user=user)
         elif user.profile.user_type == 'business':
-            return Order.objects.filter(offer_detail__offer__user=user)
-        return Order.objects.none()
+            # business_user is the offer's creator, set when the order is placed.
+            queryset = Order.objects.filter(business_user=user)
+        else:
+            return Order.objects.none()
+        queryset = OrderSerializer.expand_queryset(queryset, self.request)
+        return OrderSerializer.sparse_queryset(queryset, self.request, columns=['created_at'])
 
     def create(self, request, *args, **kwargs):
         user = request.user
@@ -44,6 +65,7 @@ class OrderListCreateView(ListCreateAPIView):
         except (OfferDetail.DoesNotExist, ValueError):
             return Response({'error': 'OfferDetail not found'}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Order.save() stores a snapshot of the detail's terms on the order.
         order = Order.objects.create(
             business_user=offer_detail.offer.user,
             customer_user=user,
@@ -69,11 +91,13 @@ class OrderDetailView(RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
     pagination_class = None
 
+    def get_queryset(self):
+        return OrderSerializer.expand_queryset(super().get_queryset(), self.request)
+
     def patch(self, request, *args, **kwargs):
         order = self.get_object()
-        try:
-            profile = UserProfile.objects.get(user_id=request.user.id)
-        except UserProfile.DoesNotExist:
+        profile = getattr(request.user, 'profile', None)
+        if profile is None:
             return Response({'error': 'User profile not found.'}, status=status.HTTP_403_FORBIDDEN)
 
         if profile.user_type != 'business':
@@ -88,6 +112,58 @@ class OrderDetailView(RetrieveUpdateDestroyAPIView):
 
 
 
+class OrderBulkStatusView(APIView):
+    """
+    POST: Ändert den Status mehrerer Bestellungen des Business-Users auf einmal.
+    Body: {"orders": [{"id": 1, "status": "completed", "version": 3}, ...]}.
+    Erlaubt sind nur die Übergänge aus orders_app.transitions; Bestellungen, deren
+    'version' sich inzwischen geändert hat, werden als 'conflict' gemeldet.
+    Antwort: ein Ergebnis pro Bestellung in der Reihenfolge der Anfrage.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def post(self, request):
+        profile = getattr(request.user, 'profile', None)
+        if not (profile and profile.user_type == 'business'):
+            return Response({'error': 'Only business users can update orders.'}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = transitions.apply_transitions(request.user, serializer.validated_data['orders'])
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+def business_counts_or_404(business_user):
+    """
+    Returns the status counters of a business user (see orders_app.counters)
+    or a 404 response when there is no such business profile.
+    """
+    counts = counters.read_counts(business_user)
+    if counts is None:
+        return None, Response({'detail': 'Business user not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return counts, None
+
+
+class OrderCountsView(APIView):
+    """
+    Gibt alle Status-Zähler eines Business-Users zurück (eine indizierte Abfrage),
+    zusätzlich 'order_count' (in_progress) und 'completed_order_count'.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get(self, request, business_user):
+        counts, error = business_counts_or_404(business_user)
+        if error:
+            return error
+        return Response({
+            **counts,
+            'order_count': counts['in_progress'],
+            'completed_order_count': counts['completed'],
+        }, status=status.HTTP_200_OK)
+
+
 class OrderCountView(APIView):
     """
     Gibt die Anzahl der Bestellungen mit Status 'in_progress' für einen Business-User zurück.
@@ -96,13 +172,10 @@ class OrderCountView(APIView):
     pagination_class = None
 
     def get(self, request, business_user):
-        try:
-            UserProfile.objects.get(pk=business_user, user_type='business')
-        except UserProfile.DoesNotExist:
-            return Response({'detail': 'Business user not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        count = Order.objects.filter(business_user=business_user, status='in_progress').count()
-        return Response({'order_count': count}, status=status.HTTP_200_OK)
+        counts, error = business_counts_or_404(business_user)
+        if error:
+            return error
+        return Response({'order_count': counts['in_progress']}, status=status.HTTP_200_OK)
 
 
 class CompletedOrderCountView(APIView):
@@ -113,10 +186,7 @@ class CompletedOrderCountView(APIView):
     pagination_class = None
 
     def get(self, request, business_user):
-        try:
-            UserProfile.objects.get(pk=business_user, user_type='business')
-        except UserProfile.DoesNotExist:
-            return Response({'detail': 'Business user not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        count = Order.objects.filter(business_user=business_user, status='completed').count()
-        return Response({'completed_order_count': count}, status=status.HTTP_200_OK)
+        counts, error = business_counts_or_404(business_user)
+        if error:
+            return error
+        return Response({'completed_order_count': counts['completed']}, status=status.HTTP_200_OK)
@@ -0,0 +1,82 @@
+"""
+Per-business order counts by status.
+
+OrderStatusCount holds one row per (business_user, status). The order signals
+adjust it in the transaction that creates, moves or deletes an order; code
+that bypasses the signals (queryset.update(), raw SQL) must call adjust()
+itself or run the repair_order_counters command afterwards.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from user_app.models import UserProfile
+from .models import Order, OrderStatusCount
+
+STATUSES = [status for status, _ in Order.STATUS_CHOICES]
+
+
+def adjust(business_user_id, status, delta):
+    """
+    Adds `delta` to the counter of a business user and status (never below zero).
+    """
+    if not delta or business_user_id is None:
+        return
+    counters = OrderStatusCount.objects.filter(business_user_id=business_user_id, status=status)
+    if counters.update(count=Greatest(F('count') + delta, Value(0))) or delta < 0:
+        # A missing counter has nothing to subtract from (and may just have
+        # been removed by a cascade delete of the business user).
+        return
+    try:
+        with transaction.atomic():
+            OrderStatusCount.objects.create(business_user_id=business_user_id, status=status, count=max(delta, 0))
+    except IntegrityError:
+        # Created concurrently since the update above.
+        counters.update(count=Greatest(F('count') + delta, Value(0)))
+
+
+def read_counts(business_user):
+    """
+    Returns {status: count} for a business user (a User id) in one query, or
+    None when that user has no business profile.
+    """
+    counters = OrderStatusCount.objects.filter(business_user_id=business_user)
+    return UserProfile.objects.filter(user_id=business_user, user_type=UserProfile.BUSINESS).values(**{
+        status: Coalesce(Subquery(counters.filter(status=status).values('count')[:1]), 0)
+        for status in STATUSES
+    }).first()
+
+
+def actual_counts(business_user_ids=None):
+    """
+    Counts the orders per (business_user, status) with COUNT(*).
+    """
+    orders = Order.objects.all()
+    if business_user_ids is not None:
+        orders = orders.filter(business_user_id__in=business_user_ids)
+    rows = orders.order_by().values('business_user_id', 'status').annotate(total=Count('id'))
+    return {(row['business_user_id'], row['status']): row['total'] for row in rows}
+
+
+def repair(business_user_ids=None):
+    """
+    Rewrites every counter that differs from the actual order counts; counters
+    without orders are reset to zero. Returns the number of corrected counters.
+    """
+    with transaction.atomic():
+        actual = actual_counts(business_user_ids)
+        counters = OrderStatusCount.objects.select_for_update()
+        if business_user_ids is not None:
+            counters = counters.filter(business_user_id__in=business_user_ids)
+        stored = {(counter.business_user_id, counter.status): counter.count for counter in counters}
+
+        stale = [key for key in stored if key not in actual and stored[key]]
+        wrong = {key: total for key, total in actual.items() if stored.get(key) != total}
+        wrong.update(dict.fromkeys(stale, 0))
+        OrderStatusCount.objects.bulk_create(
+            [OrderStatusCount(business_user_id=key[0], status=key[1], count=total) for key, total in wrong.items()],
+            update_conflicts=True,
+            unique_fields=['business_user', 'status'],
+            update_fields=['count'],
+        )
+    return len(wrong)
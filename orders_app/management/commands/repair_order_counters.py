@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from orders_app import counters
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the per-business order status counters from the orders and
+    fixes the ones that drifted (e.g. after raw SQL or queryset.update()).
+    """
+    help = 'Repairs the OrderStatusCount rows from the actual order counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business-user', type=int, action='append', dest='business_users',
+                            help='Only repair the counters of this business user id (repeatable).')
+
+    def handle(self, *args, **options):
+        fixed = counters.repair(options['business_users'])
+        self.stdout.write(self.style.SUCCESS(f'Repaired {fixed} order counters.'))
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:27
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_terms(apps, schema_editor):
+    """
+    Copies the current terms of each order's OfferDetail onto the order; the
+    offer's updated_at becomes the order's updated_at (what the API returned so far).
+    """
+    Order = apps.get_model('orders_app', 'Order')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    details = OfferDetail.objects.filter(pk=OuterRef('offer_detail_id'))
+    Order.objects.update(**{
+        field: Subquery(details.values(field)[:1])
+        for field in ('title', 'delivery_time_in_days', 'revisions', 'features', 'offer_type')
+    }, updated_at=Subquery(details.values('offer__updated_at')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0012_alter_order_offer_detail_alter_order_status'),
+        ('offers_app', '0013_feature_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='delivery_time_in_days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='features',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='offer_type',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='revisions',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='title',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_terms, migrations.RunPython.noop),
+    ]
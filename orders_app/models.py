@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
 from offers_app.models import OfferDetail 
@@ -41,6 +41,9 @@ class Order(models.Model):
     # Timestamp when the order was created
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Timestamp of the last change to the order (e.g. its status)
+    updated_at = models.DateTimeField(auto_now=True)
+
     # Link to the associated OfferDetail, e.g., the product variant
     offer_detail = models.ForeignKey(
         OfferDetail, 
@@ -48,5 +51,85 @@ class Order(models.Model):
         related_name='orders'
     )
 
+    # Incremented on every update; bulk status changes only apply to the
+    # version the client has seen (optimistic concurrency, see orders_app.transitions)
+    version = models.PositiveIntegerField(default=1)
+
+    # Snapshot of the purchased terms, copied from the OfferDetail when the
+    # order is created so later edits of the offer do not change past orders
+    title = models.CharField(max_length=255, blank=True, default='')
+    delivery_time_in_days = models.PositiveIntegerField(default=0)
+    revisions = models.IntegerField(default=0)
+    features = models.JSONField(default=list, blank=True)
+    offer_type = models.CharField(max_length=20, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            # Order history of a seller, optionally by status, newest first
+            models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_status_created'),
+            # Order history of a customer, newest first
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created'),
+        ]
+
+    def snapshot_terms(self):
+        """
+        Copies the terms of the ordered OfferDetail onto the order.
+        product_name and price are only filled in when not given explicitly.
+        """
+        detail = self.offer_detail
+        self.title = detail.title
+        self.delivery_time_in_days = detail.delivery_time_in_days
+        self.revisions = detail.revisions
+        self.features = detail.features
+        self.offer_type = detail.offer_type
+        if not self.product_name:
+            self.product_name = detail.title
+        if self.price is None:
+            self.price = detail.price
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_state()
+        return instance
+
+    def remember_counted_state(self):
+        """
+        Remembers the (business_user, status) pair the order is counted under in
+        OrderStatusCount, so the signals can move it when either changes.
+        """
+        self._counted_state = (self.__dict__.get('business_user_id'), self.__dict__.get('status'))
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            if self.offer_detail_id is not None:
+                self.snapshot_terms()
+        else:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        # The status counters are updated by post_save inside the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self.remember_counted_state()
+
     def __str__(self):
         return f"Order {self.id} - {self.product_name} ({self.status})"
+
+
+class OrderStatusCount(models.Model):
+    """
+    Number of orders per business user and status, maintained by the order
+    signals (see orders_app.counters) so the dashboard counts need no COUNT(*).
+    """
+    business_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='order_status_counts')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['business_user', 'status'], name='unique_order_status_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.business_user_id} {self.status}: {self.count}"
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters
+from .models import Order
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, **kwargs):
+    """
+    Counts a new order, or moves it to its new (business_user, status) counter.
+    """
+    current = (instance.business_user_id, instance.status)
+    previous = None if created else getattr(instance, '_counted_state', None)
+    if previous == current:
+        return
+    if previous is not None:
+        counters.adjust(*previous, -1)
+    counters.adjust(*current, 1)
+
+
+@receiver(post_delete, sender=Order)
+def uncount_deleted_order(sender, instance, **kwargs):
+    counters.adjust(*getattr(instance, '_counted_state', (instance.business_user_id, instance.status)), -1)
@@ -1,10 +1,19 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
 from user_app.models import UserProfile
 from offers_app.models import OfferDetail, Offer
-from .models import Order
+from . import counters, transitions
+from .models import Order, OrderStatusCount
 
 class OrderAPITestCase(APITestCase):
 
@@ -47,7 +56,7 @@ class OrderAPITestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Kunde soll seine eigenen Orders sehen
-        self.assertTrue(any(order['id'] == self.order.id for order in response.data))
+        self.assertTrue(any(order['id'] == self.order.id for order in response.data['results']))
 
     def test_order_list_as_business(self):
         self.client.login(username='business', password='pass123')
@@ -55,7 +64,7 @@ class OrderAPITestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Business soll Orders für seine Offers sehen
-        self.assertTrue(any(order['id'] == self.order.id for order in response.data))
+        self.assertTrue(any(order['id'] == self.order.id for order in response.data['results']))
 
     def test_create_order_as_customer(self):
         self.client.login(username='customer', password='pass123')
@@ -126,3 +135,406 @@ class OrderAPITestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['completed_order_count'], 1)
+
+
+class OrderExpandTests(APITestCase):
+    """
+    Tests for '?expand=' on the order list.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='expandbusiness', password='pass123')
+        UserProfile.objects.create(user=self.business_user, user_type='business', location='Berlin')
+        self.customer_user = User.objects.create_user(username='expandcustomer', password='pass123')
+        UserProfile.objects.create(user=self.customer_user, user_type='customer')
+        self.client.force_authenticate(self.customer_user)
+        self.url = reverse('orders:orderslist')
+
+    def create_order(self):
+        offer = Offer.objects.create(user=self.business_user, title='Offer', description='Desc')
+        detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+            price=50, features=['Logo'], offer_type='basic'
+        )
+        return Order.objects.create(
+            business_user=self.business_user, customer_user=self.customer_user,
+            product_name=detail.title, price=detail.price, offer_detail=detail
+        )
+
+    def count_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def test_expanded_representation(self):
+        order = self.create_order()
+        response = self.client.get(self.url, {'expand': 'offer,business_user,offer_detail'})
+        data = response.data['results'][0]
+        self.assertEqual(data['offer']['id'], order.offer_detail.offer_id)
+        self.assertEqual(data['offer']['details'][0]['id'], order.offer_detail_id)
+        self.assertEqual(data['offer_detail']['features'], ['Logo'])
+        self.assertEqual(data['business_user']['location'], 'Berlin')
+        self.assertEqual(data['customer_user'], self.customer_user.id)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        """
+        Plain and expanded lists cost a fixed number of queries.
+        """
+        params = {'expand': 'offer,offer_detail,business_user,customer_user'}
+        self.create_order()
+        plain_single, _ = self.count_queries({})
+        expanded_single, _ = self.count_queries(params)
+        for _ in range(4):
+            self.create_order()
+        plain_many, _ = self.count_queries({})
+        expanded_many, response = self.count_queries(params)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(plain_single, plain_many)
+        self.assertEqual(expanded_single, expanded_many)
+
+    def test_sparse_fields_skip_joins(self):
+        self.create_order()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'fields': 'id,status'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'status'})
+        self.assertNotIn('offers_app_offerdetail', context.captured_queries[-1]['sql'])
+
+        response = self.client.get(self.url, {'omit': 'features,price'})
+        self.assertNotIn('features', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['title'], 'Basic')
+
+
+class OrderSnapshotTests(APITestCase):
+    """
+    Tests for the snapshot of the purchased terms stored on each order.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='snapshotbusiness', password='pass123')
+        UserProfile.objects.create(user=self.business_user, user_type='business')
+        self.customer_user = User.objects.create_user(username='snapshotcustomer', password='pass123')
+        UserProfile.objects.create(user=self.customer_user, user_type='customer')
+        self.offer = Offer.objects.create(user=self.business_user, title='Offer', description='Desc')
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', revisions=2, delivery_time_in_days=4,
+            price=80, features=['Logo'], offer_type='basic'
+        )
+        self.client.force_authenticate(self.customer_user)
+        self.url = reverse('orders:orderslist')
+
+    def test_order_keeps_purchased_terms(self):
+        response = self.client.post(self.url, {'offer_detail_id': self.detail.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.detail.title = 'Basic v2'
+        self.detail.price = 120
+        self.detail.features = ['Logo', 'Source files']
+        self.detail.save()
+
+        data = self.client.get(reverse('orders:orderdetails', kwargs={'id': response.data['id']})).data
+        self.assertEqual(data['title'], 'Basic')
+        self.assertEqual(data['price'], '80.00')
+        self.assertEqual(data['features'], ['Logo'])
+        self.assertEqual((data['revisions'], data['delivery_time_in_days'], data['offer_type']), (2, 4, 'basic'))
+
+    def test_list_reads_only_the_order_rows(self):
+        for _ in range(20):
+            Order.objects.create(
+                business_user=self.business_user, customer_user=self.customer_user, offer_detail=self.detail
+            )
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(response.data['results'][0]['title'], 'Basic')
+        order_queries = [q['sql'] for q in context.captured_queries if 'orders_app_order' in q['sql']]
+        self.assertEqual(len(order_queries), 1)
+        self.assertNotIn('offers_app_offerdetail', order_queries[0])
+
+    def test_snapshot_fields_are_read_only(self):
+        order = Order.objects.create(
+            business_user=self.business_user, customer_user=self.customer_user, offer_detail=self.detail
+        )
+        self.client.force_authenticate(self.business_user)
+        url = reverse('orders:orderdetails', kwargs={'id': order.id})
+        response = self.client.patch(url, {'status': 'completed', 'price': 1, 'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.price, order.title), ('completed', 80, 'Basic'))
+
+
+class OrderHistoryTests(APITestCase):
+    """
+    Tests for the paginated and filterable order history.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='historybusiness', password='pass123')
+        UserProfile.objects.create(user=self.business_user, user_type='business')
+        self.customer_user = User.objects.create_user(username='historycustomer', password='pass123')
+        UserProfile.objects.create(user=self.customer_user, user_type='customer')
+        offer = Offer.objects.create(user=self.business_user, title='Offer', description='Desc')
+        detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+            price=50, features=[], offer_type='basic'
+        )
+        self.start = timezone.now() - timedelta(days=30)
+        self.orders = []
+        for day in range(7):
+            order = Order.objects.create(
+                business_user=self.business_user, customer_user=self.customer_user, offer_detail=detail,
+                status='completed' if day % 2 else 'in_progress'
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=self.start + timedelta(days=day))
+            self.orders.append(order)
+        self.url = reverse('orders:orderslist')
+
+    def collect(self, params):
+        ids, url, params = [], self.url, dict(params)
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(order['id'] for order in response.data['results'])
+            url, params = response.data['next'], None
+        return ids
+
+    def test_cursor_pages_newest_first(self):
+        self.client.force_authenticate(self.customer_user)
+        ids = self.collect({'page_size': 3})
+        self.assertEqual(ids, [order.id for order in reversed(self.orders)])
+
+        first = self.client.get(self.url, {'page_size': 3, 'include_count': 'true'})
+        self.assertEqual(first.data['count'], 7)
+        self.assertIsNone(first.data['previous'])
+
+    def test_status_and_date_filters(self):
+        self.client.force_authenticate(self.business_user)
+        params = {
+            'status': 'completed',
+            'created_after': (self.start + timedelta(days=1)).isoformat(),
+            'created_before': (self.start + timedelta(days=5)).isoformat(),
+            'page_size': 1,
+        }
+        self.assertEqual(self.collect(params), [self.orders[3].id, self.orders[1].id])
+        response = self.client.get(self.url, {'status': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_business_history_uses_business_user_index(self):
+        self.client.force_authenticate(self.business_user)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {'status': 'completed'})
+        sql = context.captured_queries[-1]['sql']
+        self.assertNotIn('offers_app_offer', sql)
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('order_business_status_created', plan)
+
+
+class OrderStatusCounterTests(APITestCase):
+    """
+    Tests for the maintained per-business order status counters.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='counterbusiness', password='pass123')
+        self.profile = UserProfile.objects.create(user=self.business_user, user_type='business')
+        self.customer_user = User.objects.create_user(username='countercustomer', password='pass123')
+        UserProfile.objects.create(user=self.customer_user, user_type='customer')
+        offer = Offer.objects.create(user=self.business_user, title='Offer', description='Desc')
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+            price=50, features=[], offer_type='basic'
+        )
+        self.client.force_authenticate(self.customer_user)
+
+    def create_order(self, order_status='in_progress'):
+        return Order.objects.create(
+            business_user=self.business_user, customer_user=self.customer_user,
+            offer_detail=self.detail, status=order_status
+        )
+
+    def stored_counts(self):
+        return dict(OrderStatusCount.objects.filter(business_user=self.business_user).values_list('status', 'count'))
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        first, second = self.create_order(), self.create_order()
+        self.create_order('cancelled')
+        self.assertEqual(self.stored_counts(), {'in_progress': 2, 'cancelled': 1})
+
+        first.status = 'completed'
+        first.save()
+        first.save()
+        Order.objects.get(pk=second.pk).delete()
+        self.assertEqual(self.stored_counts(), {'in_progress': 0, 'completed': 1, 'cancelled': 1})
+
+        self.detail.delete()
+        self.assertEqual(self.stored_counts(), {'in_progress': 0, 'completed': 0, 'cancelled': 0})
+
+    def test_business_user_with_orders_can_be_deleted(self):
+        self.create_order()
+        self.create_order('completed')
+        self.business_user.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderStatusCount.objects.exists())
+
+    def test_string_representations(self):
+        order = self.create_order()
+        self.assertEqual(str(order), f'Order {order.pk} - Basic (in_progress)')
+        counter = OrderStatusCount.objects.get(business_user=self.business_user, status='in_progress')
+        self.assertEqual(str(counter), f'{self.business_user.pk} in_progress: 1')
+
+    def test_combined_counts_in_one_query(self):
+        self.create_order()
+        self.create_order('completed')
+        self.create_order('completed')
+        url = reverse('ordercounts:ordercounts', kwargs={'business_user': self.business_user.id})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'in_progress': 1, 'completed': 2, 'cancelled': 0, 'order_count': 1, 'completed_order_count': 2,
+        })
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('orders_app_order"', context.captured_queries[0]['sql'])
+
+        missing = reverse('ordercounts:ordercounts', kwargs={'business_user': 9999})
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_counts_are_looked_up_by_user_id(self):
+        """
+        Counters belong to the business User; the profile pk plays no part.
+        """
+        user = User.objects.create_user(username='counteroffset', password='pass123')
+        profile = UserProfile.objects.create(pk=self.business_user.id + 100, user=user, user_type='business')
+        Order.objects.create(business_user=user, customer_user=self.customer_user, offer_detail=self.detail)
+        self.assertNotEqual(profile.pk, user.id)
+
+        response = self.client.get(reverse('ordercounts:ordercounts', kwargs={'business_user': user.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['in_progress'], 1)
+        self.assertIsNone(counters.read_counts(profile.pk))
+
+    def test_repair_command(self):
+        self.create_order()
+        self.create_order('completed')
+        Order.objects.filter(status='completed').update(status='cancelled')
+        OrderStatusCount.objects.filter(status='in_progress').update(count=7)
+
+        out = StringIO()
+        call_command('repair_order_counters', stdout=out)
+        self.assertIn('Repaired 3 order counters.', out.getvalue())
+        self.assertEqual(self.stored_counts(), {'in_progress': 1, 'completed': 0, 'cancelled': 1})
+        self.assertEqual(counters.read_counts(self.business_user.id), {'in_progress': 1, 'completed': 0, 'cancelled': 1})
+
+
+class OrderBulkStatusTests(APITestCase):
+    """
+    Tests for bulk status transitions with optimistic concurrency.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='bulkstatusbusiness', password='pass123')
+        UserProfile.objects.create(user=self.business_user, user_type='business')
+        self.other_business = User.objects.create_user(username='bulkstatusother', password='pass123')
+        UserProfile.objects.create(user=self.other_business, user_type='business')
+        self.customer_user = User.objects.create_user(username='bulkstatuscustomer', password='pass123')
+        UserProfile.objects.create(user=self.customer_user, user_type='customer')
+        offer = Offer.objects.create(user=self.business_user, title='Offer', description='Desc')
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=1, delivery_time_in_days=3,
+            price=50, features=[], offer_type='basic'
+        )
+        self.url = reverse('orders:ordersbulkstatus')
+        self.client.force_authenticate(self.business_user)
+
+    def create_order(self, business_user=None, order_status='in_progress'):
+        return Order.objects.create(
+            business_user=business_user or self.business_user, customer_user=self.customer_user,
+            offer_detail=self.detail, status=order_status
+        )
+
+    def test_transitions_with_per_order_results(self):
+        complete, cancel, stale, done = [self.create_order() for _ in range(4)]
+        done.status = 'completed'
+        done.save()
+        stale.status = 'in_progress'
+        stale.save()
+        foreign = self.create_order(self.other_business)
+        payload = {'orders': [
+            {'id': complete.id, 'status': 'completed', 'version': 1},
+            {'id': cancel.id, 'status': 'cancelled'},
+            {'id': stale.id, 'status': 'completed', 'version': 1},
+            {'id': done.id, 'status': 'in_progress'},
+            {'id': foreign.id, 'status': 'completed'},
+        ]}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'id': complete.id, 'result': 'updated', 'status': 'completed', 'version': 2},
+            {'id': cancel.id, 'result': 'updated', 'status': 'cancelled', 'version': 2},
+            {'id': stale.id, 'result': 'conflict', 'status': 'in_progress', 'version': 2},
+            {'id': done.id, 'result': 'invalid_transition', 'status': 'completed', 'version': 2},
+            {'id': foreign.id, 'result': 'not_found'},
+        ])
+        updates = [q['sql'] for q in context.captured_queries if q['sql'].startswith('UPDATE "orders_app_order"')]
+        self.assertEqual(len(updates), 2)
+
+        self.assertEqual(Order.objects.get(pk=complete.pk).status, 'completed')
+        self.assertEqual(Order.objects.get(pk=stale.pk).status, 'in_progress')
+        self.assertEqual(
+            counters.read_counts(self.business_user.id),
+            {'in_progress': 1, 'completed': 2, 'cancelled': 1}
+        )
+
+    def test_order_moved_by_another_writer_after_the_read(self):
+        """
+        A concurrent request that moved an order between our read and our UPDATE
+        wins: we report a conflict and do not count the move a second time.
+        """
+        raced, other = self.create_order(), self.create_order()
+        real_is_allowed = transitions.is_allowed
+
+        def move_concurrently(current, target):
+            if not Order.objects.filter(pk=raced.pk, version=2).exists():
+                Order.objects.filter(pk=raced.pk).update(status='completed', version=2)
+                counters.adjust(self.business_user.pk, 'in_progress', -1)
+                counters.adjust(self.business_user.pk, 'completed', 1)
+            return real_is_allowed(current, target)
+
+        payload = {'orders': [
+            {'id': raced.id, 'status': 'completed', 'version': 1},
+            {'id': other.id, 'status': 'completed', 'version': 1},
+        ]}
+        with mock.patch.object(transitions, 'is_allowed', side_effect=move_concurrently):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.data['results'], [
+            {'id': raced.id, 'result': 'conflict', 'status': 'completed', 'version': 2},
+            {'id': other.id, 'result': 'updated', 'status': 'completed', 'version': 2},
+        ])
+        self.assertEqual(
+            counters.read_counts(self.business_user.id),
+            {'in_progress': 0, 'completed': 2, 'cancelled': 0}
+        )
+
+    def test_single_patch_bumps_version(self):
+        order = self.create_order()
+        url = reverse('orders:orderdetails', kwargs={'id': order.id})
+        response = self.client.patch(url, {'status': 'completed'}, format='json')
+        self.assertEqual(response.data['version'], 2)
+        payload = {'orders': [{'id': order.id, 'status': 'cancelled', 'version': 1}]}
+        result = self.client.post(self.url, payload, format='json').data['results'][0]
+        self.assertEqual(result['result'], 'conflict')
+
+    def test_invalid_payloads(self):
+        order = self.create_order()
+        duplicate = {'orders': [{'id': order.id, 'status': 'completed'}] * 2}
+        self.assertEqual(self.client.post(self.url, duplicate, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        unknown = {'orders': [{'id': order.id, 'status': 'shipped'}]}
+        self.assertEqual(self.client.post(self.url, unknown, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(self.url, {'orders': []}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.customer_user)
+        valid = {'orders': [{'id': order.id, 'status': 'completed'}]}
+        self.assertEqual(self.client.post(self.url, valid, format='json').status_code, status.HTTP_403_FORBIDDEN)
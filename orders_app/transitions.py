@@ -0,0 +1,102 @@
+"""
+Bulk order status transitions with optimistic concurrency.
+
+Each requested change names an order, the target status and optionally the
+order version the client has seen. The current rows are read once; valid
+changes are then applied with one UPDATE per target status whose WHERE
+clause repeats every (id, version) pair, so an order modified in the
+meantime is left alone and reported as a conflict instead of being locked.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import counters
+from .models import Order
+
+# Allowed status changes: an order in progress can be completed or cancelled.
+ALLOWED_TRANSITIONS = {
+    'in_progress': {'completed', 'cancelled'},
+}
+
+
+def is_allowed(current, target):
+    return target in ALLOWED_TRANSITIONS.get(current, set())
+
+
+def apply_transitions(business_user, changes):
+    """
+    Applies [{'id', 'status', 'version' (optional)}] to the orders of a business
+    user. Returns one result per change, in request order: {'id', 'result', ...}
+    with result 'updated', 'not_found', 'invalid_transition' or 'conflict'.
+    """
+    with transaction.atomic():
+        ids = [change['id'] for change in changes]
+        current = {
+            row['id']: row
+            for row in Order.objects.filter(pk__in=ids, business_user=business_user).values('id', 'status', 'version')
+        }
+
+        results, planned = {}, defaultdict(list)
+        for change in changes:
+            row = current.get(change['id'])
+            expected = change.get('version', row and row['version'])
+            if row is None:
+                results[change['id']] = {'result': 'not_found'}
+            elif expected != row['version']:
+                results[change['id']] = {'result': 'conflict', 'status': row['status'], 'version': row['version']}
+            elif not is_allowed(row['status'], change['status']):
+                results[change['id']] = {'result': 'invalid_transition', 'status': row['status'], 'version': row['version']}
+            else:
+                planned[change['status']].append((change['id'], expected))
+
+        now = timezone.now()
+        updated = set()
+        for target, pairs in planned.items():
+            updated.update(move_orders(business_user, target, pairs, now))
+
+        # Orders changed by another writer between the read and the UPDATE are
+        # reported with their current state.
+        moved = defaultdict(int)
+        for target, pairs in planned.items():
+            for pk, version in pairs:
+                if pk in updated:
+                    results[pk] = {'result': 'updated', 'status': target, 'version': version + 1}
+                    moved[(current[pk]['status'], target)] += 1
+        changed = [pk for pairs in planned.values() for pk, _ in pairs if pk not in updated]
+        for row in Order.objects.filter(pk__in=changed).values('id', 'status', 'version'):
+            results[row['id']] = {'result': 'conflict', 'status': row['status'], 'version': row['version']}
+        for pk in changed:
+            results.setdefault(pk, {'result': 'not_found'})
+
+        # queryset.update() sends no signals: move the status counters explicitly.
+        for (source, target), count in moved.items():
+            counters.adjust(business_user.pk, source, -count)
+            counters.adjust(business_user.pk, target, count)
+
+    return [{'id': pk, **results[pk]} for pk in ids]
+
+
+def move_orders(business_user, target, pairs, now):
+    """
+    Moves the (id, version) pairs to `target` and returns the ids this call
+    actually updated. One UPDATE covers the whole group; when it matches fewer
+    rows than pairs it is rolled back and every pair is applied on its own,
+    so only rows whose own guarded UPDATE matched count as updated.
+    """
+    def update(matches):
+        return Order.objects.filter(matches, business_user=business_user).update(
+            status=target, version=F('version') + 1, updated_at=now
+        )
+
+    group = Q()
+    for pk, version in pairs:
+        group |= Q(pk=pk, version=version)
+    savepoint = transaction.savepoint()
+    if update(group) == len(pairs):
+        transaction.savepoint_commit(savepoint)
+        return {pk for pk, _ in pairs}
+    transaction.savepoint_rollback(savepoint)
+    return {pk for pk, version in pairs if update(Q(pk=pk, version=version)) == 1}
@@ -1,8 +1,11 @@
 from rest_framework import serializers
 
+from core.expand import ExpandableSerializerMixin, Expansion
+from core.fieldsets import SparseFieldsetMixin
+from user_app.api.serializer import UserProfileSerializer
 from ..models import Review
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Review model.
 
@@ -10,7 +13,15 @@ class ReviewSerializer(serializers.ModelSerializer):
       including the business user being reviewed, the reviewer,
       the rating, description,
       as well as timestamps for creation and last update.
+    - '?expand=business_user,reviewer' inlines the users' profiles.
+    - '?fields=' / '?omit=' select the returned fields.
     """
+    expandable_fields = {
+        'business_user': Expansion(
+            UserProfileSerializer, source='business_user.profile', select_related=['business_user__profile', 'business_user__review_summary']
+        ),
+        'reviewer': Expansion(UserProfileSerializer, source='reviewer.profile', select_related=['reviewer__profile', 'reviewer__review_summary']),
+    }
     class Meta:
         model = Review
         fields = [
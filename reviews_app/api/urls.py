@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import ReviewListCreateView, ReviewDetailView 
+from .views import ReviewListCreateView, ReviewDetailView, ReviewSummaryView
 
 urlpatterns = [
     path('', ReviewListCreateView.as_view(), name='reviewslist'),
     path('<int:id>/', ReviewDetailView.as_view(), name='reviewdetail'),
+    path('summary/<int:business_user>/', ReviewSummaryView.as_view(), name='reviewsummary'),
 ]
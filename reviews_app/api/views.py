@@ -1,41 +1,97 @@
+from django.contrib.auth.models import User
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import status
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
 
+from core.cache import normalize_query
+from core.conditional import conditional_get
+from core.pagination import KeysetPagination
+from user_app.cache import profile_generations
+from .. import summaries
 from ..models import Review
 from .serializer import ReviewSerializer
 
 
+def expanded_profile_generations(request, reviews):
+    """
+    Generation tokens of the profiles inlined by '?expand=' for the given
+    reviews (a queryset or one review's values), so validators change when
+    an embedded profile does. Empty without expansions.
+    """
+    expanded = ReviewSerializer.get_requested_expansions(request)
+    if not expanded:
+        return []
+    columns = [f'{name}_id' for name in expanded]
+    if isinstance(reviews, dict):
+        rows = [tuple(reviews[column] for column in columns)]
+    else:
+        rows = reviews.order_by().values_list(*columns).distinct()
+    return profile_generations({user_id for row in rows for user_id in row})
+
+
+class ReviewCursorPagination(KeysetPagination):
+    """
+    Keyset pagination of reviews over the view's allowed orderings (by id when
+    none is given), with 'id' as tiebreak. Each filter/ordering pair is served
+    by one of the Review indexes, so pages are read in index order.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get('ordering')
+        return ordering if ordering in getattr(view, 'allowed_orderings', ()) else self.ordering
+
+
 class ReviewListCreateView(ListCreateAPIView):
     """
     GET:
+        - Paginated with keyset cursors ('next' / 'previous'; '?page_size=', '?include_count=true').
         - Optional filtering by business_user_id and/or reviewer_id.
         - Optional ordering by rating or updated_at.
+        - Optional '?expand=business_user,reviewer' to inline profiles.
+        - Optional '?fields=' / '?omit=' to return (and load) only some fields.
+        - Supports conditional requests (ETag / If-None-Match).
     POST:
         - Creates a new review with the logged-in user as reviewer.
     """
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
+    pagination_class = ReviewCursorPagination
+    # Applied by ReviewCursorPagination.
+    allowed_orderings = ['rating', '-rating', 'updated_at', '-updated_at']
 
     def get_queryset(self):
-        queryset = Review.objects.all()
+        queryset = ReviewSerializer.expand_queryset(Review.objects.all(), self.request)
         business_user_id = self.request.GET.get('business_user_id')
         reviewer_id = self.request.GET.get('reviewer_id')
-        ordering = self.request.GET.get('ordering')
 
         if business_user_id:
             queryset = queryset.filter(business_user_id=business_user_id)
         if reviewer_id:
             queryset = queryset.filter(reviewer_id=reviewer_id)
 
-        allowed_ordering = ['rating', '-rating', 'updated_at', '-updated_at']
-        if ordering in allowed_ordering:
-            queryset = queryset.order_by(ordering)
+        return ReviewSerializer.sparse_queryset(queryset, self.request, columns=['rating', 'updated_at'])
 
-        return queryset
+    def get_validators(self, request, *args, **kwargs):
+        """
+        The filtered list changes exactly when its size or newest update changes
+        (edits bump updated_at, deletes lower the count) or, with '?expand=',
+        when one of the inlined profiles changes.
+        """
+        queryset = self.get_queryset()
+        summary = queryset.aggregate(count=Count('id'), last_updated=Max('updated_at'))
+        profiles = expanded_profile_generations(request, queryset)
+        return (normalize_query(request.query_params), summary['count'], summary['last_updated'], profiles), None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         if hasattr(request.user, 'profile') and request.user.profile.user_type == 'business':
@@ -56,7 +112,7 @@ class ReviewListCreateView(ListCreateAPIView):
 
 class ReviewDetailView(RetrieveUpdateDestroyAPIView):
     """
-    GET: Holt die Details einer Review.
+    GET: Holt die Details einer Review (mit ETag / Last-Modified).
     PATCH: Nur der Reviewer darf aktualisieren.
     DELETE: Nur der Reviewer darf löschen.
     """
@@ -65,7 +121,23 @@ class ReviewDetailView(RetrieveUpdateDestroyAPIView):
     pagination_class = None
 
     def get_object(self):
-        return get_object_or_404(Review, pk=self.kwargs['id'])
+        return get_object_or_404(ReviewSerializer.expand_queryset(Review.objects.all(), self.request), pk=self.kwargs['id'])
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        The ETag covers the review, the query string and the inlined profiles.
+        Last-Modified only reflects the review, so it is left out with '?expand='.
+        """
+        review = Review.objects.filter(pk=kwargs['id']).values('updated_at', 'business_user_id', 'reviewer_id').first()
+        if review is None:
+            return None
+        profiles = expanded_profile_generations(request, review)
+        etag_source = (kwargs['id'], review['updated_at'].isoformat(), normalize_query(request.query_params), profiles)
+        return etag_source, None if profiles else review['updated_at']
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
     def patch(self, request, *args, **kwargs):
         review = self.get_object()
@@ -78,3 +150,19 @@ class ReviewDetailView(RetrieveUpdateDestroyAPIView):
         if review.reviewer != request.user:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         return super().delete(request, *args, **kwargs)
+
+
+class ReviewSummaryView(APIView):
+    """
+    GET: Review overview of a business user (count, sum, average, 1-5 star
+    histogram, latest review) read from the maintained ReviewSummary.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get(self, request, business_user):
+        user = User.objects.select_related('review_summary').filter(pk=business_user).first()
+        if user is None:
+            return Response({'detail': 'Business user not found.'}, status=status.HTTP_404_NOT_FOUND)
+        summary = getattr(user, 'review_summary', None)
+        return Response({'business_user': user.pk, **summaries.represent(summary)})
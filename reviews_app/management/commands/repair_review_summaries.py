@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from reviews_app import summaries
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the per-business review summaries from the reviews and fixes
+    the ones that drifted (e.g. after raw SQL or queryset.update()).
+    """
+    help = 'Repairs the ReviewSummary rows from the actual reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business-user', type=int, action='append', dest='business_users',
+                            help='Only repair the summary of this business user id (repeatable).')
+
+    def handle(self, *args, **options):
+        fixed = summaries.repair(options['business_users'])
+        self.stdout.write(self.style.SUCCESS(f'Repaired {fixed} review summaries.'))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def populate_summaries(apps, schema_editor):
+    Review = apps.get_model('reviews_app', 'Review')
+    ReviewSummary = apps.get_model('reviews_app', 'ReviewSummary')
+    rows = Review.objects.order_by().values('business_user_id').annotate(
+        review_count=Count('id'),
+        rating_sum=Sum('rating'),
+        last_review_at=Max('created_at'),
+        **{f'rating_{star}': Count('id', filter=Q(rating=star)) for star in range(1, 6)},
+    )
+    ReviewSummary.objects.bulk_create([
+        ReviewSummary(average_rating=row['rating_sum'] / row['review_count'], **row) for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0004_alter_review_business_user_alter_review_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewSummary',
+            fields=[
+                ('business_user', models.OneToOneField(help_text='The user the reviews were written for.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('average_rating', models.FloatField(blank=True, null=True)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('last_review_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
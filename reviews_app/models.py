@@ -1,5 +1,5 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 
 class Review(models.Model):
     """
@@ -40,9 +40,71 @@ class Review(models.Model):
         help_text='Timestamp of the last update to the review.'
     )
 
+    class Meta:
+        # One index per filter/ordering pair of the review list (keyset pagination).
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated'),
+            models.Index(fields=['reviewer', 'rating'], name='review_reviewer_rating'),
+        ]
+
     def __str__(self):
         """
         Returns a meaningful string representation of the review.
         Example: "Review by alice for bob - 4 stars"
         """
         return f"Review by {self.reviewer.username} for {self.business_user.username} - {self.rating} stars"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_summarized_state()
+        return instance
+
+    def remember_summarized_state(self):
+        """
+        Remembers the (business_user, rating) the review is counted under in
+        ReviewSummary, so the signals can move it when either changes.
+        """
+        self._summarized_state = (self.__dict__.get('business_user_id'), self.__dict__.get('rating'))
+
+    def save(self, *args, **kwargs):
+        # The review summary is updated by post_save inside the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self.remember_summarized_state()
+
+
+class ReviewSummary(models.Model):
+    """
+    Aggregate of the reviews a business user received, maintained in the same
+    transaction as every review write (see reviews_app.summaries).
+
+    Attributes:
+        business_user (OneToOneField): The reviewed user.
+        review_count (PositiveIntegerField): Number of reviews.
+        rating_sum (IntegerField): Sum of all ratings.
+        average_rating (FloatField): rating_sum / review_count (null without reviews).
+        rating_1 ... rating_5 (PositiveIntegerField): Number of reviews per star rating.
+        last_review_at (DateTimeField): Creation time of the newest review.
+    """
+    business_user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='review_summary',
+        help_text='The user the reviews were written for.'
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    last_review_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Review summary of {self.business_user_id}: {self.review_count} reviews"
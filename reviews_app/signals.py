@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from offers_app import cache as offer_cache
+from user_app import cache as profile_cache
+from . import summaries
+from .models import Review
+
+
+def invalidate_summary_readers(business_user_id):
+    """
+    Business profiles embed the summary, also inside offers expanded with
+    '?expand=user', so both the profile and the creator's offer responses
+    are invalidated.
+    """
+    profile_cache.invalidate_profile(business_user_id)
+    transaction.on_commit(lambda: offer_cache.invalidate_creator(business_user_id))
+
+
+@receiver(post_save, sender=Review)
+def summarize_saved_review(sender, instance, created, **kwargs):
+    """
+    Adds a new review to its business user's summary, or moves it when its
+    rating or business user changed.
+    """
+    current = (instance.business_user_id, instance.rating)
+    previous = None if created else getattr(instance, '_summarized_state', None)
+    if previous == current:
+        return
+    if previous is not None:
+        summaries.adjust(*previous, -1)
+        if previous[0] != instance.business_user_id:
+            invalidate_summary_readers(previous[0])
+    summaries.adjust(*current, 1, reviewed_at=instance.created_at)
+    invalidate_summary_readers(instance.business_user_id)
+
+
+@receiver(post_delete, sender=Review)
+def unsummarize_deleted_review(sender, instance, **kwargs):
+    business_user_id, rating = getattr(instance, '_summarized_state', (instance.business_user_id, instance.rating))
+    summaries.adjust(business_user_id, rating, -1)
+    invalidate_summary_readers(business_user_id)
@@ -0,0 +1,118 @@
+"""
+Per-business review aggregates.
+
+ReviewSummary holds the review count, rating sum, average, 1-5 star
+histogram and newest review time of every reviewed business user. The review
+signals adjust it in the transaction that creates, changes or deletes a
+review; writes that bypass the signals (queryset.update(), raw SQL) need the
+repair_review_summaries command afterwards.
+"""
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf
+
+from .models import Review, ReviewSummary
+
+STARS = range(1, 6)
+SUMMARY_FIELDS = [
+    'review_count', 'rating_sum', 'average_rating', *(f'rating_{star}' for star in STARS), 'last_review_at',
+]
+
+
+def adjust(business_user_id, rating, delta, reviewed_at=None):
+    """
+    Adds (delta=1) or removes (delta=-1) one review with the given rating.
+    On additions `reviewed_at` may advance last_review_at; on removals it is
+    re-read from the remaining reviews.
+    """
+    if business_user_id is None or rating is None:
+        return
+    if delta > 0:
+        # Removals never create a summary: during a cascade delete of the
+        # business user its summary may already be gone.
+        ReviewSummary.objects.get_or_create(business_user_id=business_user_id)
+
+    count = Greatest(F('review_count') + delta, Value(0))
+    total = F('rating_sum') + rating * delta
+    changes = {
+        'review_count': count,
+        'rating_sum': total,
+        'average_rating': Cast(total, FloatField()) / NullIf(count, 0),
+    }
+    if rating in STARS:
+        changes[f'rating_{rating}'] = Greatest(F(f'rating_{rating}') + delta, Value(0))
+    if delta > 0 and reviewed_at is not None:
+        changes['last_review_at'] = Greatest(Coalesce(F('last_review_at'), Value(reviewed_at)), Value(reviewed_at))
+    elif delta < 0:
+        newest = Review.objects.filter(business_user_id=business_user_id).order_by('-created_at')
+        changes['last_review_at'] = Subquery(newest.values('created_at')[:1])
+    ReviewSummary.objects.filter(business_user_id=business_user_id).update(**changes)
+
+
+def represent(summary):
+    """
+    Returns the API representation of a ReviewSummary (or of no reviews for None).
+    """
+    return {
+        'review_count': summary.review_count if summary else 0,
+        'average_rating': round(summary.average_rating, 2) if summary and summary.average_rating is not None else None,
+        'rating_sum': summary.rating_sum if summary else 0,
+        'histogram': {str(star): getattr(summary, f'rating_{star}') if summary else 0 for star in STARS},
+        'last_review_at': summary.last_review_at if summary else None,
+    }
+
+
+def actual_summaries(business_user_ids=None):
+    """
+    Aggregates the reviews per business user with one GROUP BY query.
+    """
+    reviews = Review.objects.all()
+    if business_user_ids is not None:
+        reviews = reviews.filter(business_user_id__in=business_user_ids)
+    rows = reviews.order_by().values('business_user_id').annotate(
+        review_count=Count('id'),
+        rating_sum=Sum('rating'),
+        last_review_at=Max('created_at'),
+        **{f'rating_{star}': Count('id', filter=Q(rating=star)) for star in STARS},
+    )
+    summaries = {}
+    for row in rows:
+        business_user_id = row.pop('business_user_id')
+        row['average_rating'] = row['rating_sum'] / row['review_count']
+        summaries[business_user_id] = row
+    return summaries
+
+
+def repair(business_user_ids=None):
+    """
+    Rewrites every summary that differs from the actual reviews; summaries of
+    users without reviews are reset. Returns the number of corrected summaries.
+    """
+    empty = {'review_count': 0, 'rating_sum': 0, 'average_rating': None, 'last_review_at': None,
+             **{f'rating_{star}': 0 for star in STARS}}
+    with transaction.atomic():
+        actual = actual_summaries(business_user_ids)
+        stored = ReviewSummary.objects.select_for_update()
+        if business_user_ids is not None:
+            stored = stored.filter(business_user_id__in=business_user_ids)
+        stored = {row.pop('business_user_id'): row for row in stored.values('business_user_id', *SUMMARY_FIELDS)}
+
+        wrong = {pk: values for pk, values in actual.items() if not same_summary(stored.get(pk), values)}
+        wrong.update({pk: empty for pk, values in stored.items() if pk not in actual and values != empty})
+        ReviewSummary.objects.bulk_create(
+            [ReviewSummary(business_user_id=pk, **values) for pk, values in wrong.items()],
+            update_conflicts=True,
+            unique_fields=['business_user'],
+            update_fields=SUMMARY_FIELDS,
+        )
+    return len(wrong)
+
+
+def same_summary(stored, actual):
+    if stored is None:
+        return False
+    return all(
+        abs(stored[name] - actual[name]) < 1e-9 if name == 'average_rating' and stored[name] is not None
+        else stored[name] == actual[name]
+        for name in SUMMARY_FIELDS
+    )
@@ -1,8 +1,14 @@
+from io import StringIO
+
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
-from .models import Review
+from user_app.models import UserProfile
+from .models import Review, ReviewSummary
 
 
 class ReviewTests(APITestCase):
@@ -36,7 +42,7 @@ class ReviewTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data['results']), 1)
 
     def test_get_reviews_with_filters(self):
         """
@@ -46,7 +52,7 @@ class ReviewTests(APITestCase):
         response = self.client.get(url, {'business_user_id': self.business_user.id})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data[0]['business_user'], self.business_user.id)
+        self.assertEqual(response.data['results'][0]['business_user'], self.business_user.id)
 
     def test_create_review_success(self):
         """
@@ -141,3 +147,279 @@ class ReviewTests(APITestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ReviewConditionalGetTests(APITestCase):
+    """
+    Tests for conditional requests on the review endpoints.
+    """
+
+    def setUp(self):
+        self.reviewer = User.objects.create_user(username='etagreviewer', password='pass1234')
+        self.business_user = User.objects.create_user(username='etagbusiness', password='pass1234')
+        self.client.force_authenticate(self.reviewer)
+        self.review = Review.objects.create(
+            reviewer=self.reviewer, business_user=self.business_user,
+            rating=4, description='Good.'
+        )
+
+    def test_review_list_revalidation(self):
+        """
+        The list answers 304 until a review is added, edited or deleted.
+        """
+        url = reverse('reviewslist')
+        params = {'business_user_id': self.business_user.id}
+        etag = self.client.get(url, params)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = Review.objects.create(
+            reviewer=self.reviewer, business_user=self.business_user, rating=2, description='Meh.'
+        )
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        other.delete()
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_review_detail_etag_and_last_modified(self):
+        """
+        The detail view sends both validators and honours either of them.
+        """
+        url = reverse('reviewdetail', args=[self.review.id])
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+
+        self.client.patch(url, {'rating': 5}, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_expanded_profiles_change_the_etag(self):
+        """
+        '?expand=' responses get their own ETag, which changes with the inlined profiles.
+        """
+        profile = UserProfile.objects.create(user=self.reviewer, user_type='customer')
+        UserProfile.objects.create(user=self.business_user, user_type='business')
+        detail_url = reverse('reviewdetail', args=[self.review.id])
+        list_url = reverse('reviewslist')
+        params = {'expand': 'reviewer'}
+
+        plain_etag = self.client.get(detail_url)['ETag']
+        detail = self.client.get(detail_url, params)
+        list_etag = self.client.get(list_url, params)['ETag']
+        self.assertNotEqual(detail['ETag'], plain_etag)
+        self.assertNotIn('Last-Modified', detail)
+        self.assertEqual(
+            self.client.get(detail_url, params, HTTP_IF_NONE_MATCH=detail['ETag']).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+
+        profile.location = 'Berlin'
+        profile.save()
+        response = self.client.get(detail_url, params, HTTP_IF_NONE_MATCH=detail['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['reviewer']['location'], 'Berlin')
+        self.assertEqual(self.client.get(list_url, params, HTTP_IF_NONE_MATCH=list_etag).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=plain_etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ReviewExpandTests(APITestCase):
+    """
+    Tests for '?expand=' on the review endpoints.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='expandbusiness', password='pass1234')
+        UserProfile.objects.create(user=self.business_user, user_type='business', first_name='Bea')
+        self.client.force_authenticate(self.business_user)
+        self.url = reverse('reviewslist')
+
+    def create_reviews(self, count):
+        for _ in range(count):
+            reviewer = User.objects.create_user(username=f'expandreviewer{User.objects.count()}', password='pass1234')
+            UserProfile.objects.create(user=reviewer, user_type='customer')
+            Review.objects.create(reviewer=reviewer, business_user=self.business_user, rating=5, description='Top.')
+
+    def test_expand_profiles_with_fixed_query_count(self):
+        params = {'expand': 'business_user,reviewer'}
+        self.create_reviews(1)
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(self.url, params)
+        self.create_reviews(4)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url, params)
+
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(len(single.captured_queries), len(many.captured_queries))
+        self.assertEqual(response.data['results'][0]['business_user']['first_name'], 'Bea')
+        self.assertEqual(response.data['results'][0]['reviewer']['type'], 'customer')
+
+    def test_expand_ignored_on_create(self):
+        """
+        Writes keep the plain id fields, so '?expand=' cannot break validation.
+        """
+        reviewer = User.objects.create_user(username='expandwriter', password='pass1234')
+        self.client.force_authenticate(reviewer)
+        response = self.client.post(
+            f'{self.url}?expand=business_user',
+            {'business_user': self.business_user.id, 'rating': 4, 'description': 'Fine.'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['business_user'], self.business_user.id)
+
+    def test_sparse_fields(self):
+        self.create_reviews(2)
+        response = self.client.get(self.url, {'fields': 'id,rating', 'ordering': '-rating'})
+        self.assertEqual([set(review) for review in response.data['results']], [{'id', 'rating'}] * 2)
+        response = self.client.get(self.url, {'omit': 'description'})
+        self.assertNotIn('description', response.data['results'][0])
+        self.assertIn('reviewer', response.data['results'][0])
+
+
+class ReviewSummaryTests(APITestCase):
+    """
+    Tests for the maintained per-business review summaries.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='summarybusiness', password='pass1234')
+        self.profile = UserProfile.objects.create(user=self.business_user, user_type='business')
+        self.other_business = User.objects.create_user(username='summaryother', password='pass1234')
+        UserProfile.objects.create(user=self.other_business, user_type='business')
+        self.reviewer = User.objects.create_user(username='summaryreviewer', password='pass1234')
+        UserProfile.objects.create(user=self.reviewer, user_type='customer')
+        self.client.force_authenticate(self.reviewer)
+
+    def review(self, rating, business_user=None):
+        return Review.objects.create(
+            business_user=business_user or self.business_user, reviewer=self.reviewer,
+            rating=rating, description='Review'
+        )
+
+    def summary(self, user=None):
+        url = reverse('reviewsummary', kwargs={'business_user': (user or self.business_user).id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_summary_follows_create_update_and_delete(self):
+        first, second = self.review(5), self.review(3)
+        third = self.review(4)
+        data = self.summary()
+        self.assertEqual((data['review_count'], data['rating_sum'], data['average_rating']), (3, 12, 4.0))
+        self.assertEqual(data['histogram'], {'1': 0, '2': 0, '3': 1, '4': 1, '5': 1})
+        self.assertEqual(data['last_review_at'], third.created_at)
+
+        second.rating = 1
+        second.save()
+        third.business_user = self.other_business
+        third.save()
+        Review.objects.get(pk=first.pk).delete()
+        data = self.summary()
+        self.assertEqual((data['review_count'], data['rating_sum'], data['average_rating']), (1, 1, 1.0))
+        self.assertEqual(data['histogram'], {'1': 1, '2': 0, '3': 0, '4': 0, '5': 0})
+        self.assertEqual(data['last_review_at'], second.created_at)
+        self.assertEqual(self.summary(self.other_business)['review_count'], 1)
+
+        second.delete()
+        data = self.summary()
+        self.assertEqual((data['review_count'], data['average_rating'], data['last_review_at']), (0, None, None))
+
+    def test_business_user_with_reviews_can_be_deleted(self):
+        self.review(4)
+        self.review(2)
+        self.business_user.delete()
+        self.assertFalse(Review.objects.filter(business_user_id=self.profile.user_id).exists())
+        self.assertFalse(ReviewSummary.objects.exists())
+
+    def test_summary_endpoint_for_unknown_and_unreviewed_users(self):
+        self.assertEqual(self.summary()['review_count'], 0)
+        url = reverse('reviewsummary', kwargs={'business_user': 9999})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_profiles_include_summary_without_extra_queries(self):
+        self.review(4)
+        self.review(2)
+        url = reverse('userprofiles:businessprofiles')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        summaries_by_user = {profile['user']: profile['review_summary'] for profile in response.data['results']}
+        self.assertEqual(summaries_by_user[self.business_user.id]['average_rating'], 3.0)
+        self.assertEqual(summaries_by_user[self.other_business.id]['review_count'], 0)
+        self.assertEqual(len(context.captured_queries), 1)
+
+        response = self.client.get(reverse('userprofile:userprofile', kwargs={'pk': self.reviewer.id}))
+        self.assertIsNone(response.data['review_summary'])
+
+    def test_repair_command(self):
+        self.review(5)
+        self.review(3)
+        Review.objects.filter(rating=3).update(rating=1)
+        out = StringIO()
+        call_command('repair_review_summaries', stdout=out)
+        self.assertIn('Repaired 1 review summaries.', out.getvalue())
+        data = self.summary()
+        self.assertEqual((data['rating_sum'], data['average_rating']), (6, 3.0))
+        self.assertEqual(data['histogram']['1'], 1)
+
+
+class ReviewPaginationTests(APITestCase):
+    """
+    Tests for keyset pagination of the review list and the indexes behind it.
+    """
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username='pagebusiness', password='pass1234')
+        self.reviewer = User.objects.create_user(username='pagereviewer', password='pass1234')
+        self.client.force_authenticate(self.reviewer)
+        for index in range(7):
+            Review.objects.create(
+                business_user=self.business_user, reviewer=self.reviewer,
+                rating=index % 3 + 1, description=f'Review {index}'
+            )
+        self.url = reverse('reviewslist')
+
+    def collect(self, params):
+        ids, url, params = [], self.url, dict(params)
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(review['id'] for review in response.data['results'])
+            url, params = response.data['next'], None
+        return ids
+
+    def test_pages_follow_each_ordering(self):
+        for ordering in ['rating', '-rating', 'updated_at', '-updated_at']:
+            ids = self.collect({'business_user_id': self.business_user.id, 'ordering': ordering, 'page_size': 2})
+            tiebreak = '-id' if ordering.startswith('-') else 'id'
+            expected = list(Review.objects.order_by(ordering, tiebreak).values_list('id', flat=True))
+            self.assertEqual(ids, expected, ordering)
+        self.assertEqual(self.collect({'page_size': 3}), sorted(Review.objects.values_list('id', flat=True)))
+
+    def test_each_filter_and_ordering_is_served_by_an_index(self):
+        filters = {
+            'business_user_id': (self.business_user.id, {'rating': 'review_business_rating', 'updated_at': 'review_business_updated'}),
+            'reviewer_id': (self.reviewer.id, {'rating': 'review_reviewer_rating', 'updated_at': 'review_reviewer_updated'}),
+        }
+        for param, (value, indexes) in filters.items():
+            for ordering in ['rating', '-rating', 'updated_at', '-updated_at']:
+                params = {param: value, 'ordering': ordering, 'page_size': 2}
+                first = self.client.get(self.url, params)
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(first.data['next'])
+                sql = [q['sql'] for q in context.captured_queries if 'LIMIT' in q['sql']][-1]
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+                self.assertIn(indexes[ordering.lstrip('-')], plan, (param, ordering, plan))
+                self.assertNotIn('TEMP B-TREE', plan, (param, ordering, plan))
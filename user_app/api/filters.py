@@ -0,0 +1,22 @@
+import django_filters
+from django.db.models import Q
+
+from user_app.models import UserProfile
+
+
+class ProfileFilter(django_filters.FilterSet):
+    """
+    Filters for the profile lists: '?location=' matches part of the location,
+    '?name=' the start of the first name, last name or username (both ignore case).
+    """
+    location = django_filters.CharFilter(lookup_expr='icontains')
+    name = django_filters.CharFilter(method='filter_name')
+
+    class Meta:
+        model = UserProfile
+        fields = ['location', 'name']
+
+    def filter_name(self, queryset, name, value):
+        return queryset.filter(
+            Q(first_name__istartswith=value) | Q(last_name__istartswith=value) | Q(user__username__istartswith=value)
+        )
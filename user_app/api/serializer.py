@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 
+from core.fieldsets import FieldRequirement, SparseFieldsetMixin
+from core.images import derivative_urls
+from reviews_app import summaries
 from ..models import UserProfile
 
 class NestedUserSerializer(serializers.ModelSerializer):
@@ -12,7 +15,7 @@ class NestedUserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id']
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the UserProfile model including nested fields
     from the related User model.
@@ -22,19 +25,39 @@ class UserProfileSerializer(serializers.ModelSerializer):
     - type: user_type of the profile (CharField, based on user_type in profile)
     - username: username of the User (read-only)
     - email: email of the User (read/write)
+    - file_derivatives: URLs of the resized profile picture variants (read-only)
+    - review_summary: review count, average and histogram of a business (read-only,
+      null for customers); querysets select_related 'user__review_summary'
     - remaining fields from UserProfile (first_name, last_name, tel, etc.)
+
+    List views accept '?fields=' / '?omit=' to select the returned fields.
     """
+    field_requirements = {
+        'file': FieldRequirement(only=['file']),
+        'file_derivatives': FieldRequirement(only=['file', 'file_derivatives']),
+        'review_summary': FieldRequirement(only=['user', 'user_type'], select_related=['user__review_summary']),
+    }
     user = serializers.IntegerField(source='user.id', read_only=True)
     type = serializers.CharField(source='user_type')
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source="user.email")
     file = serializers.SerializerMethodField()
+    file_derivatives = serializers.SerializerMethodField()
+    review_summary = serializers.SerializerMethodField()
 
     def get_file(self, obj):
         if obj.file:
             return obj.file.url
         return ""  # statt null
 
+    def get_file_derivatives(self, obj):
+        return derivative_urls(obj.file_derivatives, obj.file)
+
+    def get_review_summary(self, obj):
+        if obj.user_type != UserProfile.BUSINESS:
+            return None
+        return summaries.represent(getattr(obj.user, 'review_summary', None))
+
     class Meta:
         model = UserProfile
         fields = [
@@ -46,11 +69,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'last_name',
             'tel',
             'file',
+            'file_derivatives',
             'location',
             'email',
             'created_at',
             'description',
             'working_hours',
+            'review_summary',
         ]
 
     def update(self, instance, validated_data):
@@ -62,4 +87,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
         for attr, value in user_data.items():
             setattr(user, attr, value)
         user.save()
-        return instance
\ No newline at end of file
+        return instance
+
+
+class PublicUserProfileSerializer(UserProfileSerializer):
+    """
+    Read-only profile representation for public endpoints (e.g. offers
+    expanded with '?expand=user'): omits the contact fields.
+    """
+    class Meta(UserProfileSerializer.Meta):
+        fields = [field for field in UserProfileSerializer.Meta.fields if field not in ('email', 'tel')]
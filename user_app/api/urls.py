@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import UserProfileView, BusinessProfilesView, CustomerProfilesView
+from .views import UserProfileView, UserProfileBatchView, BusinessProfilesView, CustomerProfilesView
 
 # Für api/profile/
 userprofile_urlpatterns = [
+    path('', UserProfileBatchView.as_view(), name='userprofilebatch'),
     path('<int:pk>/', UserProfileView.as_view(), name='userprofile'),
 ]
 
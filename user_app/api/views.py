@@ -1,16 +1,34 @@
-from rest_framework.generics import RetrieveUpdateAPIView, ListAPIView
+from rest_framework.generics import GenericAPIView, RetrieveUpdateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
 
+from core.batch import BatchRetrieveMixin
+from core.cache import normalize_query
+from core.conditional import conditional_get
+from core.pagination import KeysetPagination
+from .. import cache as profile_cache
+from ..cache import profile_generation
 from ..models import UserProfile
+from .filters import ProfileFilter
 from .serializer import UserProfileSerializer
 
 
+class ProfileCursorPagination(KeysetPagination):
+    """
+    Keyset pagination of the profile lists by id, served by the
+    (user_type, id) index. Skips the count unless '?include_count=true' is passed.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering = 'id'
+
+
 class UserProfileView(RetrieveUpdateAPIView):
     """
-    GET: Retrieve a user's profile by user_id.
+    GET: Retrieve a user's profile by user_id (with ETag / If-None-Match support).
     PATCH: Authenticated users can update their own profile only.
     """
     serializer_class = UserProfileSerializer
@@ -18,7 +36,7 @@ class UserProfileView(RetrieveUpdateAPIView):
     pagination_class = None
 
     def get_object(self):
-        profile = get_object_or_404(UserProfile, user_id=self.kwargs['pk'])
+        profile = get_object_or_404(UserProfile.objects.select_related('user__review_summary'), user_id=self.kwargs['pk'])
 
         if self.request.method == 'PATCH' and self.request.user.id != profile.user.id:
             self.permission_denied(
@@ -27,26 +45,75 @@ class UserProfileView(RetrieveUpdateAPIView):
             )
         return profile
 
+    def get_validators(self, request, *args, **kwargs):
+        return (profile_generation(kwargs['pk']), normalize_query(request.query_params)), None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
-class BusinessProfilesView(ListAPIView):
+
+class UserProfileBatchView(BatchRetrieveMixin, GenericAPIView):
     """
-    GET: List all business user profiles.
+    GET: Retrieve several profiles by user_id ('?ids=1,2,3') with one query.
+    Results come in the requested order, unknown ids are listed in 'missing';
+    '?fields=' / '?omit=' select the fields.
     """
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = None
+    batch_lookup_field = 'user_id'
 
     def get_queryset(self):
-        return UserProfile.objects.filter(user_type=UserProfile.BUSINESS)
+        queryset = UserProfile.objects.select_related('user__review_summary')
+        return UserProfileSerializer.sparse_queryset(queryset, self.request, columns=['user'])
+
+    def get(self, request):
+        return self.batch_retrieve(request)
 
 
-class CustomerProfilesView(ListAPIView):
+class ProfileDirectoryView(ListAPIView):
     """
-    GET: List all customer user profiles.
+    Base for the profile lists of one user_type: one joined query per page,
+    '?location=' / '?name=' filters and a per-page response cache that any
+    profile or user change invalidates.
     """
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
+    pagination_class = ProfileCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProfileFilter
+    user_type = None
 
     def get_queryset(self):
-        return UserProfile.objects.filter(user_type=UserProfile.CUSTOMER)
+        queryset = UserProfile.objects.filter(user_type=self.user_type).select_related('user')
+        if self.user_type == UserProfile.BUSINESS:
+            queryset = queryset.select_related('user__review_summary')
+        return UserProfileSerializer.sparse_queryset(queryset, self.request)
+
+    def list(self, request, *args, **kwargs):
+        key = profile_cache.directory_key(request)
+        data = profile_cache.get_directory_page(key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        response = super().list(request, *args, **kwargs)
+        profile_cache.set_directory_page(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class BusinessProfilesView(ProfileDirectoryView):
+    """
+    GET: List the business user profiles page by page ('?location=', '?name=',
+    '?fields=' / '?omit=').
+    """
+    user_type = UserProfile.BUSINESS
+
+
+class CustomerProfilesView(ProfileDirectoryView):
+    """
+    GET: List the customer user profiles page by page ('?location=', '?name=',
+    '?fields=' / '?omit=').
+    """
+    user_type = UserProfile.CUSTOMER
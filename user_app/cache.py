@@ -0,0 +1,55 @@
+"""
+Generation scopes for cached profile data (see core.cache):
+    profiles:user:<id>     the profile of one user, including its User fields
+    profiles:directory     every page of the business and customer profile lists
+
+Directory pages are cached under the directory generation plus the normalized
+request; any profile or user change bumps the generation.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.cache import bump_generations, get_generation, get_generations, normalize_query
+
+KEY_PREFIX = 'profiles:directory'
+
+
+def get_cache():
+    return caches[getattr(settings, 'PROFILE_DIRECTORY_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'PROFILE_DIRECTORY_CACHE_TIMEOUT', 300)
+
+
+def profile_generation(user_id):
+    return get_generation(f'profiles:user:{user_id}')
+
+
+def profile_generations(user_ids):
+    """
+    Tokens of several profiles, in the order of the sorted user ids.
+    """
+    generations = get_generations([f'profiles:user:{user_id}' for user_id in sorted(user_ids)])
+    return [generations[f'profiles:user:{user_id}'] for user_id in sorted(user_ids)]
+
+
+def invalidate_profile(user_id):
+    bump_generations(f'profiles:user:{user_id}', 'profiles:directory')
+
+
+def directory_key(request):
+    digest = hashlib.md5(
+        f'{request.get_host()}{request.path}?{normalize_query(request.query_params)}'.encode('utf-8')
+    ).hexdigest()
+    return f'{KEY_PREFIX}:{get_generation("profiles:directory")}:{digest}'
+
+
+def get_directory_page(key):
+    return get_cache().get(key)
+
+
+def set_directory_page(key, data):
+    get_cache().set(key, data, get_timeout())
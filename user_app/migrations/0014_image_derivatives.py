@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_app', '0013_alter_userprofile_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='file_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -23,7 +23,31 @@ class UserProfile(models.Model):
     description = models.TextField(blank=True, default="")         
     working_hours = models.TextField(blank=True, default="")      
     file = models.ImageField(upload_to='profiles/', blank=True)
+    file_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Business/customer lists: filter by type, page by id.
+            models.Index(fields=['user_type', 'id'], name='profile_type_id'),
+        ]
+
     def __str__(self):
         return f'{self.first_name} {self.last_name} ({self.user_type})'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_type()
+        return instance
+
+    def remember_counted_type(self):
+        """
+        Remembers the stored user_type, so the platform statistics signals can
+        tell when a profile becomes or stops being a business profile.
+        """
+        self._counted_type = self.__dict__.get('user_type')
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.remember_counted_type()
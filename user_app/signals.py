@@ -0,0 +1,48 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import images
+from . import cache
+from .models import UserProfile
+
+
+def invalidate_profile_derivatives(profile):
+    cache.invalidate_profile(profile.user_id)
+
+
+@receiver(pre_save, sender=UserProfile)
+def clear_removed_picture_derivatives(sender, instance, **kwargs):
+    images.clear_stale_manifest(instance, 'file', 'file_derivatives')
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, **kwargs):
+    """
+    Invalidates cached data and validators of a changed profile
+    and queues derivatives for a new profile picture.
+    """
+    cache.invalidate_profile(instance.user_id)
+    if images.needs_derivatives(instance.file, instance.file_derivatives):
+        images.schedule(
+            UserProfile, instance.pk, 'file', 'file_derivatives', on_done=invalidate_profile_derivatives
+        )
+
+
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile(sender, instance, **kwargs):
+    """
+    Invalidates cached data and validators of a deleted profile.
+    """
+    cache.invalidate_profile(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile(sender, instance, update_fields=None, **kwargs):
+    """
+    Profiles embed username and email, so user changes invalidate them too.
+    Login timestamp updates are ignored.
+    """
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    cache.invalidate_profile(instance.pk)
@@ -1,9 +1,18 @@
+import tempfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from reviews_app.models import Review
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
 from user_app.models import UserProfile
 from rest_framework.authtoken.models import Token
+from PIL import Image
 
 
 class UserProfileAPITest(APITestCase):
@@ -99,8 +108,8 @@ class UserProfileAPITest(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['type'], 'business')
+        self.assertGreaterEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['type'], 'business')
 
     def test_get_all_customer_profiles(self):
         """
@@ -111,5 +120,188 @@ class UserProfileAPITest(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['type'], 'customer')
+        self.assertGreaterEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['type'], 'customer')
+
+
+class UserProfileConditionalGetTests(APITestCase):
+    """
+    Tests for conditional requests on the profile endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='etagprofile', password='pass1234', email='a@example.com')
+        self.profile = UserProfile.objects.create(user=self.user, user_type='business')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('userprofile:userprofile', kwargs={'pk': self.user.id})
+
+    def test_profile_revalidation(self):
+        """
+        Unchanged profiles answer 304 without queries; profile or user edits change the ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.profile.location = 'Berlin'
+        self.profile.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        self.user.email = 'b@example.com'
+        self.user.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_query_string_is_part_of_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'fields': 'id,location'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_DERIVATIVE_WORKERS=0)
+class UserProfileImageDerivativeTests(APITestCase):
+    """
+    Tests for the resized profile picture derivatives.
+    """
+
+    def test_profile_picture_derivatives(self):
+        user = User.objects.create_user(username='pictureuser', password='pass1234')
+        buffer = BytesIO()
+        Image.new('RGBA', (600, 600), (0, 0, 255, 128)).save(buffer, format='PNG')
+        upload = SimpleUploadedFile('me.png', buffer.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.create(user=user, user_type='customer', file=upload)
+
+        self.client.force_authenticate(user)
+        response = self.client.get(reverse('userprofile:userprofile', kwargs={'pk': user.id}))
+        derivatives = response.data['file_derivatives']
+        self.assertEqual(set(derivatives['medium']), {'webp', 'png'})
+        self.assertTrue(derivatives['small']['png'].endswith('/small.png'))
+
+
+class ProfileSparseFieldsetTests(APITestCase):
+    """
+    Tests for '?fields=' / '?omit=' on the profile lists.
+    """
+
+    def test_profile_list_fields(self):
+        user = User.objects.create_user(username='sparseprofile', password='pass1234')
+        UserProfile.objects.create(user=user, user_type='business', location='Köln')
+        self.client.force_authenticate(user)
+        url = reverse('userprofiles:businessprofiles')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'fields': 'id,location'})
+        self.assertEqual(response.data['results'], [{'id': user.profile.id, 'location': 'Köln'}])
+        self.assertNotIn('auth_user', context.captured_queries[-1]['sql'])
+        self.assertNotIn('"description"', context.captured_queries[-1]['sql'])
+
+        response = self.client.get(url, {'omit': 'email,tel'})
+        self.assertNotIn('email', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['username'], 'sparseprofile')
+
+
+class ProfileDirectoryTests(APITestCase):
+    """
+    Tests for pagination, filters and the page cache of the profile lists.
+    """
+
+    def setUp(self):
+        names = [('Anna', 'Berg', 'Berlin'), ('Anton', 'Klein', 'Köln'), ('Bernd', 'Adler', 'Berlin')]
+        self.users = []
+        for index, (first_name, last_name, location) in enumerate(names):
+            user = User.objects.create_user(username=f'directory{index}', password='pass1234')
+            UserProfile.objects.create(
+                user=user, user_type='business', first_name=first_name, last_name=last_name, location=location
+            )
+            self.users.append(user)
+        self.customer = User.objects.create_user(username='directorycustomer', password='pass1234')
+        UserProfile.objects.create(user=self.customer, user_type='customer', first_name='Anke')
+        self.client.force_authenticate(self.customer)
+        self.url = reverse('userprofiles:businessprofiles')
+
+    def usernames(self, response):
+        return [profile['username'] for profile in response.data['results']]
+
+    def test_pages_with_one_joined_query(self):
+        with CaptureQueriesContext(connection) as context:
+            first = self.client.get(self.url, {'page_size': 2})
+        page_queries = [query['sql'] for query in context.captured_queries if 'user_app_userprofile' in query['sql']]
+        self.assertEqual(len(page_queries), 1)
+        self.assertIn('JOIN "auth_user"', page_queries[0])
+        self.assertEqual(self.usernames(first), ['directory0', 'directory1'])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.usernames(second), ['directory2'])
+        self.assertIsNone(second.data['next'])
+
+    def test_location_and_name_filters(self):
+        self.assertEqual(self.usernames(self.client.get(self.url, {'location': 'berlin'})), ['directory0', 'directory2'])
+        self.assertEqual(self.usernames(self.client.get(self.url, {'name': 'an'})), ['directory0', 'directory1'])
+        self.assertEqual(self.usernames(self.client.get(self.url, {'name': 'adl'})), ['directory2'])
+        self.assertEqual(self.usernames(self.client.get(self.url, {'name': 'directory1'})), ['directory1'])
+        customers = self.client.get(reverse('userprofiles:customerprofiles'), {'name': 'an'})
+        self.assertEqual(self.usernames(customers), ['directorycustomer'])
+
+    def test_pages_are_cached_until_profiles_change(self):
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        profile = self.users[0].profile
+        profile.location = 'Hamburg'
+        profile.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['location'], 'Hamburg')
+
+        self.users[1].username = 'renamed'
+        self.users[1].save()
+        self.assertIn('renamed', self.usernames(self.client.get(self.url)))
+
+        Review.objects.create(business_user=self.users[2], reviewer=self.customer, rating=4, description='Gut')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][2]['review_summary']['review_count'], 1)
+
+    def test_index_serves_type_filter(self):
+        queryset = UserProfile.objects.filter(user_type='business').order_by('id')
+        self.assertIn('profile_type_id', queryset.explain())
+
+
+class UserProfileBatchTests(APITestCase):
+    """
+    Tests for retrieving several profiles by user id ('?ids=').
+    """
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'batchuser{index}', password='pass1234') for index in range(3)]
+        for user in self.users:
+            UserProfile.objects.create(user=user, user_type='business')
+        self.client.force_authenticate(self.users[0])
+        self.url = reverse('userprofile:userprofilebatch')
+
+    def test_profiles_in_requested_order_with_one_query(self):
+        ids = [self.users[2].id, 999, self.users[0].id]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([profile['user'] for profile in response.data['results']], [ids[0], ids[2]])
+        self.assertEqual(response.data['results'][0]['username'], 'batchuser2')
+        self.assertEqual(response.data['missing'], [999])
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_sparse_fields(self):
+        response = self.client.get(self.url, {'ids': str(self.users[1].id), 'fields': 'user,username'})
+        self.assertEqual(response.data['results'], [{'user': self.users[1].id, 'username': 'batchuser1'}])
+
+    def test_invalid_or_too_many_ids(self):
+        self.assertEqual(self.client.get(self.url, {'ids': '1,x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = ','.join(str(index) for index in range(1, 102))
+        response = self.client.get(self.url, {'ids': too_many})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ids', response.data)